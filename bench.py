@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Import libraries
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+# Import PIP packages
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+# Import app modules
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import main  # noqa: E402
+
+# Define 'BASELINEFILE'
+BASELINEFILE = Path(__file__).resolve().parent / "bench_baseline.json"
+
+# Define 'FSCALLS'
+FSCALLS = [
+    "close",
+    "listdir",
+    "lstat",
+    "open",
+    "rmdir",
+    "scandir",
+    "stat",
+    "unlink"
+]
+
+# Define 'CASES'
+CASES = [
+    "wide.removetree",
+    "deep.removetree",
+    "small.removetree",
+    "huge.removetree",
+    "links.removetree",
+    "small.wipedir",
+    "logs.globwalk",
+    "home.cleanupuser"
+]
+
+
+# Class 'BenchFixtures'
+class BenchFixtures:
+    """
+    Generators for reproducible synthetic trees used by the benchmarks.
+    Every layout is driven by a seeded RNG and a scale factor so runs
+    on different machines and revisions operate on identical shapes.
+    """
+
+    # Function 'writefile'
+    @staticmethod
+    def writefile(p: Path, size: int):
+        """
+        Create a file of the requested size with incompressible-ish content.
+        Large files are made sparse with truncate to keep generation fast.
+        Parent directories must already exist.
+        """
+        with open(p, "wb") as fh:
+            if size > 1 << 20:
+                fh.truncate(size)
+            elif size > 0:
+                fh.write(os.urandom(min(size, 64)) * (size // 64 + 1))
+                fh.truncate(size)
+
+    # Function 'wide'
+    @staticmethod
+    def wide(root: Path, scale: float, rng: random.Random):
+        """
+        One flat directory holding many small files.
+        Stresses a single large getdents listing and per-entry cost.
+        File count grows linearly with the scale factor.
+        """
+        d = root / "wide"
+        d.mkdir(parents=True)
+        for i in range(int(20000 * scale)):
+            BenchFixtures.writefile(d / f"f{i:07d}.tmp", rng.randint(0, 4096))
+
+    # Function 'deep'
+    @staticmethod
+    def deep(root: Path, scale: float, rng: random.Random):
+        """
+        A narrow chain of nested directories with a few files per level.
+        Stresses path length, recursion and per-directory overhead.
+        Several chains are created so total work scales with the factor.
+        """
+        for chain in range(max(1, int(10 * scale))):
+            d = root / "deep" / f"c{chain}"
+            for level in range(200):
+                d = d / f"l{level}"
+                d.mkdir(parents=True, exist_ok=True)
+                for i in range(3):
+                    BenchFixtures.writefile(d / f"f{i}", rng.randint(0, 2048))
+
+    # Function 'small'
+    @staticmethod
+    def small(root: Path, scale: float, rng: random.Random):
+        """
+        Many small files spread over a two-level fan-out of directories.
+        Mirrors package manager and browser caches; scale 10 is one million.
+        Sizes are skewed toward tiny files like real caches.
+        """
+        count = int(100000 * scale)
+        for i in range(count):
+            d = root / "small" / f"{i % 64:02x}" / f"{(i // 64) % 64:02x}"
+            if i < 4096:
+                d.mkdir(parents=True, exist_ok=True)
+            BenchFixtures.writefile(d / f"e{i:08d}", int(rng.expovariate(1 / 2048)))
+
+    # Function 'huge'
+    @staticmethod
+    def huge(root: Path, scale: float, rng: random.Random):
+        """
+        A handful of very large sparse files next to a few small ones.
+        Checks that byte accounting does not depend on file contents.
+        Sizes range up to several gigabytes without using disk space.
+        """
+        d = root / "huge"
+        d.mkdir(parents=True)
+        for i in range(max(1, int(8 * scale))):
+            BenchFixtures.writefile(d / f"big{i}.img", rng.randint(1 << 30, 8 << 30))
+        for i in range(16):
+            BenchFixtures.writefile(d / f"small{i}", rng.randint(0, 4096))
+
+    # Function 'links'
+    @staticmethod
+    def links(root: Path, scale: float, rng: random.Random):
+        """
+        Regular files plus hardlinks, file symlinks and directory symlinks.
+        Includes a symlink loop to prove traversals never follow links.
+        Dangling links are included as well.
+        """
+        d = root / "links"
+        (d / "data").mkdir(parents=True)
+        (d / "refs").mkdir()
+        n = int(5000 * scale)
+        for i in range(n):
+            BenchFixtures.writefile(d / "data" / f"f{i}", rng.randint(0, 4096))
+        for i in range(0, n, 2):
+            os.link(d / "data" / f"f{i}", d / "refs" / f"h{i}")
+        for i in range(1, n, 2):
+            os.symlink(d / "data" / f"f{i}", d / "refs" / f"s{i}")
+        os.symlink(d, d / "refs" / "loop")
+        os.symlink(d / "missing", d / "refs" / "dangling")
+
+    # Function 'logs'
+    @staticmethod
+    def logs(root: Path, scale: float, rng: random.Random):
+        """
+        A /var/log-like tree with rotated and compressed logs per app.
+        Used for the SYSGLOBS multi-pattern walk.
+        Roughly a third of the files match one of the patterns.
+        """
+        for app in range(int(200 * scale)):
+            d = root / "logs" / f"app{app}" / "sub"
+            d.mkdir(parents=True)
+            for i in range(10):
+                name = rng.choice(["current.log", f"old.log.{i}", f"old.log.{i}.gz", f"trace{i}.txt"])
+                BenchFixtures.writefile(d.parent / name, rng.randint(0, 8192))
+                BenchFixtures.writefile(d / f"{i}-{name}", rng.randint(0, 8192))
+
+    # Function 'home'
+    @staticmethod
+    def home(root: Path, scale: float, rng: random.Random):
+        """
+        A synthetic home directory populated for every user rule.
+        Each rule directory receives a small tree of cache files, and
+        unrelated siblings are added that the rule index must skip.
+        """
+        h = root / "home" / "benchuser"
+        h.mkdir(parents=True)
+        per = max(1, int(40 * scale))
+        for rel in main.USERPATH + main.USERHISTORY + main.USERBROWSERS + main.USERMISCS:
+            rel = rel.replace("~/", "").replace("*", "profile")
+            p = h / rel
+            p.parent.mkdir(parents=True, exist_ok=True)
+            if "." in p.name[1:] or p.name.endswith(("history", "hsts", "bak")):
+                BenchFixtures.writefile(p, rng.randint(0, 4096))
+                continue
+            p.mkdir(exist_ok=True)
+            for i in range(per):
+                sub = p / f"d{i % 4}"
+                sub.mkdir(exist_ok=True)
+                BenchFixtures.writefile(sub / f"f{i}", rng.randint(0, 8192))
+        for i in range(int(200 * scale)):
+            keep = h / "Documents" / f"doc{i % 10}"
+            keep.mkdir(parents=True, exist_ok=True)
+            BenchFixtures.writefile(keep / f"keep{i}.txt", rng.randint(0, 4096))
+
+    # Function 'build'
+    @staticmethod
+    def build(name: str, root: Path, scale: float, seed: int) -> Path:
+        """
+        Generate a named fixture below root and return its top directory.
+        The RNG is seeded per fixture so shapes do not depend on order.
+        Existing content at the destination is removed first.
+        """
+        top = root / name
+        shutil.rmtree(top, ignore_errors=True)
+        getattr(BenchFixtures, name)(root, scale, random.Random(f"{seed}:{name}"))
+        return top
+
+
+# Class 'FsCounter'
+class FsCounter:
+    """
+    Counts filesystem calls made through the os module during a run.
+    Wraps the functions listed in FSCALLS in the current process only;
+    DirEntry.stat calls happen in C and are not visible to the wrappers.
+    """
+
+    # Function '__init__'
+    def __init__(self):
+        """
+        Prepare per-function counters and remember the original functions.
+        Nothing is patched until install() is called.
+        Intended to be used inside a forked benchmark child.
+        """
+        self.counts: Dict[str, int] = {name: 0 for name in FSCALLS}
+        self.saved: Dict[str, Callable] = {}
+
+    # Function 'install'
+    def install(self):
+        """
+        Replace the os functions with counting wrappers.
+        shutil and pathlib look these up on the os module at call time,
+        so their internal calls are counted as well.
+        """
+        for name in FSCALLS:
+            fn = getattr(os, name)
+            self.saved[name] = fn
+
+            # Function 'wrapper'
+            def wrapper(*args, __fn=fn, __name=name, **kwargs):
+                """
+                Count one call to the wrapped os function and forward it.
+                Default arguments bind the function and its name per loop.
+                Return values and exceptions pass through unchanged.
+                """
+                self.counts[__name] += 1
+                return __fn(*args, **kwargs)
+            setattr(os, name, wrapper)
+
+    # Function 'total'
+    def total(self) -> int:
+        """
+        Return the sum of all counted filesystem calls.
+        Useful as a single regression figure per case.
+        Per-function detail stays available in counts.
+        """
+        return sum(self.counts.values())
+
+
+# Class 'BenchRunner'
+class BenchRunner:
+    """
+    Runs benchmark cases against fresh fixtures in isolated child processes.
+    Each case is measured uninstrumented for time and memory, then once
+    more with FsCounter installed to count filesystem calls.
+    """
+
+    # Function '__init__'
+    def __init__(self, workdir: Path, scale: float, seed: int, repeat: int):
+        """
+        Store run parameters shared by every case.
+        The work directory holds generated fixtures and is reused.
+        Repeat controls how many timed runs are taken per mode.
+        """
+        self.workdir = workdir
+        self.scale = scale
+        self.seed = seed
+        self.repeat = max(1, repeat)
+
+    # Function 'operation'
+    @staticmethod
+    def operation(case: str, top: Path, dryrun: bool, cb: main.FileRowCB) -> int:
+        """
+        Execute the code path named by a case against its fixture.
+        Returns the bytes reported by the engine for sanity checking.
+        Trash handling is disabled for the cleanupuser case.
+        """
+        _, op = case.split(".", 1)
+        if op == "removetree":
+            return main.FileOps.removetree(top, dryrun, cb)
+        if op == "wipedir":
+            return main.FileOps.wipedir(top, dryrun, cb)
+        if op == "globwalk":
+            rules = [(f"{top}::{pat}", pat) for _, pat in main.SYSGLOBS]
+            return sum(main.FileOps.globwalk(top, rules, dryrun, cb).values())
+        if op == "cleanupuser":
+            home = top / "benchuser"
+            opts = main.ExecOpts(dryrun=dryrun, username="benchuser", userhome=str(home))
+            cleaner = main.SysCleaner(opts, cb, {"Trash": False})
+            cleaner.cleanupuser(home)
+            return cleaner.totalbytes
+        raise ValueError(f"Unknown case: {case}")
+
+    # Function 'child'
+    @staticmethod
+    def child(conn, case: str, top: str, dryrun: bool, counting: bool):
+        """
+        Benchmark body executed in a forked process.
+        Measures wall time, CPU time, entries and peak RSS, or only
+        filesystem calls when counting; sends a dict back over the pipe.
+        """
+        counter = FsCounter()
+        entries = [0]
+
+        # Function 'rowcb'
+        def rowcb(path: str, size_b: int, mtime: str):
+            """
+            Minimal row callback that only counts reported entries.
+            Keeps callback overhead out of the measured figures.
+            Arguments are accepted and ignored.
+            """
+            entries[0] += 1
+
+        if counting:
+            counter.install()
+        t0 = time.perf_counter()
+        c0 = time.process_time()
+        total = BenchRunner.operation(case, Path(top), dryrun, rowcb)
+        wall = time.perf_counter() - t0
+        cpu = time.process_time() - c0
+        conn.send({
+            "wall": wall,
+            "cpu": cpu,
+            "entries": entries[0],
+            "bytes": int(total),
+            "fscalls": counter.total(),
+            "fsdetail": dict(counter.counts),
+            "maxrsskb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        })
+        conn.close()
+
+    # Function 'measure'
+    def measure(self, case: str, dryrun: bool, counting: bool) -> dict:
+        """
+        Build the fixture, run one measurement in a child and return it.
+        Fixtures are rebuilt every time because real mode destroys them.
+        Generation time is never part of the measurement.
+        """
+        name = case.split(".", 1)[0]
+        top = BenchFixtures.build(name, self.workdir, self.scale, self.seed)
+        ctx = multiprocessing.get_context("fork")
+        parent, childconn = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=BenchRunner.child, args=(childconn, case, str(top), dryrun, counting))
+        proc.start()
+        childconn.close()
+        result = parent.recv()
+        proc.join()
+        return result
+
+    # Function 'runcase'
+    def runcase(self, case: str) -> Dict[str, dict]:
+        """
+        Measure a case in dry-run and real mode and aggregate the repeats.
+        Keeps the best wall time, its files/sec, and the max RSS seen.
+        Adds the filesystem call count from one instrumented run.
+        """
+        out: Dict[str, dict] = {}
+        for mode, dryrun in (("dry", True), ("real", False)):
+            runs = [self.measure(case, dryrun, counting=False) for _ in range(self.repeat)]
+            best = min(runs, key=lambda r: r["wall"])
+            counted = self.measure(case, dryrun, counting=True)
+            out[f"{case}.{mode}"] = {
+                "wall": round(best["wall"], 6),
+                "cpu": round(best["cpu"], 6),
+                "entries": best["entries"],
+                "bytes": best["bytes"],
+                "filespersec": round(best["entries"] / best["wall"], 1) if best["wall"] > 0 else 0.0,
+                "fscalls": counted["fscalls"],
+                "fsdetail": counted["fsdetail"],
+                "maxrsskb": max(r["maxrsskb"] for r in runs),
+            }
+        return out
+
+
+# Class 'BenchReport'
+class BenchReport:
+    """
+    Formatting and baseline comparison for benchmark results.
+    Baselines are plain JSON files mapping case names to metrics.
+    Regressions beyond the tolerance make the run exit non-zero.
+    """
+
+    # Define 'LOWERBETTER'
+    LOWERBETTER = ["wall", "fscalls", "maxrsskb"]
+
+    # Function 'compare'
+    @staticmethod
+    def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+        """
+        List human-readable regressions of results against a baseline.
+        Time, filesystem calls and RSS regress when they grow by more
+        than the tolerance; cases absent from the baseline are skipped.
+        """
+        issues: List[str] = []
+        for case, cur in sorted(results.items()):
+            base = baseline.get(case)
+            if not base:
+                continue
+            for metric in BenchReport.LOWERBETTER:
+                old = float(base.get(metric, 0) or 0)
+                new = float(cur.get(metric, 0) or 0)
+                if old > 0 and new > old * (1 + tolerance):
+                    issues.append(f"{case}: {metric} {old:g} -> {new:g} (+{(new / old - 1) * 100:.1f}%)")
+        return issues
+
+    # Function 'table'
+    @staticmethod
+    def table(results: Dict[str, dict], baseline: Optional[Dict[str, dict]] = None) -> str:
+        """
+        Render results as an aligned text table for terminals and logs.
+        When a baseline is given, wall time deltas are shown per case.
+        Returns the table as a single string.
+        """
+        head = f"{'case':<32} {'wall s':>10} {'files/s':>12} {'entries':>10} {'fscalls':>10} {'rss MB':>8} {'vs base':>9}"
+        lines = [head, "-" * len(head)]
+        for case, r in sorted(results.items()):
+            delta = ""
+            if baseline and case in baseline and baseline[case].get("wall"):
+                delta = f"{(r['wall'] / baseline[case]['wall'] - 1) * 100:+.1f}%"
+            lines.append(
+                f"{case:<32} {r['wall']:>10.4f} {r['filespersec']:>12.0f} {r['entries']:>10} "
+                f"{r['fscalls']:>10} {r['maxrsskb'] / 1024:>8.1f} {delta:>9}"
+            )
+        return "\n".join(lines)
+
+
+# Function 'parseargs'
+def parseargs(argv: List[str]) -> argparse.Namespace:
+    """
+    Parse benchmark command-line options.
+    Defaults give a quick run; raise --scale for million-file trees.
+    Use --save-baseline once on a reference revision.
+    """
+    ap = argparse.ArgumentParser(description="Benchmark the BlitzClean FileOps/SysCleaner hot paths.")
+    ap.add_argument("--scale", type=float, default=1.0, help="fixture size factor (10 = one million small files)")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per case and mode")
+    ap.add_argument("--seed", type=int, default=1337, help="fixture RNG seed")
+    ap.add_argument("--cases", default=",".join(CASES), help="comma separated case names")
+    ap.add_argument("--workdir", default="", help="directory for fixtures (default: a temp dir)")
+    ap.add_argument("--baseline", default=str(BASELINEFILE), help="baseline JSON file")
+    ap.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    ap.add_argument("--output", default="", help="also write the report to this file")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    return ap.parse_args(argv)
+
+
+# Function 'benchmain'
+def benchmain(argv: List[str]) -> int:
+    """
+    Run the selected cases, print a report and check the baseline.
+    Returns 0 when no regression was found, 1 otherwise.
+    Fixtures live in a temporary directory removed at the end.
+    """
+    args = parseargs(argv)
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        print(f"Unknown cases: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    tmp: Optional[str] = None
+    if args.workdir:
+        workdir = Path(args.workdir)
+        workdir.mkdir(parents=True, exist_ok=True)
+    else:
+        tmp = tempfile.mkdtemp(prefix="blitzclean-bench.")
+        workdir = Path(tmp)
+
+    results: Dict[str, dict] = {}
+    try:
+        runner = BenchRunner(workdir, args.scale, args.seed, args.repeat)
+        for case in cases:
+            results.update(runner.runcase(case))
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    baselinepath = Path(args.baseline)
+    baseline: Dict[str, dict] = {}
+    if baselinepath.is_file():
+        try:
+            baseline = json.loads(baselinepath.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            baseline = {}
+
+    meta = {"scale": args.scale, "seed": args.seed, "repeat": args.repeat, "python": sys.version.split()[0]}
+    if baseline.get("_meta", {}).get("scale") not in (None, args.scale):
+        print("Baseline was recorded with a different --scale; comparison skipped.", file=sys.stderr)
+        baseline = {}
+
+    issues = BenchReport.compare(results, baseline, args.tolerance)
+    if args.json:
+        report = json.dumps({"_meta": meta, "results": results, "regressions": issues}, indent=2)
+    else:
+        report = BenchReport.table(results, baseline or None)
+        if issues:
+            report += "\n\nRegressions:\n" + "\n".join(f"  {x}" for x in issues)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+
+    if args.save_baseline:
+        data: Dict[str, dict] = dict(results)
+        data["_meta"] = meta
+        baselinepath.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        return 0
+    return 1 if issues else 0
+
+
+# Callback
+if __name__ == "__main__":
+    sys.exit(benchmain(sys.argv[1:]))
@@ -2,9 +2,27 @@
 # -*- coding: utf-8 -*-
 
 # Import libraries
+import argparse
+import array
+import contextlib
+import cProfile
+import csv
+import ctypes
+import fcntl
+import fnmatch
+import functools
+import gzip
+import hashlib
+import heapq
+import hmac
+import io
 import json
+import marshal
+import platform
 import os
 import queue
+import re
+import resource
 import shlex
 import shutil
 import subprocess
@@ -15,13 +33,19 @@ import socket
 import stat
 import signal
 import time
+import tracemalloc
 
 # Import PIP packages
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QAbstractItemModel
+from PyQt6.QtCore import QAbstractTableModel
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtCore import QObject
 from PyQt6.QtCore import QPropertyAnimation
+from PyQt6.QtCore import QSortFilterProxyModel
 from PyQt6.QtCore import Qt
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QAction
@@ -31,6 +55,7 @@ from PyQt6.QtWidgets import QCheckBox
 from PyQt6.QtWidgets import QComboBox
 from PyQt6.QtWidgets import QDialog
 from PyQt6.QtWidgets import QDialogButtonBox
+from PyQt6.QtWidgets import QFileDialog
 from PyQt6.QtWidgets import QFormLayout
 from PyQt6.QtWidgets import QGraphicsOpacityEffect
 from PyQt6.QtWidgets import QGroupBox
@@ -42,23 +67,29 @@ from PyQt6.QtWidgets import QMenuBar
 from PyQt6.QtWidgets import QMessageBox
 from PyQt6.QtWidgets import QProgressBar
 from PyQt6.QtWidgets import QPushButton
-from PyQt6.QtWidgets import QScrollArea
 from PyQt6.QtWidgets import QSpinBox
+from PyQt6.QtWidgets import QTableView
 from PyQt6.QtWidgets import QTableWidget
 from PyQt6.QtWidgets import QTableWidgetItem
 from PyQt6.QtWidgets import QTabWidget
+from PyQt6.QtWidgets import QTreeView
 from PyQt6.QtWidgets import QVBoxLayout
 from PyQt6.QtWidgets import QWidget
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 from urllib.error import HTTPError
 from urllib.error import URLError
 from urllib.request import Request
 from urllib.request import urlopen
 
+# Define 'IMPORTDONE'
+IMPORTDONE = time.perf_counter()
+
 # Define 'VERSION'
 VERSION = "v4.9.8"
 
@@ -74,6 +105,27 @@ CONFIGPATH = Path.home() / ".config" / "blitzclean"
 # Define 'CONFIGFILE'
 CONFIGFILE = CONFIGPATH / "blitzclean.conf"
 
+# Define 'SIZEINDEXFILE'
+SIZEINDEXFILE = CONFIGPATH / "sizeindex.json"
+
+# Define 'UPDATECACHEFILE'
+UPDATECACHEFILE = CONFIGPATH / "update.json"
+
+# Define 'STARTUPENV'
+STARTUPENV = "BLITZCLEAN_STARTUP"
+
+# Define 'TOKENENV'
+TOKENENV = "BLITZCLEAN_TOKEN"
+
+# Define 'LOCKFILE'
+LOCKFILE = Path("/run/blitzclean/run.lock")
+
+# Define 'WATCHCOOLDOWN'
+WATCHCOOLDOWN = 6 * 3600
+
+# Define 'UNITDIR'
+UNITDIR = Path("/etc/systemd/system")
+
 # Define 'USERPATH'
 USERPATH = [
     ".android",
@@ -143,6 +195,15 @@ USERAGGRESIVE = [
     ".ssh"
 ]
 
+# Define 'USERTRIMS'
+USERTRIMS = [
+    ".cache/JetBrains",
+    ".cache/npm",
+    ".cache/pip",
+    ".cache/pnpm",
+    ".cache/yarn"
+]
+
 # Define 'USERBROWSERS'
 USERBROWSERS = [
     ".cache/chromium",
@@ -202,6 +263,12 @@ SYSGLOBS = [
 # Define 'FileRowCB'
 FileRowCB = Callable[[str, int, str], None]
 
+# Define 'SummaryCB'
+SummaryCB = Callable[[dict], None]
+
+# Define 'GuardCB'
+GuardCB = Callable[[], None]
+
 
 # Class 'SysUtils'
 class SysUtils:
@@ -250,10 +317,37 @@ class SysUtils:
         Useful for presenting file information in the UI table.
         """
         try:
-            return datetime.fromtimestamp(p.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+            return SysUtils.stampstring(p.stat().st_mtime)
         except (OSError, ValueError, PermissionError, FileNotFoundError):
             return "-"
 
+    # Function 'stampstring'
+    @staticmethod
+    def stampstring(ts: float) -> str:
+        """
+        Format a raw epoch timestamp into a YYYY-MM-DD HH:MM:SS string.
+        Lets callers holding a stat result skip a second stat call.
+        Returns '-' when the timestamp is out of range or invalid.
+        """
+        try:
+            return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+        except (OSError, ValueError, OverflowError, TypeError):
+            return "-"
+
+    # Function 'parsesize'
+    @staticmethod
+    def parsesize(text: str) -> int:
+        """
+        Parse a size such as '500M', '2G', '1.5 GB' or '4096' into bytes.
+        Accepts the units produced by unitsize as well as bare suffixes.
+        Returns 0 for empty or unparsable input, meaning no limit is set.
+        """
+        m = re.match(r"^\s*([0-9]*\.?[0-9]+)\s*([kmgtp]?)(?:i?b|bytes)?\s*$", str(text or ""), re.IGNORECASE)
+        if not m:
+            return 0
+        scale = 1024 ** " kmgtp".index(m.group(2).lower() or " ")
+        return int(float(m.group(1)) * scale)
+
     # Function 'filesize'
     @staticmethod
     def filesize(p: Path) -> int:
@@ -284,27 +378,73 @@ class ShellExec:
     """
     Thin wrapper around subprocess helpers for executing shell commands.
     Provides streaming run and capture utilities with simple error handling.
-    Keeps command execution details isolated from the business logic.
+    Tracks running commands so a stop request can terminate them.
     """
 
+    # Define 'STOPGRACE'
+    STOPGRACE = 2.0
+
+    # Define 'children'
+    children: Dict[int, subprocess.Popen] = {}
+
+    # Define 'lock'
+    lock = threading.Lock()
+
     # Function 'cmdrun'
     @staticmethod
     def cmdrun(cmd: str, dryrun: bool) -> int:
         """
         Execute a shell command, optionally skipping when in dry-run mode.
-        Streams stdout lines to avoid buffering, returning the exit code.
-        Any subprocess errors produce a non-zero (1) return value.
+        Runs in its own process group, registered until it exits, so stopall
+        can signal the shell and everything it spawned.
         """
         if dryrun:
             return 0
         try:
-            proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+            proc = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                    start_new_session=True)
+        except (OSError, subprocess.SubprocessError):
+            return 1
+        with ShellExec.lock:
+            ShellExec.children[proc.pid] = proc
+        try:
             for _ in iter(proc.stdout.readline, ""):
                 pass
             proc.wait()
             return proc.returncode
         except (OSError, subprocess.SubprocessError):
             return 1
+        finally:
+            with ShellExec.lock:
+                ShellExec.children.pop(proc.pid, None)
+
+    # Function 'stopall'
+    @staticmethod
+    def stopall(grace: Optional[float] = None):
+        """
+        Terminate every running command: SIGTERM to each process group,
+        then SIGKILL to groups still alive after the grace period.
+        Returns within roughly 'grace' seconds (STOPGRACE by default).
+        """
+        with ShellExec.lock:
+            procs = list(ShellExec.children.values())
+        if not procs:
+            return
+        for proc in procs:
+            if proc.poll() is None:
+                try:
+                    os.killpg(proc.pid, signal.SIGTERM)
+                except (ProcessLookupError, PermissionError):
+                    pass
+        deadline = time.monotonic() + (ShellExec.STOPGRACE if grace is None else grace)
+        for proc in procs:
+            try:
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
 
     # Function 'capture'
     @staticmethod
@@ -324,19 +464,21 @@ class ShellExec:
 
     # Function 'userexec'
     @staticmethod
-    def userexec(username: str, home: str, cmd: str, dryrun: bool) -> int:
+    def userexec(username: str, home: str, cmd: str, dryrun: bool,
+                 runner: Optional[Callable[[str], int]] = None) -> int:
         """
         Execute a command as a specific user (used for 'trash-empty').
-        Tries runuser/sudo/su fallbacks. Ensures HOME is set for the target.
-        Returns the exit code (0 on success). In dry-run, returns 0.
+        Tries runuser/sudo/su fallbacks, but never after a command killed by a
+        signal (a stop). 'runner' replaces cmdrun, e.g. SysCleaner.command.
         """
         if dryrun:
             return 0
+        run = runner or (lambda c: ShellExec.cmdrun(c, dryrun=False))
         envprefix = f"HOME={shlex.quote(home)} XDG_DATA_HOME={shlex.quote(os.path.join(home, '.local/share'))} "
         try:
             current = os.environ.get("SUDO_USER") or os.environ.get("USER") or ""
             if os.geteuid() != 0 or current == username:
-                return ShellExec.cmdrun(envprefix + cmd, dryrun=False)
+                return run(envprefix + cmd)
         except (OSError, AttributeError):
             pass
 
@@ -347,9 +489,9 @@ class ShellExec:
         ]
 
         for c in attempts:
-            rc = ShellExec.cmdrun(c, dryrun=False)
-            if rc == 0:
-                return 0
+            rc = run(c)
+            if rc == 0 or rc < 0:
+                return rc
         return 1
 
 
@@ -481,6 +623,102 @@ class ExecOpts:
     # Define 'dockernetworks'
     dockernetworks: bool = False
 
+    # Define 'toplimit'
+    toplimit: int = 200
+
+    # Define 'summary'
+    summary: bool = False
+
+    # Define 'drillkey'
+    drillkey: str = ""
+
+    # Define 'estimate'
+    estimate: bool = False
+
+    # Define 'profile'
+    profile: str = ""
+
+    # Define 'cprofile'
+    cprofile: bool = False
+
+    # Define 'exportpath'
+    exportpath: str = ""
+
+    # Define 'exporttable'
+    exporttable: bool = True
+
+    # Define 'parallel'
+    parallel: bool = True
+
+    # Define 'hddworkers'
+    hddworkers: int = 1
+
+    # Define 'ssdworkers'
+    ssdworkers: int = 4
+
+    # Define 'lowimpact'
+    lowimpact: bool = False
+
+    # Define 'pressurelimit'
+    pressurelimit: int = 10
+
+    # Define 'opsmax'
+    opsmax: int = 0
+
+    # Define 'servicemins'
+    servicemins: int = 30
+
+    # Define 'serviceops'
+    serviceops: int = 0
+
+    # Define 'servicecalendar'
+    servicecalendar: str = ""
+
+    # Define 'watch'
+    watch: bool = False
+
+    # Define 'watchmounts'
+    watchmounts: str = "/"
+
+    # Define 'watchlow'
+    watchlow: int = 10
+
+    # Define 'watchhigh'
+    watchhigh: int = 20
+
+    # Define 'watchinterval'
+    watchinterval: int = 60
+
+    # Define 'updatehours'
+    updatehours: int = 24
+
+    # Define 'audit'
+    audit: bool = False
+
+    # Define 'auditdir'
+    auditdir: str = ""
+
+    # Define 'auditmaxmb'
+    auditmaxmb: int = 64
+
+    # Define 'auditkeep'
+    auditkeep: int = 5
+
+    # Define 'quarantine'
+    quarantine: bool = False
+
+    # Define 'quarantinedays'
+    quarantinedays: int = 1
+
+    # Define 'metrics'
+    metrics: bool = False
+
+    # Define 'metricsdir'
+    metricsdir: str = ""
+
+    # Define 'excludes'
+    excludes: str = ""
+
     # Function 'todict'
     def todict(self) -> dict:
         """
@@ -503,6 +741,38 @@ class ExecOpts:
             "dockerimages": self.dockerimages,
             "dockervolumes": self.dockervolumes,
             "dockernetworks": self.dockernetworks,
+            "toplimit": self.toplimit,
+            "summary": self.summary,
+            "drillkey": self.drillkey,
+            "estimate": self.estimate,
+            "profile": self.profile,
+            "cprofile": self.cprofile,
+            "exportpath": self.exportpath,
+            "exporttable": self.exporttable,
+            "parallel": self.parallel,
+            "hddworkers": self.hddworkers,
+            "ssdworkers": self.ssdworkers,
+            "lowimpact": self.lowimpact,
+            "pressurelimit": self.pressurelimit,
+            "opsmax": self.opsmax,
+            "servicemins": self.servicemins,
+            "serviceops": self.serviceops,
+            "servicecalendar": self.servicecalendar,
+            "watch": self.watch,
+            "watchmounts": self.watchmounts,
+            "watchlow": self.watchlow,
+            "watchhigh": self.watchhigh,
+            "watchinterval": self.watchinterval,
+            "updatehours": self.updatehours,
+            "audit": self.audit,
+            "auditdir": self.auditdir,
+            "auditmaxmb": self.auditmaxmb,
+            "auditkeep": self.auditkeep,
+            "quarantine": self.quarantine,
+            "quarantinedays": self.quarantinedays,
+            "metrics": self.metrics,
+            "metricsdir": self.metricsdir,
+            "excludes": self.excludes,
         }
 
     # Function 'fromdict'
@@ -528,6 +798,38 @@ class ExecOpts:
             dockerimages=bool(d.get("dockerimages", False)),
             dockervolumes=bool(d.get("dockervolumes", False)),
             dockernetworks=bool(d.get("dockernetworks", False)),
+            toplimit=int(d.get("toplimit", 200)),
+            summary=bool(d.get("summary", False)),
+            drillkey=str(d.get("drillkey", "")),
+            estimate=bool(d.get("estimate", False)),
+            profile=str(d.get("profile", "")),
+            cprofile=bool(d.get("cprofile", False)),
+            exportpath=str(d.get("exportpath", "")),
+            exporttable=bool(d.get("exporttable", True)),
+            parallel=bool(d.get("parallel", True)),
+            hddworkers=int(d.get("hddworkers", 1)),
+            ssdworkers=int(d.get("ssdworkers", 4)),
+            lowimpact=bool(d.get("lowimpact", False)),
+            pressurelimit=int(d.get("pressurelimit", 10)),
+            opsmax=int(d.get("opsmax", 0)),
+            servicemins=int(d.get("servicemins", 30)),
+            serviceops=int(d.get("serviceops", 0)),
+            servicecalendar=str(d.get("servicecalendar", "")),
+            watch=bool(d.get("watch", False)),
+            watchmounts=str(d.get("watchmounts", "/")),
+            watchlow=int(d.get("watchlow", 10)),
+            watchhigh=int(d.get("watchhigh", 20)),
+            watchinterval=int(d.get("watchinterval", 60)),
+            updatehours=int(d.get("updatehours", 24)),
+            audit=bool(d.get("audit", False)),
+            auditdir=str(d.get("auditdir", "")),
+            auditmaxmb=int(d.get("auditmaxmb", 64)),
+            auditkeep=int(d.get("auditkeep", 5)),
+            quarantine=bool(d.get("quarantine", False)),
+            quarantinedays=int(d.get("quarantinedays", 1)),
+            metrics=bool(d.get("metrics", False)),
+            metricsdir=str(d.get("metricsdir", "")),
+            excludes=str(d.get("excludes", "")),
         )
 
 
@@ -541,16 +843,17 @@ class ConfigManager:
 
     # Function 'load'
     @staticmethod
-    def load() -> dict:
+    def load(path: Optional[Path] = None) -> dict:
         """
-        Load configuration from CONFIGFILE into a dict of strings.
+        Load configuration from CONFIGFILE (or 'path') into a dict of strings.
         Ignores comments/blank lines and safely handles decoding errors.
         Returns an empty dict when no config exists or on failure.
         """
         data: Dict[str, str] = {}
+        path = path or CONFIGFILE
         try:
-            if CONFIGFILE.is_file():
-                for line in CONFIGFILE.read_text(encoding="utf-8").splitlines():
+            if path.is_file():
+                for line in path.read_text(encoding="utf-8").splitlines():
                     line = line.strip()
                     if not line or line.startswith("#") or "=" not in line:
                         continue
@@ -560,11 +863,121 @@ class ConfigManager:
             pass
         return data
 
+    # Function 'loadopts'
+    @staticmethod
+    def loadopts(cfg: Dict[str, str]) -> ExecOpts:
+        """
+        Build ExecOpts from a loaded configuration mapping.
+        Shared by the GUI and the headless service so both honor the same
+        preferences; malformed numbers fall back to their defaults.
+        """
+
+        # Function 'flag'
+        def flag(key: str, default: bool = False) -> bool:
+            """
+            Convert a config truthy string into a boolean with default.
+            Accepts '1/true/True/yes' as True; everything else is False.
+            Mirrors the GUI's loadbool helper.
+            """
+            return cfg.get(key, "1" if default else "0") in ("1", "true", "True", "yes")
+
+        # Function 'number'
+        def number(key: str, default: int, low: int = 0, high: Optional[int] = None) -> int:
+            """
+            Read an integer option clamped to [low, high].
+            Missing, empty or malformed values yield the default.
+            Keeps hand-edited config files from breaking a run.
+            """
+            try:
+                n = int(cfg.get(key, "") or default)
+            except (ValueError, TypeError):
+                n = default
+            n = max(low, n)
+            return n if high is None else min(high, n)
+
+        opts = ExecOpts()
+        opts.vacuumdays = number("vacuumdays", 7)
+        opts.vacuumsize = cfg.get("vacuumsize", "100M")
+        opts.keepsnaps = number("keepsnaps", 2)
+        opts.username = cfg.get("username", "")
+        opts.userhome = cfg.get("userhome", "")
+        opts.shutafter = flag("shutafter")
+        opts.estimate = flag("estimate", False)
+        opts.exporttable = flag("exporttable", True)
+        opts.parallel = flag("parallel", True)
+        opts.hddworkers = number("hddworkers", 1, 1)
+        opts.ssdworkers = number("ssdworkers", 4, 1)
+        opts.lowimpact = flag("lowimpact")
+        opts.pressurelimit = number("pressurelimit", 10, 1, 100)
+        opts.opsmax = number("opsmax", 0)
+        opts.servicemins = number("servicemins", 30)
+        opts.serviceops = number("serviceops", 0)
+        opts.servicecalendar = cfg.get("servicecalendar", "")
+        opts.watch = flag("watch")
+        opts.watchmounts = cfg.get("watchmounts", "/")
+        opts.watchlow = number("watchlow", 10, 1, 99)
+        opts.watchhigh = number("watchhigh", 20, 1, 100)
+        opts.watchinterval = number("watchinterval", 60, 5)
+        opts.updatehours = number("updatehours", 24)
+        opts.audit = flag("audit")
+        opts.auditdir = cfg.get("auditdir", "")
+        opts.auditmaxmb = number("auditmaxmb", 64, 1)
+        opts.auditkeep = number("auditkeep", 5, 1)
+        opts.quarantine = flag("quarantine")
+        opts.quarantinedays = number("quarantinedays", 1)
+        opts.metrics = flag("metrics")
+        opts.metricsdir = cfg.get("metricsdir", "")
+        opts.excludes = cfg.get("excludes", "")
+        opts.clearkernels = flag("clearkernels")
+        opts.summary = flag("summary")
+        opts.dockercontainers = flag("dockercontainers")
+        opts.dockerimages = flag("dockerimages")
+        opts.dockervolumes = flag("dockervolumes")
+        opts.dockernetworks = flag("dockernetworks")
+        return opts
+
+    # Function 'loadpathopts'
+    @staticmethod
+    def loadpathopts(cfg: Dict[str, str]) -> Dict[str, bool]:
+        """
+        Extract the per-target enable map from a loaded configuration mapping.
+        Every known rule key is present; missing keys default to enabled.
+        Keys are stored as 'options.<rule>=0|1'.
+        """
+        all_keys = (
+            USERPATH
+            + USERHISTORY
+            + USERBROWSERS
+            + USERMISCS
+            + USERAGGRESIVE
+            + ROOTITEMS
+            + SYSDIRS
+            + [f"{base}::{pat}" for base, pat in SYSGLOBS]
+        )
+        return {k: cfg.get(f"options.{k}", "1") in ("1", "true", "True", "yes") for k in all_keys}
+
+    # Function 'loadbudgets'
+    @staticmethod
+    def loadbudgets(cfg: Dict[str, str]) -> Dict[str, int]:
+        """
+        Extract per-rule size budgets from a loaded configuration mapping.
+        Keys are stored as 'budget.<rule>=<size>' and parsed to bytes.
+        Rules without a positive budget are omitted and wiped as usual.
+        """
+        budgets: Dict[str, int] = {}
+        for k, v in cfg.items():
+            if k.startswith("budget."):
+                n = SysUtils.parsesize(v)
+                if n > 0:
+                    budgets[k[len("budget."):]] = n
+        return budgets
+
     # Function 'save'
     @staticmethod
-    def save(opts: ExecOpts, runbootstart: bool, runshutdown: bool, pathopts: Dict[str, bool]):
+    def save(opts: ExecOpts, runbootstart: bool, runshutdown: bool, pathopts: Dict[str, bool],
+             budgets: Optional[Dict[str, int]] = None):
         """
-        Persist ExecOpts, scheduler flags, and per-path options to disk.
+        Persist ExecOpts, scheduler flags, per-path options and budgets to disk.
         Writes a simple key=value file under ~/.config/blitzclean/config.
         Silently ignores filesystem errors to avoid crashing the UI.
         """
@@ -587,16 +1000,194 @@ class ConfigManager:
                 f"dockerimages={'1' if opts.dockerimages else '0'}",
                 f"dockervolumes={'1' if opts.dockervolumes else '0'}",
                 f"dockernetworks={'1' if opts.dockernetworks else '0'}",
+                f"summary={'1' if opts.summary else '0'}",
+                f"estimate={'1' if opts.estimate else '0'}",
+                f"exporttable={'1' if opts.exporttable else '0'}",
+                f"parallel={'1' if opts.parallel else '0'}",
+                f"hddworkers={opts.hddworkers}",
+                f"ssdworkers={opts.ssdworkers}",
+                f"lowimpact={'1' if opts.lowimpact else '0'}",
+                f"pressurelimit={opts.pressurelimit}",
+                f"opsmax={opts.opsmax}",
+                f"servicemins={opts.servicemins}",
+                f"serviceops={opts.serviceops}",
+                f"servicecalendar={opts.servicecalendar}",
+                f"watch={'1' if opts.watch else '0'}",
+                f"watchmounts={opts.watchmounts}",
+                f"watchlow={opts.watchlow}",
+                f"watchhigh={opts.watchhigh}",
+                f"watchinterval={opts.watchinterval}",
+                f"updatehours={opts.updatehours}",
+                f"audit={'1' if opts.audit else '0'}",
+                f"auditdir={opts.auditdir}",
+                f"auditmaxmb={opts.auditmaxmb}",
+                f"auditkeep={opts.auditkeep}",
+                f"quarantine={'1' if opts.quarantine else '0'}",
+                f"quarantinedays={opts.quarantinedays}",
+                f"metrics={'1' if opts.metrics else '0'}",
+                f"metricsdir={opts.metricsdir}",
+                f"excludes={opts.excludes}",
             ]
 
             for k, v in sorted(pathopts.items()):
                 lines.append(f"options.{k}={'1' if v else '0'}")
+            for k, n in sorted((budgets or {}).items()):
+                if n > 0:
+                    lines.append(f"budget.{k}={int(n)}")
             CONFIGFILE.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
         except OSError:
             pass
 
 
+# Class 'RunLock'
+class RunLock:
+    """
+    Exclusive, non-blocking lock preventing overlapping privileged runs.
+    Held by the headless service, the pkexec worker and root GUI runs for
+    a whole run; the kernel drops it automatically if the process dies.
+    """
+
+    # Function '__init__'
+    def __init__(self, path: Path = LOCKFILE):
+        """
+        Prepare a lock on 'path' without acquiring it.
+        The file is created on acquire and never deleted, which keeps
+        flock semantics race-free.
+        """
+        self.path = path
+        self.fd: Optional[int] = None
+
+    # Function 'acquire'
+    def acquire(self) -> bool:
+        """
+        Try to take the lock; returns False when another run holds it.
+        The holder's PID is written into the file for diagnostics.
+        Lock directories other users could write to count as not acquired.
+        """
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            st = os.lstat(self.path.parent)
+            if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.geteuid() or st.st_mode & 0o022:
+                return False
+            fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+        except OSError:
+            return False
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self.fd = fd
+        return True
+
+    # Function 'release'
+    def release(self):
+        """
+        Release the lock if held; safe to call more than once.
+        Closing the descriptor drops the flock.
+        The lock file itself stays in place.
+        """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+# Class 'ServiceUnits'
+class ServiceUnits:
+    """
+    Generates and installs the systemd units behind runbootstart/runshutdown.
+    Boot and shutdown runs are oneshot services; an optional OnCalendar
+    timer adds off-peak runs. Every unit calls the headless entry point.
+    """
+
+    # Define 'NAMES'
+    NAMES = ("blitzclean-boot.service", "blitzclean-shutdown.service", "blitzclean.service", "blitzclean.timer",
+             "blitzclean-watch.service")
+
+    # Function 'command'
+    @staticmethod
+    def command(mode: str, config: Path) -> str:
+        """
+        Build the ExecStart/ExecStop command line for a headless run.
+        Uses the current interpreter and script, quoted for systemd.
+        The config path pins the preferences of the user who installed it.
+        """
+        return " ".join(shlex.quote(x) for x in (sys.executable, os.path.abspath(sys.argv[0]),
+                                                  "--headless", mode, "--config", str(config)))
+
+    # Function 'render'
+    @staticmethod
+    def render(opts: ExecOpts, runboot: bool, runshut: bool, config: Path) -> Dict[str, str]:
+        """
+        Return {unit name: content} for the units the settings ask for.
+        Systemd timeouts leave a minute beyond the run's time budget,
+        which the headless run enforces itself.
+        """
+        limit = f"{opts.servicemins * 60 + 60}s" if opts.servicemins > 0 else "infinity"
+        units: Dict[str, str] = {}
+        if runboot:
+            units["blitzclean-boot.service"] = (
+                "[Unit]\nDescription=BlitzClean cleanup at boot\nAfter=local-fs.target\n\n"
+                f"[Service]\nType=oneshot\nExecStart={ServiceUnits.command('boot', config)}\n"
+                f"TimeoutStartSec={limit}\nNice=19\nIOSchedulingClass=idle\n\n"
+                "[Install]\nWantedBy=multi-user.target\n")
+        if runshut:
+            units["blitzclean-shutdown.service"] = (
+                "[Unit]\nDescription=BlitzClean cleanup at shutdown\nAfter=local-fs.target\n"
+                "RequiresMountsFor=/home /var\n\n"
+                "[Service]\nType=oneshot\nRemainAfterExit=yes\nExecStart=/bin/true\n"
+                f"ExecStop={ServiceUnits.command('shutdown', config)}\nTimeoutStopSec={limit}\n\n"
+                "[Install]\nWantedBy=multi-user.target\n")
+        if opts.servicecalendar:
+            units["blitzclean.service"] = (
+                "[Unit]\nDescription=BlitzClean scheduled cleanup\n\n"
+                f"[Service]\nType=oneshot\nExecStart={ServiceUnits.command('timer', config)}\n"
+                f"TimeoutStartSec={limit}\nNice=19\nIOSchedulingClass=idle\n")
+            units["blitzclean.timer"] = (
+                "[Unit]\nDescription=BlitzClean off-peak cleanup\n\n"
+                f"[Timer]\nOnCalendar={opts.servicecalendar}\nPersistent=true\nRandomizedDelaySec=10min\n\n"
+                "[Install]\nWantedBy=timers.target\n")
+        if opts.watch:
+            units["blitzclean-watch.service"] = (
+                "[Unit]\nDescription=BlitzClean free-space watermark daemon\nAfter=local-fs.target\n\n"
+                f"[Service]\nType=simple\nExecStart={ServiceUnits.command('watch', config)}\n"
+                "Restart=on-failure\nRestartSec=30\nNice=19\nIOSchedulingClass=idle\n\n"
+                "[Install]\nWantedBy=multi-user.target\n")
+        return units
+
+    # Function 'install'
+    @staticmethod
+    def install(opts: ExecOpts, runboot: bool, runshut: bool, config: Path) -> int:
+        """
+        Write the requested units, remove the others and (re)enable them.
+        The shutdown unit is started now so its ExecStop fires on power-off.
+        Needs root; returns non-zero when writing a unit fails.
+        """
+        units = ServiceUnits.render(opts, runboot, runshut, config)
+        for name in ServiceUnits.NAMES:
+            if name not in units and (UNITDIR / name).exists():
+                ShellExec.cmdrun(f"systemctl disable --now {name}", False)
+                try:
+                    (UNITDIR / name).unlink()
+                except OSError:
+                    pass
+        try:
+            for name, text in units.items():
+                (UNITDIR / name).write_text(text, encoding="utf-8")
+        except OSError:
+            return 1
+        ShellExec.cmdrun("systemctl daemon-reload", False)
+        for name in units:
+            if name == "blitzclean-boot.service":
+                ShellExec.cmdrun(f"systemctl enable {name}", False)
+            elif name != "blitzclean.service":
+                ShellExec.cmdrun(f"systemctl enable --now {name}", False)
+        return 0
+
+
 # Class 'UserDiscovery'
 class UserDiscovery:
     """
@@ -628,6 +1219,305 @@ class UserDiscovery:
         return users
 
 
+# Class 'GlobMatcher'
+class GlobMatcher:
+    """
+    Compiled matcher testing a file name against many glob patterns at once.
+    Patterns are translated with fnmatch and merged into a single regex.
+    The named group that matched identifies which rule key was hit.
+    """
+
+    # Function '__init__'
+    def __init__(self, rules: List[Tuple[str, str]]):
+        """
+        Compile (key, pattern) pairs into one alternation regex.
+        Group names are positional so arbitrary keys remain usable.
+        Earlier rules win when several patterns match the same name.
+        """
+        self.keys: List[str] = [key for key, _ in rules]
+        parts = [f"(?P<r{i}>{fnmatch.translate(pat)})" for i, (_, pat) in enumerate(rules)]
+        self.regex = re.compile("|".join(parts)) if parts else None
+
+    # Function 'match'
+    def match(self, name: str) -> Optional[str]:
+        """
+        Test a single path component against every compiled pattern.
+        Returns the key of the first matching rule, or None otherwise.
+        Costs one regex evaluation regardless of the number of rules.
+        """
+        if self.regex is None:
+            return None
+        m = self.regex.match(name)
+        if m is None or m.lastgroup is None:
+            return None
+        return self.keys[int(m.lastgroup[1:])]
+
+
+# Class 'RuleNode'
+class RuleNode:
+    """
+    Single path component in the compiled home-directory rule trie.
+    Holds literal children by name and wildcard children as regexes.
+    Tracks rule keys ending here and every key reachable below it.
+    """
+
+    # Function '__init__'
+    def __init__(self):
+        """
+        Create an empty node without children or terminal rule keys.
+        Children are filled in by RuleIndex.insert while compiling.
+        The subkeys set lets a descent prune subtrees with no enabled rule.
+        """
+        self.children: Dict[str, "RuleNode"] = {}
+        self.wildcards: List[Tuple[str, "re.Pattern[str]", "RuleNode"]] = []
+        self.keys: List[str] = []
+        self.subkeys: set = set()
+
+
+# Class 'RuleIndex'
+class RuleIndex:
+    """
+    Path-component trie compiled once from all home-relative user rules.
+    Resolves a home directory in one guided descent instead of per-rule probes.
+    Yields each matched target with the rule key that selected it.
+    """
+
+    # Define 'shared'
+    shared: Optional["RuleIndex"] = None
+
+    # Define 'PROBEMAX'
+    PROBEMAX = 4
+
+    # Function '__init__'
+    def __init__(self, rules: List[Tuple[str, str]]):
+        """
+        Build the trie from (key, relative path) rule pairs.
+        Rules keep their insertion order so earlier lists take precedence.
+        Leading '~/' is treated as the home directory being cleaned.
+        """
+        self.root = RuleNode()
+        for key, rel in rules:
+            self.insert(key, rel)
+
+    # Function 'compiled'
+    @staticmethod
+    def compiled() -> "RuleIndex":
+        """
+        Return the process-wide index of all user rules, compiling on first use.
+        Rule lists are static so one compilation serves every home and run.
+        Per-run toggles are applied during descent, not at compile time.
+        """
+        if RuleIndex.shared is None:
+            RuleIndex.shared = RuleIndex([(k, k) for k in RuleIndex.userkeys()])
+        return RuleIndex.shared
+
+    # Function 'userkeys'
+    @staticmethod
+    def userkeys() -> List[str]:
+        """
+        Return every user rule key, in preference order.
+        These are the keys matched relative to a home directory.
+        Trash is handled separately and is not included.
+        """
+        return USERPATH + USERHISTORY + USERBROWSERS + USERMISCS + USERAGGRESIVE
+
+    # Function 'insert'
+    def insert(self, key: str, rel: str):
+        """
+        Add one rule to the trie, splitting it into path components.
+        Components containing glob characters become wildcard children.
+        Every node along the way records the key as reachable.
+        """
+        if rel.startswith("~/"):
+            rel = rel[2:]
+        node = self.root
+        node.subkeys.add(key)
+        for part in [x for x in rel.split("/") if x]:
+            if any(c in part for c in "*?["):
+                child = next((n for pat, _, n in node.wildcards if pat == part), None)
+                if child is None:
+                    child = RuleNode()
+                    node.wildcards.append((part, re.compile(fnmatch.translate(part)), child))
+            else:
+                child = node.children.setdefault(part, RuleNode())
+            node = child
+            node.subkeys.add(key)
+        node.keys.append(key)
+
+    # Function 'descend'
+    def descend(self, home: str, enabled: Callable[[str], bool]) -> Iterator[Tuple[str, str, bool]]:
+        """
+        Resolve all enabled rules under a home directory in a single descent.
+        Only directories leading to an enabled rule are listed or probed.
+        Yields (key, path, isdir) where isdir never follows a final symlink.
+        """
+        stack: List[Tuple[str, RuleNode]] = [(home, self.root)]
+        while stack:
+            dirpath, node = stack.pop()
+            if node.wildcards or len(node.children) > RuleIndex.PROBEMAX:
+                try:
+                    with os.scandir(dirpath) as it:
+                        found = [(e.name, e.path) for e in it]
+                except OSError:
+                    continue
+            else:
+                found = [(name, os.path.join(dirpath, name)) for name in node.children]
+
+            for name, path in found:
+                targets = []
+                if name in node.children:
+                    targets.append(node.children[name])
+                targets.extend(n for _, rx, n in node.wildcards if rx.match(name))
+                for child in targets:
+                    if not any(enabled(k) for k in child.subkeys):
+                        continue
+                    try:
+                        st = os.lstat(path)
+                    except OSError:
+                        break
+                    key = next((k for k in child.keys if enabled(k)), None)
+                    if key is not None:
+                        yield key, path, stat.S_ISDIR(st.st_mode)
+                        break
+                    if not child.children and not child.wildcards:
+                        continue
+                    if stat.S_ISDIR(st.st_mode) or (stat.S_ISLNK(st.st_mode) and os.path.isdir(path)):
+                        stack.append((path, child))
+
+
+# Class 'ExcludeNode'
+class ExcludeNode:
+    """
+    Single path component in the compiled exclusion trie.
+    Holds literal children by name and wildcard children as regexes,
+    plus one merged regex that rejects most names in a single call.
+    """
+
+    # Function '__init__'
+    def __init__(self):
+        """
+        Create an empty, non-terminal node.
+        Children are filled in by ExcludeIndex.insert; 'anymatch' is
+        compiled once all patterns are in.
+        """
+        self.children: Dict[str, "ExcludeNode"] = {}
+        self.wildcards: List[Tuple[str, "re.Pattern[str]", "ExcludeNode"]] = []
+        self.anymatch: Optional["re.Pattern[str]"] = None
+        self.end = False
+
+
+# Class 'ExcludeIndex'
+class ExcludeIndex:
+    """
+    Path-component trie of user exclusions (paths and per-component globs).
+    Walkers carry a state (the nodes matching the current folder) and step
+    it per entry, so an excluded folder is pruned before it is listed.
+    """
+
+    # Function '__init__'
+    def __init__(self, patterns: List[str], homes: List[str]):
+        """
+        Build the trie from absolute and home-relative patterns.
+        Relative or '~/' patterns are inserted below every home in 'homes',
+        so a lookup never depends on which home is being cleaned.
+        """
+        self.root = ExcludeNode()
+        for pat in patterns:
+            if pat.startswith("/"):
+                self.insert(pat)
+                continue
+            rel = pat[2:] if pat.startswith("~/") else pat
+            for home in homes:
+                if home:
+                    self.insert(f"{home}/{rel}")
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.wildcards:
+                node.anymatch = re.compile("|".join(fnmatch.translate(pat) for pat, _, _ in node.wildcards))
+            stack.extend(node.children.values())
+            stack.extend(n for _, _, n in node.wildcards)
+
+    # Function 'compile'
+    @staticmethod
+    def compile(text: str, homes: List[str]) -> Optional["ExcludeIndex"]:
+        """
+        Build an index from the ';' or newline separated exclusion setting.
+        Returns None when there is nothing to exclude, which lets walkers
+        skip every exclusion check.
+        """
+        patterns = ExcludeIndex.patterns(text)
+        return ExcludeIndex(patterns, homes) if patterns else None
+
+    # Function 'patterns'
+    @staticmethod
+    def patterns(text: str) -> List[str]:
+        """
+        Split the exclusion setting into patterns.
+        Entries are separated by ';' or newlines; blanks are dropped and
+        trailing slashes ignored.
+        """
+        return [x.strip().rstrip("/") for x in re.split(r"[;\n]", text) if x.strip().rstrip("/")]
+
+    # Function 'insert'
+    def insert(self, path: str):
+        """
+        Add one absolute pattern, splitting it into path components.
+        Components containing glob characters become wildcard children
+        matched against a single name, like RuleIndex rules.
+        """
+        node = self.root
+        for part in [x for x in path.split("/") if x and x != "."]:
+            if any(c in part for c in "*?["):
+                child = next((n for pat, _, n in node.wildcards if pat == part), None)
+                if child is None:
+                    child = ExcludeNode()
+                    node.wildcards.append((part, re.compile(fnmatch.translate(part)), child))
+            else:
+                child = node.children.setdefault(part, ExcludeNode())
+            node = child
+        node.end = True
+
+    # Function 'step'
+    @staticmethod
+    def step(state: Tuple[ExcludeNode, ...], name: str) -> Optional[Tuple[ExcludeNode, ...]]:
+        """
+        Advance a folder's state to one of its entries.
+        Returns None when the entry is excluded, otherwise the entry's state;
+        an empty state means nothing below the entry is excluded.
+        """
+        out = []
+        for node in state:
+            child = node.children.get(name)
+            if child is not None:
+                if child.end:
+                    return None
+                out.append(child)
+            if node.anymatch is not None and node.anymatch.match(name):
+                for _, rx, child in node.wildcards:
+                    if rx.match(name):
+                        if child.end:
+                            return None
+                        out.append(child)
+        return tuple(out)
+
+    # Function 'at'
+    def at(self, path: str) -> Optional[Tuple[ExcludeNode, ...]]:
+        """
+        Return the state of a path, stepping from the root once per component.
+        None means the path or one of its parents is excluded; the cost is
+        O(depth) whatever the number of exclusions.
+        """
+        state: Optional[Tuple[ExcludeNode, ...]] = (self.root,)
+        for part in path.split("/"):
+            if not part:
+                continue
+            state = self.step(state, part)
+            if not state:
+                return state
+        return state
+
+
 # Class 'FileOps'
 class FileOps:
     """
@@ -653,17 +1543,18 @@ class FileOps:
     def removefile(path: Path, dryrun: bool, cb: FileRowCB) -> int:
         """
         Delete a file or directory path and report reclaimed bytes.
-        Honors dry-run mode and emits a row before removal attempts.
-        Returns the estimated size removed; errors are swallowed safely.
+        Dry runs emit the row right away; real runs only once the path is
+        gone. Returns the estimated size removed; errors are swallowed safely.
         """
         try:
             if not path.exists():
                 return 0
-            FileOps.emitrow(cb, path)
             size = path.stat().st_size if path.is_file() else 0
 
             if dryrun:
+                FileOps.emitrow(cb, path)
                 return size
+            rowsize, mtime = SysUtils.filesize(path), SysUtils.mtimestring(path)
             try:
                 if path.is_file() or stat.S_ISLNK(path.stat().st_mode):
                     path.unlink(missing_ok=True)
@@ -676,126 +1567,2030 @@ class FileOps:
                 size = 0
             except PermissionError:
                 ShellExec.cmdrun(f"rm -f {shlex.quote(str(path))}", dryrun=False)
+            if os.path.lexists(path):
+                return 0
+            cb(str(path), rowsize, mtime)
             return size
         except (OSError, PermissionError, FileNotFoundError):
             return 0
 
     # Function 'removetree'
     @staticmethod
-    def removetree(path: Path, dryrun: bool, cb: FileRowCB) -> int:
+    def removetree(path: Path, dryrun: bool, cb: FileRowCB, guard: Optional[GuardCB] = None,
+                   exclude: Optional[ExcludeIndex] = None) -> int:
         """
         Recursively remove a directory tree and sum contained file sizes.
-        Emits rows for the parent and all children to show detailed progress.
-        Returns the total size estimate; respects dry-run mode.
+        Unlinks files in one scandir walk (excluded entries are pruned, so
+        their parents survive rmdir), then removes folders bottom-up. Real
+        runs emit a row only for entries that were actually removed.
         """
-        try:
-            if not path.exists():
+        state: Optional[tuple] = ()
+        if exclude is not None:
+            state = exclude.at(str(path))
+            if state is None:
                 return 0
-            total = 0
-
-            for p in path.rglob("*"):
-                try:
-                    if p.is_file():
-                        total += p.stat().st_size
-                except (OSError, PermissionError, FileNotFoundError):
-                    pass
-
-            FileOps.emitrow(cb, path)
-            for p in path.rglob("*"):
-                FileOps.emitrow(cb, p)
-            if dryrun:
-                return total
-            shutil.rmtree(path, ignore_errors=True)
-            return total
-        except (OSError, PermissionError, FileNotFoundError):
+        try:
+            st = os.lstat(path)
+        except OSError:
             return 0
+        if not stat.S_ISDIR(st.st_mode):
+            return FileOps.removefile(path, dryrun, cb)
 
-    # Function 'wipedir'
-    @staticmethod
-    def wipedir(path: Path, dryrun: bool, cb: FileRowCB) -> int:
-        """
-        Remove all children of a directory without deleting the directory itself.
-        Iterates files and subfolders, using removefile/removetree as needed.
-        Returns total estimated bytes affected; tolerates filesystem errors.
-        """
-        if not path.exists() or not path.is_dir():
-            return 0
+        if dryrun:
+            FileOps.statrow(cb, str(path), st)
         total = 0
+        guard = FileOps.stopguard(guard, lambda: total)
+        folders = [(str(path), st)]
+        stack = [(str(path), state)]
+        while stack:
+            current, state = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                if guard is not None:
+                    guard()
+                sub = ()
+                if state:
+                    sub = exclude.step(state, entry.name)
+                    if sub is None:
+                        continue
+                try:
+                    est = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISDIR(est.st_mode):
+                    if dryrun:
+                        FileOps.statrow(cb, entry.path, est)
+                    stack.append((entry.path, sub))
+                    folders.append((entry.path, est))
+                    continue
+                if not dryrun:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        continue
+                FileOps.statrow(cb, entry.path, est)
+                if stat.S_ISREG(est.st_mode):
+                    total += est.st_size
+        if not dryrun:
+            for folder, fst in reversed(folders):
+                if guard is not None:
+                    guard()
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    continue
+                FileOps.statrow(cb, folder, fst)
+        return total
+
+    # Function 'counttree'
+    @staticmethod
+    def counttree(path: Path, guard: Optional[GuardCB] = None,
+                  exclude: Optional[ExcludeIndex] = None) -> Tuple[int, int]:
+        """
+        Count entries and regular-file bytes below a path without emitting rows.
+        Mirrors removetree's walk: the top entry counts as one, symlinks are
+        never followed and exclusions are pruned. Used by the pre-count pass.
+        """
+        state: Optional[tuple] = ()
+        if exclude is not None:
+            state = exclude.at(str(path))
+            if state is None:
+                return 0, 0
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return 0, 0
+        if not stat.S_ISDIR(st.st_mode):
+            return 1, st.st_size if stat.S_ISREG(st.st_mode) else 0
+        entries, total = 1, 0
+        stack = [(str(path), state)]
+        while stack:
+            current, state = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if guard is not None:
+                            guard()
+                        sub = ()
+                        if state:
+                            sub = exclude.step(state, entry.name)
+                            if sub is None:
+                                continue
+                        entries += 1
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, sub))
+                            elif entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return entries, total
+
+    # Function 'wipedir'
+    @staticmethod
+    def wipedir(path: Path, dryrun: bool, cb: FileRowCB,
+                sizecb: Optional[Callable[[str, int], None]] = None, guard: Optional[GuardCB] = None,
+                stash: Optional[Callable[[Path], bool]] = None, exclude: Optional[ExcludeIndex] = None) -> int:
+        """
+        Remove all children of a directory without deleting the directory itself.
+        Iterates non-excluded children, using removefile/removetree as needed;
+        children a 'stash' callback accepts (quarantine) are not walked.
+        """
+        if not path.exists() or not path.is_dir():
+            return 0
+        state: Optional[tuple] = ()
+        if exclude is not None:
+            state = exclude.at(str(path))
+            if state is None:
+                return 0
+        total = 0
+        guard = FileOps.stopguard(guard, lambda: total)
+        try:
+            for item in path.iterdir():
+                if guard is not None:
+                    guard()
+                if state and exclude.step(state, item.name) is None:
+                    continue
+                if stash is not None and stash(item):
+                    continue
+                if item.is_dir() and not item.is_symlink():
+                    n = FileOps.removetree(item, dryrun, cb, guard, exclude)
+                    if sizecb is not None:
+                        sizecb(str(item), n)
+                    total += n
+                else:
+                    total += FileOps.removefile(item, dryrun, cb)
+            return total
+        except (OSError, PermissionError, FileNotFoundError):
+            return 0
+
+    # Function 'statrow'
+    @staticmethod
+    def statrow(cb: FileRowCB, path: str, st: os.stat_result):
+        """
+        Produce a table row from an already known stat result.
+        Avoids the extra size/mtime probes performed by emitrow.
+        Directories report zero bytes since their children are rows too.
+        """
+        size = st.st_size if stat.S_ISREG(st.st_mode) else 0
+        cb(path, size, SysUtils.stampstring(st.st_mtime))
+
+    # Function 'stopguard'
+    @staticmethod
+    def stopguard(guard: Optional[GuardCB], partial: Callable[[], int]) -> Optional[GuardCB]:
+        """
+        Wrap a walker guard so a stop carries the bytes already removed.
+        The RuntimeError gets 'partial' added to its 'partial' attribute,
+        so nested walkers sum up and the cleaner can count a stopped job.
+        """
+        if guard is None:
+            return None
+
+        # Function 'check'
+        def check():
+            """
+            Call the wrapped guard; on a stop, add this walker's bytes so far.
+            The exception is re-raised unchanged otherwise.
+            Called for every visited entry.
+            """
+            try:
+                guard()
+            except RuntimeError as e:
+                e.partial = getattr(e, "partial", 0) + partial()
+                raise
+
+        return check
+
+    # Function 'trimtree'
+    @staticmethod
+    def trimtree(path: Path, budget: int, dryrun: bool, cb: FileRowCB, guard: Optional[GuardCB] = None,
+                 exclude: Optional[ExcludeIndex] = None) -> int:
+        """
+        Shrink a cache directory below a byte budget instead of wiping it.
+        Evicts least recently used non-excluded files first, using the later of
+        atime and mtime so noatime mounts fall back to modification order.
+        """
+        state: Optional[tuple] = ()
+        if exclude is not None:
+            state = exclude.at(str(path))
+            if state is None:
+                return 0
+        entries: List[Tuple[float, str, int, float]] = []
+        total = freed = 0
+        guard = FileOps.stopguard(guard, lambda: freed)
+        stack = [(str(path), state)]
+        while stack:
+            current, state = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if guard is not None:
+                            guard()
+                        sub = ()
+                        if state:
+                            sub = exclude.step(state, entry.name)
+                            if sub is None:
+                                continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, sub))
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if stat.S_ISREG(st.st_mode):
+                            entries.append((max(st.st_atime, st.st_mtime), entry.path, st.st_size, st.st_mtime))
+                            total += st.st_size
+            except OSError:
+                continue
+
+        if total <= budget:
+            return 0
+        heapq.heapify(entries)
+        while entries and total - freed > budget:
+            if guard is not None:
+                guard()
+            _, fpath, size, mtime = heapq.heappop(entries)
+            if not dryrun:
+                try:
+                    os.unlink(fpath)
+                except FileNotFoundError:
+                    freed += size
+                    continue
+                except OSError:
+                    continue
+            cb(fpath, size, SysUtils.stampstring(mtime))
+            freed += size
+        return freed
+
+    # Function 'globdel'
+    @staticmethod
+    def globdel(dirpath: Path, pattern: str, dryrun: bool, cb: FileRowCB) -> int:
+        """
+        Delete files matching a glob-like pattern under a base directory.
+        Emits rows for matched paths and honors dry-run for safety.
+        Returns the total estimated bytes removed or 0 on failure.
+        """
+        return sum(FileOps.globwalk(dirpath, [(pattern, pattern)], dryrun, cb).values())
+
+    # Function 'globwalk'
+    @staticmethod
+    def globwalk(dirpath: Path, rules: List[Tuple[str, str]], dryrun: bool, cb: FileRowCB,
+                 onmatch: Optional[Callable[[str], None]] = None, guard: Optional[GuardCB] = None,
+                 exclude: Optional[ExcludeIndex] = None) -> Dict[str, int]:
+        """
+        Walk a base directory once and delete entries matching any rule.
+        Rules are (key, pattern) pairs tested together by a GlobMatcher;
+        onmatch receives each match's key; excluded entries are pruned first.
+        """
+        totals: Dict[str, int] = {key: 0 for key, _ in rules}
+        if not rules or not dirpath.is_dir():
+            return totals
+        state: Optional[tuple] = ()
+        if exclude is not None:
+            state = exclude.at(str(dirpath))
+            if state is None:
+                return totals
+        matcher = GlobMatcher(rules)
+        guard = FileOps.stopguard(guard, lambda: sum(totals.values()))
+        stack = [(str(dirpath), state)]
+        while stack:
+            current, state = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                if guard is not None:
+                    guard()
+                sub = ()
+                if state:
+                    sub = exclude.step(state, entry.name)
+                    if sub is None:
+                        continue
+                try:
+                    isdir = entry.is_dir(follow_symlinks=False)
+                    key = matcher.match(entry.name)
+                    if key is None:
+                        if isdir:
+                            stack.append((entry.path, sub))
+                        continue
+                    if onmatch is not None:
+                        onmatch(key)
+                    if isdir:
+                        totals[key] += FileOps.removetree(Path(entry.path), dryrun, cb, guard, exclude)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not dryrun:
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        continue
+                    except PermissionError:
+                        ShellExec.cmdrun(f"rm -f {shlex.quote(entry.path)}", dryrun=False)
+                        if os.path.lexists(entry.path):
+                            continue
+                    except OSError:
+                        continue
+                FileOps.statrow(cb, entry.path, st)
+                totals[key] += st.st_size if stat.S_ISREG(st.st_mode) else 0
+        return totals
+
+
+# Class 'DockerCleaner'
+class DockerCleaner:
+    """
+    Best-effort Docker cleanup helper (containers/images/volumes/networks).
+    Mirrors the common full-clean sequence while tolerating missing Docker.
+    Honors dry-run mode and avoids errors when resource lists are empty.
+    """
+
+    # Function 'clean'
+    @staticmethod
+    def clean(opts: "ExecOpts", runner: Optional[Callable[[str], int]] = None) -> None:
+        """
+        Run cleanup steps based on ExecOpts flags for Docker resources.
+        Each step quietly skips when there is nothing to remove or Docker is absent.
+        'runner' replaces cmdrun, so SysCleaner.command can honor stop requests.
+        """
+        dryrun = opts.dryrun
+        run = runner or (lambda c: ShellExec.cmdrun(c, dryrun))
+        if opts.dockercontainers:
+            ec, out = ShellExec.capture("docker ps -aq")
+            if ec == 0 and out.strip():
+                run("docker stop $(docker ps -aq)")
+                run("docker rm $(docker ps -aq)")
+
+        if opts.dockerimages:
+            ec, out = ShellExec.capture("docker images -q")
+            if ec == 0 and out.strip():
+                run("docker rmi -f $(docker images -q)")
+
+        if opts.dockervolumes:
+            ec, out = ShellExec.capture("docker volume ls -q")
+            if ec == 0 and out.strip():
+                run("docker volume rm $(docker volume ls -q)")
+
+        if opts.dockernetworks:
+            ec, out = ShellExec.capture("docker network ls -q")
+            if ec == 0 and out.strip():
+                run("docker network rm $(docker network ls -q | xargs -n1 docker network inspect -f '{{.Name}} {{.ID}}' | grep -v '^bridge ' | grep -v '^host ' | grep -v '^none ' | awk '{print $2}')")
+
+        if any([opts.dockercontainers, opts.dockerimages, opts.dockervolumes, opts.dockernetworks]):
+            run("docker system prune -a --volumes -f")
+
+
+# Class 'DeviceScheduler'
+class DeviceScheduler:
+    """
+    Runs cleanup jobs grouped by the block device their path lives on.
+    Each device gets its own queue and worker count by device class, so
+    separate disks are cleaned in parallel while an HDD is never thrashed.
+    """
+
+    # Function '__init__'
+    def __init__(self, hddworkers: int = 1, ssdworkers: int = 4):
+        """
+        Create an empty scheduler with the concurrency for each device class.
+        Rotational disks use 'hddworkers'; SSDs, tmpfs and other virtual
+        filesystems use 'ssdworkers'. Values below one are raised to one.
+        """
+        self.workers = {"hdd": max(1, int(hddworkers)), "ssd": max(1, int(ssdworkers))}
+        self.queues: Dict[int, List[Tuple[str, Callable[[], None]]]] = {}
+        self.errors: List[BaseException] = []
+        self.failed = threading.Event()
+
+    # Function 'devof'
+    @staticmethod
+    def devof(path: str) -> int:
+        """
+        Return st_dev of a path, or of its nearest existing ancestor.
+        Symlinks are not followed: the link itself is what gets removed.
+        Falls back to device 0 when nothing along the path can be stat'ed.
+        """
+        p = path
+        while True:
+            try:
+                return os.lstat(p).st_dev
+            except OSError:
+                parent = os.path.dirname(p)
+                if parent == p:
+                    return 0
+                p = parent
+
+    # Function 'devclass'
+    @staticmethod
+    def devclass(dev: int) -> str:
+        """
+        Classify a device as 'hdd' or 'ssd' from its sysfs queue/rotational flag.
+        Partitions read the flag of their parent disk; devices without a
+        block entry (tmpfs, overlay, network) count as 'ssd'.
+        """
+        base = Path(f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}")
+        for flag in (base / "queue/rotational", base / "../queue/rotational"):
+            try:
+                return "hdd" if flag.read_text(encoding="utf-8").strip() == "1" else "ssd"
+            except OSError:
+                continue
+        return "ssd"
+
+    # Function 'add'
+    def add(self, path: str, job: Callable[[], None]):
+        """
+        Queue a job that works below 'path' on that path's device.
+        Jobs of one device run in path order, which keeps an HDD's
+        head movement short when it has a single worker.
+        """
+        self.queues.setdefault(self.devof(path), []).append((path, job))
+
+    # Function 'run'
+    def run(self):
+        """
+        Run every queued job and wait until all devices are done.
+        The first exception stops workers from taking new jobs and is
+        re-raised here, so callers see the same errors as a serial run.
+        """
+        threads = []
+        for dev, jobs in self.queues.items():
+            jobs.sort(key=lambda item: item[0])
+            pending: "queue.Queue[Callable[[], None]]" = queue.Queue()
+            for _, job in jobs:
+                pending.put(job)
+            count = min(len(jobs), self.workers[self.devclass(dev)])
+            for _ in range(count):
+                t = threading.Thread(target=self.drain, args=(pending,), daemon=True)
+                t.start()
+                threads.append(t)
+        for t in threads:
+            t.join()
+        self.queues.clear()
+        if self.errors:
+            raise self.errors[0]
+
+    # Function 'drain'
+    def drain(self, pending: "queue.Queue[Callable[[], None]]"):
+        """
+        Worker loop for one device queue: run jobs until it is empty.
+        Stops early once any worker has failed; records every exception,
+        not just the expected ones, so run() re-raises it on the caller.
+        """
+        while not self.failed.is_set():
+            try:
+                job = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                job()
+            except BaseException as e:
+                self.errors.append(e)
+                self.failed.set()
+
+
+# Class 'PressureThrottle'
+class PressureThrottle:
+    """
+    Pacing for low-impact runs on busy hosts.
+    Drops the cleaner to idle I/O and lowest CPU priority, slows down
+    per entry while PSI shows I/O or CPU pressure, and caps ops per second.
+    """
+
+    # Define 'PSIFILES'
+    PSIFILES = ("/proc/pressure/io", "/proc/pressure/cpu")
+
+    # Define 'IOPRIOSET'
+    IOPRIOSET = {"x86_64": 251, "i386": 289, "i686": 289, "aarch64": 30, "riscv64": 30, "armv7l": 314, "ppc64le": 273}
+
+    # Define 'SAMPLEGAP'
+    SAMPLEGAP = 1.0
+
+    # Define 'MAXDELAY'
+    MAXDELAY = 0.5
+
+    # Function '__init__'
+    def __init__(self, limit: float = 10.0, opsmax: int = 0):
+        """
+        Create a throttle slowing down above 'limit' percent of PSI 'some avg10'.
+        An 'opsmax' above zero caps the entries processed per second.
+        No priorities change until apply() is called.
+        """
+        self.limit = max(0.1, float(limit))
+        self.opsmax = max(0, int(opsmax))
+        self.delay = 0.0
+        self.pressure = 0.0
+        self.sampled = 0.0
+        self.nextop = 0.0
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    # Function 'apply'
+    def apply(self):
+        """
+        Lower CPU (nice 19) and I/O (idle class) priority of the calling thread.
+        Threads and commands started afterwards inherit both settings.
+        Unsupported platforms or denied calls are silently ignored.
+        """
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, 19)
+        except OSError:
+            pass
+        nr = self.IOPRIOSET.get(platform.machine())
+        if nr is None:
+            return
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.syscall(nr, 1, 0, 3 << 13)
+        except (OSError, AttributeError):
+            pass
+
+    # Function 'readpsi'
+    @staticmethod
+    def readpsi(path: str) -> float:
+        """
+        Return the 'some avg10' percentage from a /proc/pressure file.
+        Kernels without PSI (or without access) read as no pressure.
+        Only the first 'some' line is parsed.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.startswith("some "):
+                        for field in line.split()[1:]:
+                            if field.startswith("avg10="):
+                                return float(field[6:])
+        except (OSError, ValueError):
+            pass
+        return 0.0
+
+    # Function 'sample'
+    def sample(self, now: float):
+        """
+        Re-read PSI at most once per SAMPLEGAP and adapt the per-entry delay.
+        Above the limit the delay doubles (up to MAXDELAY, i.e. a near pause);
+        below it the delay halves until it drops back to zero.
+        """
+        if now - self.sampled < self.SAMPLEGAP:
+            return
+        self.sampled = now
+        self.pressure = max(self.readpsi(p) for p in self.PSIFILES)
+        if self.pressure >= self.limit:
+            self.delay = min(self.MAXDELAY, max(0.001, self.delay * 2))
+        else:
+            self.delay = self.delay / 2 if self.delay >= 0.002 else 0.0
+
+    # Function 'pace'
+    def pace(self):
+        """
+        Called once per entry: sleeps as long as pressure and the cap require.
+        Safe from several device workers; the ops cap is shared by all.
+        Sleeps wait on the 'cancelled' event, so a stop cuts them short.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.sample(now)
+            wait = self.delay
+            if self.opsmax:
+                self.nextop = max(self.nextop, now) + 1.0 / self.opsmax
+                wait = max(wait, self.nextop - now - 1.0 / self.opsmax)
+        if wait > 0:
+            self.cancelled.wait(wait)
+
+
+# Class 'SizeIndex'
+class SizeIndex:
+    """
+    Persistent cache of entry and byte counts per (home, rule key) target.
+    Filled from completed dry runs and from the pre-count pass, dropped for
+    targets a real run has just cleaned, and expired after MAXAGE seconds.
+    """
+
+    # Define 'MAXAGE'
+    MAXAGE = 6 * 3600
+
+    # Function '__init__'
+    def __init__(self, path: Path = SIZEINDEXFILE):
+        """
+        Load the cache file if present; a missing or corrupt file is empty.
+        Changes are kept in memory, and remembered for merging, until
+        save() is called. A lock keeps concurrent readers and writers consistent.
+        """
+        self.path = path
+        self.data: Dict[str, dict] = SizeIndex.load(path)
+        self.changes: Dict[str, dict] = {}
+        self.dropped: Set[str] = set()
+        self.lock = threading.Lock()
+        self.dirty = False
+
+    # Function 'load'
+    @staticmethod
+    def load(path: Path) -> Dict[str, dict]:
+        """
+        Read an index file into a dict.
+        A missing or corrupt file reads as empty.
+        Used on construction and when merging in save().
+        """
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            if isinstance(raw, dict):
+                return raw
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    # Function 'keyof'
+    @staticmethod
+    def keyof(home: str, key: str, variant: str = "") -> str:
+        """
+        Build the cache key for a target; system targets use an empty home.
+        The separator matches the SYSGLOBS 'base::pattern' convention; a
+        variant (see variant()) is appended after '#' when set.
+        """
+        return f"{home}::{key}#{variant}" if variant else f"{home}::{key}"
+
+    # Function 'variant'
+    @staticmethod
+    def variant(budget: int = 0, excludes: str = "") -> str:
+        """
+        Name the settings a target's counts depend on, beyond its path.
+        Counts are kept per trim budget and per exclusion set (a short hash);
+        targets with neither use no variant.
+        """
+        parts = []
+        if budget > 0:
+            parts.append(f"b{int(budget)}")
+        pats = sorted(set(ExcludeIndex.patterns(excludes)))
+        if pats:
+            parts.append("x" + hashlib.sha1("\n".join(pats).encode("utf-8")).hexdigest()[:12])
+        return "-".join(parts)
+
+    # Function 'get'
+    def get(self, home: str, key: str, maxage: Optional[float] = None,
+            variant: str = "") -> Optional[Tuple[int, int]]:
+        """
+        Return cached (entries, bytes) for a target if younger than maxage.
+        Defaults to MAXAGE; stale or missing targets return None.
+        Never touches the filesystem.
+        """
+        with self.lock:
+            rec = self.data.get(self.keyof(home, key, variant))
+        if not rec:
+            return None
+        if time.time() - float(rec.get("stamp", 0)) > (SizeIndex.MAXAGE if maxage is None else maxage):
+            return None
+        return int(rec.get("entries", 0)), int(rec.get("bytes", 0))
+
+    # Function 'put'
+    def put(self, home: str, key: str, entries: int, nbytes: int, variant: str = ""):
+        """
+        Store fresh counts for a target with the current timestamp.
+        Marks the index dirty so the next save() writes it out.
+        Negative values are clamped to zero.
+        """
+        k = self.keyof(home, key, variant)
+        with self.lock:
+            self.data[k] = self.changes[k] = {"entries": max(0, int(entries)), "bytes": max(0, int(nbytes)),
+                                              "stamp": time.time()}
+            self.dirty = True
+
+    # Function 'drop'
+    def drop(self, home: str, key: str):
+        """
+        Forget a target in every variant, typically right after a real run
+        emptied it. Missing targets are ignored.
+        Marks the index dirty when something was removed.
+        """
+        base = self.keyof(home, key)
+        with self.lock:
+            for k in [k for k in self.data if SizeIndex.under(k, base)]:
+                del self.data[k]
+                self.changes.pop(k, None)
+                self.dirty = True
+            self.dropped.add(base)
+
+    # Function 'under'
+    @staticmethod
+    def under(k: str, base: str) -> bool:
+        """
+        Tell whether cache key 'k' is the target 'base' in any variant.
+        Variants follow the target key after '#'.
+        Used by drop() and when merging drops in save().
+        """
+        return k == base or k.startswith(base + "#")
+
+    # Function 'save'
+    def save(self):
+        """
+        Merge this instance's changes into the file on disk and replace it.
+        A flock on a side lock file serializes savers from other instances
+        and processes; each writes its own mkstemp file before the rename.
+        Filesystem errors are ignored; the cache is only an optimization.
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            changes, self.changes = self.changes, {}
+            dropped, self.dropped = self.dropped, set()
+            self.dirty = False
+        tmp = ""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_name(self.path.name + ".lock"), "a", encoding="utf-8") as lk:
+                fcntl.flock(lk.fileno(), fcntl.LOCK_EX)
+                data = SizeIndex.load(self.path)
+                for base in dropped:
+                    for k in [k for k in data if SizeIndex.under(k, base)]:
+                        del data[k]
+                data.update(changes)
+                fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=str(self.path.parent))
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    fh.write(json.dumps(data))
+                os.replace(tmp, self.path)
+                tmp = ""
+        except OSError:
+            pass
+        finally:
+            if tmp:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+
+# Class 'EtaEstimator'
+class EtaEstimator:
+    """
+    Remaining-time estimate from a progress fraction sampled over time.
+    Throughput is an exponentially weighted average with a time constant,
+    so irregular sampling intervals do not skew the result.
+    """
+
+    # Function '__init__'
+    def __init__(self, tau: float = 5.0):
+        """
+        Create an estimator whose rate reacts over roughly 'tau' seconds.
+        The first sample only establishes the starting point.
+        No estimate is available until the rate becomes positive.
+        """
+        self.tau = max(0.1, float(tau))
+        self.rate: Optional[float] = None
+        self.lastfrac = 0.0
+        self.lasttime: Optional[float] = None
+
+    # Function 'update'
+    def update(self, frac: float, now: float) -> Optional[float]:
+        """
+        Feed the current fraction done (0..1) at time 'now' in seconds.
+        Returns the estimated seconds remaining, or None when unknown.
+        Fractions never move backwards for rate purposes.
+        """
+        frac = min(1.0, max(0.0, frac))
+        if self.lasttime is None:
+            self.lasttime, self.lastfrac = now, frac
+            return None
+        dt = now - self.lasttime
+        if dt > 0:
+            inst = max(0.0, frac - self.lastfrac) / dt
+            weight = 1.0 - pow(2.718281828459045, -dt / self.tau)
+            self.rate = inst if self.rate is None else self.rate + weight * (inst - self.rate)
+            self.lasttime, self.lastfrac = now, max(frac, self.lastfrac)
+        if not self.rate or self.rate <= 0:
+            return None
+        return (1.0 - frac) / self.rate
+
+    # Function 'format'
+    @staticmethod
+    def format(seconds: Optional[float]) -> str:
+        """
+        Render a remaining time as 'ETA m:ss' or 'ETA h:mm:ss'.
+        Returns 'ETA --:--' while no estimate is available.
+        Fractional seconds are rounded up.
+        """
+        if seconds is None:
+            return "ETA --:--"
+        secs = int(seconds + 0.999)
+        h, rem = divmod(secs, 3600)
+        m, sec = divmod(rem, 60)
+        return f"ETA {h}:{m:02d}:{sec:02d}" if h else f"ETA {m}:{sec:02d}"
+
+
+# Class 'Telemetry'
+class Telemetry:
+    """
+    Plain progress counters of one run. Device workers update them
+    concurrently, so writers hold the cleaner's lock for every increment;
+    readers snapshot without locking and may be a few rows stale.
+    """
+
+    # Function '__init__'
+    def __init__(self):
+        """
+        Start every counter at zero with no current target.
+        Plan fields stay zero until the pre-count has finished.
+        Errors count failed commands and worker-reported errors.
+        """
+        self.entries = 0
+        self.bytes = 0
+        self.errors = 0
+        self.target = ""
+        self.planentries = 0
+        self.planbytes = 0
+        self.pending = 0
+
+    # Function 'snapshot'
+    def snapshot(self) -> dict:
+        """
+        Copy the counters into a dict suitable for signals or IPC.
+        Cheap enough to call at a fixed rate regardless of row volume.
+        Keys match the attribute names.
+        """
+        return {
+            "entries": self.entries,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "target": self.target,
+            "planentries": self.planentries,
+            "planbytes": self.planbytes,
+            "pending": self.pending,
+        }
+
+
+# Class 'ExportSink'
+class ExportSink:
+    """
+    Streaming writer for result rows as CSV or NDJSON, optionally gzipped.
+    Rows are written through a large buffer as they arrive, so memory
+    stays constant however many rows a run produces.
+    """
+
+    # Define 'BUFSIZE'
+    BUFSIZE = 1 << 20
+
+    # Function '__init__'
+    def __init__(self, path: str):
+        """
+        Prepare a sink for 'path'; the format follows the file extension.
+        '.ndjson', '.jsonl' and '.json' select NDJSON, anything else CSV;
+        a trailing '.gz' adds gzip compression. Nothing is opened yet.
+        """
+        self.path = path
+        name = path.lower()
+        self.compress = name.endswith(".gz")
+        if self.compress:
+            name = name[:-3]
+        self.fmt = "ndjson" if name.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+        self.fh: Optional[io.TextIOBase] = None
+        self.raw: Optional[io.BufferedIOBase] = None
+        self.writer = None
+        self.rows = 0
+
+    # Function 'open'
+    def open(self):
+        """
+        Create the output file and write the CSV header if needed.
+        Symlinks are not followed and only a plain, singly linked file is
+        truncated; raises OSError otherwise, so the run fails early.
+        """
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW | os.O_CLOEXEC, 0o644)
+        try:
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode) or st.st_nlink != 1:
+                raise OSError(f"Refusing to overwrite {self.path}: not a plain file.")
+            os.ftruncate(fd, 0)
+        except OSError:
+            os.close(fd)
+            raise
+        if self.compress:
+            self.raw = os.fdopen(fd, "wb")
+            gz = gzip.GzipFile(fileobj=self.raw, mode="wb", compresslevel=6)
+            self.fh = io.TextIOWrapper(io.BufferedWriter(gz, self.BUFSIZE), encoding="utf-8", newline="")
+        else:
+            self.fh = os.fdopen(fd, "w", encoding="utf-8", newline="", buffering=self.BUFSIZE)
+        if self.fmt == "csv":
+            self.writer = csv.writer(self.fh)
+            self.writer.writerow(["path", "size", "mtime"])
+
+    # Function 'write'
+    def write(self, path: str, size: int, mtime: str):
+        """
+        Append one row; matches FileRowCB so it can tee the row stream.
+        Rows written after close() or before open() are dropped.
+        Write errors (e.g. a full disk) are swallowed like other file errors.
+        """
+        if self.fh is None:
+            return
+        try:
+            if self.writer is not None:
+                self.writer.writerow((path, size, mtime))
+            else:
+                self.fh.write(json.dumps({"path": path, "size": size, "mtime": mtime}) + "\n")
+            self.rows += 1
+        except (OSError, ValueError):
+            pass
+
+    # Function 'close'
+    def close(self, owner: Optional[int] = None):
+        """
+        Flush and close the file, finishing the gzip stream if any.
+        An owner uid hands the report to the user who asked for it when
+        it was written by the privileged worker; open() never followed a
+        symlink, and the descriptor it checked is the one chowned here.
+        """
+        if self.fh is None:
+            return
+        try:
+            if owner is not None:
+                os.fchown(self.fh.fileno(), owner, -1)
+        except (OSError, ValueError):
+            pass
+        for fh in (self.fh, self.raw):
+            try:
+                if fh is not None:
+                    fh.close()
+            except OSError:
+                pass
+        self.raw = None
+        self.fh = None
+        self.writer = None
+
+
+# Class 'AuditJournal'
+class AuditJournal:
+    """
+    Append-only NDJSON journal of everything a real run deleted.
+    The engine only queues records; a background writer appends them in
+    batches, one gzip member and one fsync per batch, rotating by size.
+    """
+
+    # Define 'BATCHMAX'
+    BATCHMAX = 8192
+
+    # Define 'BATCHSECS'
+    BATCHSECS = 1.0
+
+    # Define 'FILENAME'
+    FILENAME = "audit.ndjson.gz"
+
+    # Function '__init__'
+    def __init__(self, directory: str = "", maxbytes: int = 64 << 20, keep: int = 5):
+        """
+        Prepare a journal in 'directory' (default: defaultdir()).
+        The live file is rotated once it would exceed 'maxbytes', keeping
+        'keep' older generations. Nothing is opened yet.
+        """
+        self.dir = Path(directory) if directory else AuditJournal.defaultdir()
+        self.path = self.dir / self.FILENAME
+        self.maxbytes = max(1 << 20, int(maxbytes))
+        self.keep = max(1, int(keep))
+        self.runid = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.urandom(3).hex()}"
+        self.pending: List[object] = []
+        self.cond = threading.Condition()
+        self.closing = False
+        self.thread: Optional[threading.Thread] = None
+        self.fd = -1
+        self.errors = 0
+        self.failed = False
+
+    # Function 'defaultdir'
+    @staticmethod
+    def defaultdir() -> Path:
+        """
+        Return the journal directory used when none is configured.
+        Root runs (worker, headless, watch) log to /var/log/blitzclean;
+        unprivileged runs log under the user's config directory.
+        """
+        return Path("/var/log/blitzclean") if SysUtils.rootcheck() else CONFIGPATH / "audit"
+
+    # Function 'open'
+    def open(self, **info):
+        """
+        Open the live file for appending and start the background writer.
+        Queues a 'start' event carrying 'info'. Raises OSError when the
+        journal cannot be created, so nothing is deleted without a record.
+        """
+        self.dir.mkdir(parents=True, exist_ok=True, mode=0o750)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o640)
+        self.event("start", **info)
+        self.thread = threading.Thread(target=self.drain, daemon=True)
+        self.thread.start()
+
+    # Function 'record'
+    def record(self, key: str, path: str, size: int, mtime: str):
+        """
+        Queue one deleted entry; called from the engine for every row.
+        Only a tuple is appended under the lock; encoding, compression
+        and I/O happen on the writer thread.
+        """
+        if self.failed:
+            return
+        with self.cond:
+            self.pending.append((time.time(), key, path, size, mtime))
+            if len(self.pending) >= self.BATCHMAX:
+                self.cond.notify()
+
+    # Function 'event'
+    def event(self, ev: str, **fields):
+        """
+        Queue a run-level event such as 'start', 'command' or 'end'.
+        Events share the run id and timestamp fields of entry records.
+        Written in order with the surrounding entries.
+        """
+        if self.failed:
+            return
+        rec = {"ts": round(time.time(), 3), "run": self.runid, "ev": ev}
+        rec.update(fields)
+        with self.cond:
+            self.pending.append(rec)
+
+    # Function 'drain'
+    def drain(self):
+        """
+        Writer loop: take the queued records every BATCHSECS seconds or as
+        soon as BATCHMAX are waiting, and append them as one batch.
+        Returns after the final batch once close() was requested.
+        """
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.closing or len(self.pending) >= self.BATCHMAX, self.BATCHSECS)
+                batch, self.pending = self.pending, []
+                closing = self.closing
+            if batch:
+                self.flush(batch)
+            if closing:
+                return
+
+    # Function 'flush'
+    def flush(self, batch: List[object]):
+        """
+        Encode a batch as NDJSON (entry lines are formatted directly, only
+        strings go through the C escaper), compress it as one gzip member,
+        append it and fsync; zcat or gzip.open read the members back.
+        """
+        if self.failed:
+            return
+        quote = json.encoder.encode_basestring_ascii
+        run = quote(self.runid)
+        lines: List[str] = []
+        for rec in batch:
+            if isinstance(rec, dict):
+                lines.append(json.dumps(rec, separators=(",", ":")))
+                continue
+            ts, key, path, size, mtime = rec
+            lines.append(f'{{"ts":{ts:.3f},"run":{run},"key":{quote(key)},"path":{quote(path)},'
+                         f'"size":{int(size)},"mtime":{quote(mtime)}}}')
+        data = memoryview(gzip.compress(("\n".join(lines) + "\n").encode("utf-8"), compresslevel=6))
+        try:
+            self.rotate(len(data))
+            while data:
+                data = data[os.write(self.fd, data):]
+            os.fsync(self.fd)
+        except OSError as e:
+            self.disable(e)
+
+    # Function 'disable'
+    def disable(self, err: OSError):
+        """
+        Stop journaling after a write or rotate failure.
+        The error is reported on stderr and counted; later records are
+        dropped on purpose instead of being written to a dead descriptor.
+        """
+        self.errors += 1
+        self.failed = True
+        print(f"Audit journal {self.path} disabled: {err}", file=sys.stderr, flush=True)
+        if self.fd >= 0:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = -1
+
+    # Function 'rotate'
+    def rotate(self, incoming: int):
+        """
+        Rotate the live file if 'incoming' bytes would push it past maxbytes.
+        Generations are shifted to audit.N.ndjson.gz; the oldest beyond
+        'keep' is overwritten. A fresh live file is opened afterwards.
+        """
+        size = os.fstat(self.fd).st_size
+        if size == 0 or size + incoming <= self.maxbytes:
+            return
+        os.close(self.fd)
+        self.fd = -1
+        stem = self.FILENAME[:-len(".ndjson.gz")]
+        for i in range(self.keep - 1, 0, -1):
+            older = self.dir / f"{stem}.{i}.ndjson.gz"
+            if older.exists():
+                os.replace(older, self.dir / f"{stem}.{i + 1}.ndjson.gz")
+        os.replace(self.path, self.dir / f"{stem}.1.ndjson.gz")
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o640)
+
+    # Function 'close'
+    def close(self, **summary):
+        """
+        Queue an 'end' event with 'summary', write the last batch and wait
+        for the writer to finish before closing the file.
+        Does nothing when the journal was never opened.
+        """
+        if self.thread is None:
+            return
+        self.event("end", **summary)
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+        self.thread.join()
+        self.thread = None
+        if self.fd >= 0:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = -1
+
+
+# Class 'RunMetrics'
+class RunMetrics:
+    """
+    Prometheus metrics of one real run for the node_exporter textfile collector.
+    Only per-phase and per-command figures are collected while running; byte
+    and entry counts are read from the cleaner's per-target counts at the end.
+    """
+
+    # Define 'FILENAME'
+    FILENAME = "blitzclean.prom"
+
+    # Function '__init__'
+    def __init__(self, directory: str = ""):
+        """
+        Prepare empty phase, command and error tables for 'directory'
+        (default: defaultdir()). The file is only written by write(),
+        replacing the previous run's metrics.
+        """
+        self.dir = Path(directory) if directory else RunMetrics.defaultdir()
+        self.path = self.dir / self.FILENAME
+        self.phases: Dict[str, float] = {}
+        self.commands: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    # Function 'defaultdir'
+    @staticmethod
+    def defaultdir() -> Path:
+        """
+        Return the textfile directory used when none is configured.
+        Root runs write where Debian's prometheus-node-exporter looks;
+        unprivileged runs write under the user's config directory.
+        """
+        return Path("/var/lib/prometheus/node-exporter") if SysUtils.rootcheck() else CONFIGPATH / "metrics"
+
+    # Function 'phase'
+    @contextlib.contextmanager
+    def phase(self, name: str, inner):
+        """
+        Time the enclosed work as phase 'name' around the 'inner' context.
+        Durations of phases with the same name (one rule in several homes)
+        are summed; safe to use from the device workers.
+        """
+        t0 = time.perf_counter()
+        try:
+            with inner:
+                yield
+        finally:
+            dt = time.perf_counter() - t0
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + dt
+
+    # Function 'command'
+    def command(self, task: str, rc: int):
+        """
+        Record the exit code of an external command under its task name.
+        A non-zero code also counts as an error of type 'command'; the
+        first failing code of a task is kept over later successes.
+        """
+        with self.lock:
+            if not self.commands.get(task):
+                self.commands[task] = rc
+        if rc != 0:
+            self.error("command")
+
+    # Function 'error'
+    def error(self, kind: str, n: int = 1):
+        """
+        Count 'n' errors of type 'kind'.
+        Types are 'command', 'audit' and the exception class name
+        of a run that ended early.
+        """
+        with self.lock:
+            self.errors[kind] = self.errors.get(kind, 0) + n
+
+    # Function 'label'
+    @staticmethod
+    def label(value: str) -> str:
+        """
+        Escape a label value for the Prometheus text format.
+        Backslashes, double quotes and newlines are the only characters
+        that need escaping.
+        """
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    # Function 'lastsuccess'
+    def lastsuccess(self) -> float:
+        """
+        Read the last success timestamp from the previous metrics file.
+        Lets a failed run keep reporting when the last good run was.
+        Returns 0 when there is no previous file or value.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    if line.startswith("blitzclean_last_success_timestamp_seconds "):
+                        return float(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return 0.0
+
+    # Function 'render'
+    def render(self, success: bool, entries: int, counts: Dict[Tuple[str, str], List[int]]) -> str:
+        """
+        Render the metrics file from the collected tables and the cleaner's
+        per-(home, rule) [entries, bytes] counts. Bytes are summed per rule
+        and per user; every series is a gauge describing the last run.
+        """
+        now = time.time()
+        last = now if success else self.lastsuccess()
+        rules: Dict[str, int] = {}
+        users: Dict[str, int] = {}
+        for (home, key), (_, b) in counts.items():
+            rules[key] = rules.get(key, 0) + b
+            user = SysCleaner.homeuser(home)
+            users[user] = users.get(user, 0) + b
+        out: List[str] = []
+
+        # Function 'series'
+        def series(name: str, helptext: str, samples: List[Tuple[str, float]], label: str = ""):
+            """
+            Append one metric family: HELP and TYPE lines, then one sample
+            per (label value, number), or a single unlabelled sample.
+            Label values are escaped.
+            """
+            out.append(f"# HELP {name} {helptext}")
+            out.append(f"# TYPE {name} gauge")
+            for lv, v in samples:
+                lbl = f'{{{label}="{self.label(lv)}"}}' if label else ""
+                out.append(f"{name}{lbl} {round(v, 6) if isinstance(v, float) else v}")
+
+        with self.lock:
+            series("blitzclean_last_run_timestamp_seconds", "End time of the last run.", [("", now)])
+            series("blitzclean_last_run_success", "1 if the last run completed, 0 if it failed or was stopped.",
+                   [("", int(success))])
+            series("blitzclean_last_success_timestamp_seconds", "End time of the last completed run.",
+                   [("", last)])
+            series("blitzclean_run_duration_seconds", "Wall time of the last run.", [("", now - self.started)])
+            series("blitzclean_entries_processed", "Entries deleted or quarantined by the last run.", [("", entries)])
+            series("blitzclean_reclaimed_bytes", "Bytes reclaimed by the last run.", [("", sum(rules.values()))])
+            series("blitzclean_rule_reclaimed_bytes", "Bytes reclaimed by the last run per rule key.",
+                   sorted(rules.items()), "rule")
+            series("blitzclean_user_reclaimed_bytes", "Bytes reclaimed by the last run per user.",
+                   sorted(users.items()), "user")
+            series("blitzclean_errors", "Errors of the last run by type.", sorted(self.errors.items()), "type")
+            series("blitzclean_phase_duration_seconds", "Wall time of each phase of the last run.",
+                   sorted(self.phases.items()), "phase")
+            series("blitzclean_command_exit_code", "Exit code of the system commands of each task in the last run.",
+                   sorted(self.commands.items()), "task")
+        return "\n".join(out) + "\n"
+
+    # Function 'write'
+    def write(self, success: bool, entries: int, counts: Dict[Tuple[str, str], List[int]]) -> bool:
+        """
+        Atomically replace the metrics file with this run's figures.
+        The temporary name does not end in .prom, so the collector never
+        reads a partial file. Returns False when it cannot be written.
+        """
+        payload = self.render(success, entries, counts).encode("utf-8")
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+            try:
+                os.write(fd, payload)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp, self.path)
+        except OSError:
+            return False
+        return True
+
+
+# Class 'Quarantine'
+class Quarantine:
+    """
+    Holding area where quarantine runs rename targets instead of deleting.
+    Each filesystem has its own area, since rename cannot cross devices;
+    a run stashes into one folder whose manifest allows restoring.
+    """
+
+    # Define 'DIRNAME'
+    DIRNAME = ".blitzclean-quarantine"
+
+    # Define 'MANIFEST'
+    MANIFEST = "manifest.ndjson"
+
+    # Function '__init__'
+    def __init__(self, runid: str = ""):
+        """
+        Prepare a quarantine for one run; areas are created on first use.
+        The run id names the run folder in every area it touches.
+        Thread-safe, as stashes may come from several device workers.
+        """
+        self.runid = runid or f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.urandom(3).hex()}"
+        self.rundirs: Dict[int, Optional[Path]] = {}
+        self.manifests: Dict[Path, io.TextIOBase] = {}
+        self.lock = threading.Lock()
+        self.count = 0
+
+    # Function 'mountof'
+    @staticmethod
+    def mountof(path: str) -> str:
+        """
+        Return the mount point holding 'path' by walking up while the
+        device stays the same. Symlinks are not followed.
+        Falls back to '/' when nothing can be stat'ed.
+        """
+        try:
+            cur = os.path.abspath(path)
+            dev = os.lstat(cur).st_dev
+            while cur != "/":
+                parent = os.path.dirname(cur)
+                if os.lstat(parent).st_dev != dev:
+                    break
+                cur = parent
+            return cur
+        except OSError:
+            return "/"
+
+    # Function 'areas'
+    @staticmethod
+    def areas() -> List[Path]:
+        """
+        List the existing holding areas: one per mount point, plus the
+        per-user fallback for unprivileged runs.
+        Mount points come from /proc/self/mounts.
+        """
+        mounts: List[str] = []
         try:
-            for item in path.iterdir():
-                if item.is_dir():
-                    total += FileOps.removetree(item, dryrun, cb)
-                else:
-                    total += FileOps.removefile(item, dryrun, cb)
-            return total
-        except (OSError, PermissionError, FileNotFoundError):
-            return 0
+            for line in Path("/proc/self/mounts").read_text(encoding="utf-8").splitlines():
+                parts = line.split()
+                if len(parts) > 1:
+                    mounts.append(re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), parts[1]))
+        except OSError:
+            mounts = ["/"]
+        out: List[Path] = []
+        for area in [Path(m) / Quarantine.DIRNAME for m in mounts] + [Quarantine.userarea()]:
+            if area not in out and Quarantine.owned(area):
+                out.append(area)
+        return out
+
+    # Function 'owned'
+    @staticmethod
+    def owned(path: Path) -> bool:
+        """
+        Tell whether 'path' is a real directory (not a symlink) owned by
+        this process's user that nobody else can write to. Areas and run
+        folders failing this were planted by someone else and are ignored.
+        """
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return False
+        return stat.S_ISDIR(st.st_mode) and st.st_uid == os.geteuid() and not st.st_mode & 0o022
 
-    # Function 'globdel'
+    # Function 'openmanifest'
     @staticmethod
-    def globdel(dirpath: Path, pattern: str, dryrun: bool, cb: FileRowCB) -> int:
+    def openmanifest(rundir: Path, flags: int) -> int:
         """
-        Delete files matching a glob-like pattern under a base directory.
-        Emits rows for matched paths and honors dry-run for safety.
-        Returns the total estimated bytes removed or 0 on failure.
+        Open a run folder's manifest without following a symlink there.
+        'flags' add the access mode (and O_CREAT only when stashing).
+        Returns the descriptor; raises OSError.
         """
-        if not dirpath.exists() or not dirpath.is_dir():
-            return 0
-        total = 0
+        return os.open(rundir / Quarantine.MANIFEST, flags | os.O_NOFOLLOW | os.O_CLOEXEC, 0o600)
+
+    # Function 'userarea'
+    @staticmethod
+    def userarea() -> Path:
+        """
+        Return the holding area used when the mount root is not writable.
+        Lives under the user's data directory, outside every rule.
+        Only usable for targets on the same filesystem as the home.
+        """
+        return Path.home() / ".local" / "share" / "blitzclean" / "quarantine"
+
+    # Function 'rundir'
+    def rundir(self, path: str, dev: int) -> Optional[Path]:
+        """
+        Return this run's folder on the device 'dev', creating it once.
+        Tries the mount point area, then the user area; an area on another
+        device, one someone else owns, or one under a world-writable mount
+        root (/tmp, /dev/shm) is never used. None when no area fits.
+        """
+        if dev in self.rundirs:
+            return self.rundirs[dev]
+        found = None
+        mountarea = Path(Quarantine.mountof(path)) / Quarantine.DIRNAME
+        for area in (mountarea, Quarantine.userarea()):
+            try:
+                if area == mountarea and os.lstat(area.parent).st_mode & 0o002:
+                    continue
+                area.mkdir(parents=True, exist_ok=True, mode=0o700)
+                if not Quarantine.owned(area) or os.lstat(area).st_dev != dev:
+                    continue
+                found = area / self.runid
+                self.manifests[found] = self.lockrun(found)
+                break
+            except OSError:
+                found = None
+        self.rundirs[dev] = found
+        return found
+
+    # Function 'lockrun'
+    @staticmethod
+    def lockrun(rundir: Path) -> io.TextIOBase:
+        """
+        Create a run folder and open its manifest under an exclusive flock.
+        A purge may remove a fresh folder before the lock is taken, so the
+        folder is recreated until the locked manifest is still in place.
+        """
+        for _ in range(5):
+            rundir.mkdir(exist_ok=True, mode=0o700)
+            if not Quarantine.owned(rundir):
+                break
+            try:
+                fd = Quarantine.openmanifest(rundir, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            except FileNotFoundError:
+                continue
+            fh = os.fdopen(fd, "a", encoding="utf-8")
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+                if os.stat(rundir / Quarantine.MANIFEST).st_ino == os.fstat(fh.fileno()).st_ino:
+                    return fh
+            except OSError:
+                pass
+            fh.close()
+        raise OSError(f"Cannot lock quarantine run {rundir}")
+
+    # Function 'stash'
+    def stash(self, path: Path) -> bool:
+        """
+        Atomically move one target into the holding area of its filesystem.
+        The manifest record is synced before the rename, so a crash never
+        leaves a moved target without one; restore skips records whose
+        rename did not happen. False leaves the target to regular deletion.
+        """
+        p = os.path.abspath(str(path))
+        if path.name == Quarantine.DIRNAME:
+            return True
         try:
-            for p in dirpath.rglob(pattern):
-                if p.is_file():
-                    total += FileOps.removefile(p, dryrun, cb)
-                elif dryrun and p.is_dir():
-                    FileOps.emitrow(cb, p)
-                elif p.is_dir():
-                    # remove the directory itself
-                    total += FileOps.removefile(p, dryrun, cb)
-            return total
-        except (OSError, PermissionError, FileNotFoundError):
-            return 0
+            st = os.lstat(p)
+        except OSError:
+            return False
+        with self.lock:
+            rundir = self.rundir(p, st.st_dev)
+            if rundir is None:
+                return False
+            if str(rundir).startswith(p.rstrip("/") + "/"):
+                return True
+            self.count += 1
+            fh = self.manifests[rundir]
+            try:
+                fh.write(json.dumps({"n": self.count, "path": p, "ts": round(time.time(), 3)}) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+                os.rename(p, rundir / str(self.count))
+            except OSError:
+                return False
+        return True
+
+    # Function 'close'
+    def close(self):
+        """
+        Close the manifests of every run folder used by this run, which
+        releases their locks so the purger may take the folders.
+        Stashed entries stay in place; safe to call more than once.
+        """
+        with self.lock:
+            for fh in self.manifests.values():
+                try:
+                    fh.close()
+                except OSError:
+                    pass
+            self.manifests.clear()
 
+    # Function 'runs'
+    @staticmethod
+    def runs() -> Iterator[Tuple[Path, List[dict]]]:
+        """
+        Yield (run folder, manifest entries) for every quarantined run.
+        Runs are listed per verified area in run id (time) order; only run
+        folders this user owns count. Unreadable manifests yield no entries.
+        """
+        for area in Quarantine.areas():
+            try:
+                rundirs = sorted(d for d in area.iterdir() if Quarantine.owned(d))
+            except OSError:
+                continue
+            for rundir in rundirs:
+                entries: List[dict] = []
+                try:
+                    with os.fdopen(Quarantine.openmanifest(rundir, os.O_RDONLY), encoding="utf-8") as fh:
+                        for line in fh:
+                            try:
+                                entries.append(json.loads(line))
+                            except ValueError:
+                                continue
+                except OSError:
+                    pass
+                yield rundir, entries
 
-# Class 'DockerCleaner'
-class DockerCleaner:
+    # Function 'restore'
+    @staticmethod
+    def restore(target: str) -> Tuple[int, int]:
+        """
+        Move quarantined entries back to their original location.
+        'target' is a run id, an original path or a folder above it;
+        entries whose original path exists again, or is not a normalized
+        absolute path inside the target, are skipped.
+        """
+        target = target.rstrip("/") or "/"
+        if "/" in target:
+            target = os.path.normpath(target)
+        restored = skipped = 0
+        for rundir, entries in Quarantine.runs():
+            for e in entries:
+                orig = str(e.get("path", ""))
+                if not (rundir.name == target or orig == target or orig.startswith(target.rstrip("/") + "/")):
+                    continue
+                if not os.path.isabs(orig) or os.path.normpath(orig) != orig:
+                    skipped += 1
+                    continue
+                n = e.get("n")
+                if not isinstance(n, int) or isinstance(n, bool):
+                    skipped += 1
+                    continue
+                src = rundir / str(n)
+                if not os.path.lexists(src):
+                    continue
+                if os.path.lexists(orig):
+                    skipped += 1
+                    continue
+                try:
+                    os.makedirs(os.path.dirname(orig), exist_ok=True)
+                    os.rename(src, orig)
+                    restored += 1
+                except OSError:
+                    skipped += 1
+        return restored, skipped
+
+    # Function 'purge'
+    @staticmethod
+    def purge(maxage: float, guard: Optional[GuardCB] = None) -> Tuple[int, int]:
+        """
+        Delete quarantined runs whose folder is older than 'maxage' seconds.
+        A run still stashing holds the lock on its manifest and is skipped;
+        manifests are never created here. Returns (runs, bytes) removed.
+        """
+        runs = nbytes = 0
+        for rundir, _ in list(Quarantine.runs()):
+            try:
+                if time.time() - os.lstat(rundir).st_mtime < maxage:
+                    continue
+                try:
+                    fd = Quarantine.openmanifest(rundir, os.O_RDONLY)
+                except FileNotFoundError:
+                    os.rmdir(rundir)
+                    continue
+                with os.fdopen(fd, "rb") as fh:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    nbytes += FileOps.removetree(rundir, False, lambda *_: None, guard)
+                runs += 1
+            except OSError:
+                continue
+        return runs, nbytes
+
+    # Function 'spawnpurge'
+    @staticmethod
+    def spawnpurge(days: int):
+        """
+        Start a detached '--purge-quarantine' process for runs older than
+        'days'. It outlives the GUI or worker and lowers its own priority.
+        Failure to start is ignored; the next run tries again.
+        """
+        try:
+            subprocess.Popen([sys.executable, os.path.abspath(sys.argv[0]), "--purge-quarantine", str(max(0, days))],
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             start_new_session=True)
+        except (OSError, subprocess.SubprocessError):
+            pass
+
+
+# Class 'PathTable'
+class PathTable:
     """
-    Best-effort Docker cleanup helper (containers/images/volumes/networks).
-    Mirrors the common full-clean sequence while tolerating missing Docker.
-    Honors dry-run mode and avoids errors when resource lists are empty.
+    Interned directory table mapping parent folders to small integer ids.
+    Rows keep (dirid, basename) so a long shared prefix is stored once.
+    Id 0 is the empty folder, used for labels that are not paths.
     """
 
-    # Function 'clean'
-    @staticmethod
-    def clean(opts: "ExecOpts") -> None:
+    # Function '__init__'
+    def __init__(self):
         """
-        Run cleanup steps based on ExecOpts flags for Docker resources.
-        Each step quietly skips when there is nothing to remove or Docker is absent.
-        Designed to be safe with dry-run and partial selections.
+        Create a table holding only the empty folder under id 0.
+        Ids are dense list indexes, so lookups by id are O(1).
+        The reverse dict is only consulted when interning.
         """
-        dryrun = opts.dryrun
-        if opts.dockercontainers:
-            ec, out = ShellExec.capture("docker ps -aq")
-            if ec == 0 and out.strip():
-                ShellExec.cmdrun("docker stop $(docker ps -aq)", dryrun)
-                ShellExec.cmdrun("docker rm $(docker ps -aq)", dryrun)
+        self.dirs: List[str] = [""]
+        self.ids: Dict[str, int] = {"": 0}
 
-        if opts.dockerimages:
-            ec, out = ShellExec.capture("docker images -q")
-            if ec == 0 and out.strip():
-                ShellExec.cmdrun("docker rmi -f $(docker images -q)", dryrun)
+    # Function 'intern'
+    def intern(self, dirpath: str) -> int:
+        """
+        Return the id of a folder path, adding it on first sight.
+        Callers can compare against len(dirs) beforehand to detect new ids.
+        The stored string is shared by every row below that folder.
+        """
+        did = self.ids.get(dirpath)
+        if did is None:
+            did = self.ids[dirpath] = len(self.dirs)
+            self.dirs.append(dirpath)
+        return did
+
+    # Function 'split'
+    def split(self, path: str) -> Tuple[int, str]:
+        """
+        Split a full path into its interned parent id and basename.
+        Uses os.path.split so join() restores the original spelling.
+        Relative labels end up under the empty folder.
+        """
+        head, name = os.path.split(path)
+        return self.intern(head), name
 
-        if opts.dockervolumes:
-            ec, out = ShellExec.capture("docker volume ls -q")
-            if ec == 0 and out.strip():
-                ShellExec.cmdrun("docker volume rm $(docker volume ls -q)", dryrun)
+    # Function 'join'
+    def join(self, did: int, name: str) -> str:
+        """
+        Rebuild a full path from a parent id and basename.
+        Only called when a row is displayed or exported.
+        Names under the empty folder are returned unchanged.
+        """
+        head = self.dirs[did]
+        return os.path.join(head, name) if head else name
 
-        if opts.dockernetworks:
-            ec, out = ShellExec.capture("docker network ls -q")
-            if ec == 0 and out.strip():
-                ShellExec.cmdrun("docker network rm $(docker network ls -q | xargs -n1 docker network inspect -f '{{.Name}} {{.ID}}' | grep -v '^bridge ' | grep -v '^host ' | grep -v '^none ' | awk '{print $2}')", dryrun)
 
-        if any([opts.dockercontainers, opts.dockerimages, opts.dockervolumes, opts.dockernetworks]):
-            ShellExec.cmdrun("docker system prune -a --volumes -f", dryrun)
+# Class 'ResultStore'
+class ResultStore:
+    """
+    Compact column store for result rows of a run.
+    Paths are kept as (parent id, basename) against a PathTable and sizes
+    in a typed array; full paths are only rebuilt on demand.
+    """
+
+    # Function '__init__'
+    def __init__(self):
+        """
+        Create an empty store with its own directory table.
+        Drill targets are sparse, so they live in a dict by row index.
+        Modification times are kept as the formatted strings rows carry.
+        """
+        self.paths = PathTable()
+        self.dirids = array.array("L")
+        self.names: List[str] = []
+        self.sizes = array.array("q")
+        self.mtimes: List[str] = []
+        self.drills: Dict[int, Tuple[str, str]] = {}
+
+    # Function '__len__'
+    def __len__(self) -> int:
+        """
+        Return the number of stored rows.
+        Lets the store stand in wherever a row count is needed.
+        Constant time, backed by the names list.
+        """
+        return len(self.names)
+
+    # Function 'add'
+    def add(self, dirpath: str, name: str, size: int, mtime: str, drill: Optional[Tuple[str, str]] = None) -> int:
+        """
+        Append one row given its parent folder and basename.
+        Interns the folder and returns the new row index.
+        A drill (home, key) pair marks summary rows that can be expanded.
+        """
+        row = len(self.names)
+        self.dirids.append(self.paths.intern(dirpath))
+        self.names.append(name)
+        self.sizes.append(int(size))
+        self.mtimes.append(mtime)
+        if drill is not None:
+            self.drills[row] = drill
+        return row
+
+    # Function 'path'
+    def path(self, row: int) -> str:
+        """
+        Rebuild the full path (or label) of a stored row.
+        Joins the interned parent folder with the row's basename.
+        Raises IndexError for rows outside the store.
+        """
+        return self.paths.join(self.dirids[row], self.names[row])
+
+    # Function 'clear'
+    def clear(self):
+        """
+        Drop every row and start over with a fresh directory table.
+        Releases the interned folder strings of the previous run.
+        Called when a new run starts or the table fades out.
+        """
+        self.paths = PathTable()
+        self.dirids = array.array("L")
+        self.names = []
+        self.sizes = array.array("q")
+        self.mtimes = []
+        self.drills = {}
+
+
+# Class 'TopReport'
+class TopReport:
+    """
+    Streaming report of the largest files and directory totals seen in a run.
+    Keeps one bounded min-heap per (scope, kind) so memory stays constant
+    no matter how many entries are visited; scope is a target key or '*'.
+    """
+
+    # Function '__init__'
+    def __init__(self, limit: int = 200):
+        """
+        Prepare empty heaps that each retain at most 'limit' items.
+        A sequence counter breaks ties so paths never get compared.
+        Heaps are created lazily per target the first time it reports.
+        """
+        self.limit = max(1, int(limit))
+        self.seq = 0
+        self.heaps: Dict[Tuple[str, str], List[Tuple[int, int, str]]] = {}
+
+    # Function 'push'
+    def push(self, scope: str, kind: str, path: str, size: int):
+        """
+        Offer one candidate to the heap for the given scope and kind.
+        Replaces the current smallest item only when the new one is larger.
+        Costs O(log limit) and never grows past the configured bound.
+        """
+        heap = self.heaps.setdefault((scope, kind), [])
+        self.seq += 1
+        if len(heap) < self.limit:
+            heapq.heappush(heap, (size, self.seq, path))
+        elif size > heap[0][0]:
+            heapq.heapreplace(heap, (size, self.seq, path))
+
+    # Function 'addfile'
+    def addfile(self, target: str, path: str, size: int):
+        """
+        Record a file size for its target and for the overall ranking.
+        Zero-byte entries are ignored since they never rank.
+        Called from the row hook for every reported entry.
+        """
+        if size > 0:
+            self.push(target, "files", path, size)
+            self.push("*", "files", path, size)
+
+    # Function 'adddir'
+    def adddir(self, target: str, path: str, size: int):
+        """
+        Record a directory total for its target and for the overall ranking.
+        Called once per removed or trimmed tree, not per child entry.
+        Zero-byte directories are ignored.
+        """
+        if size > 0:
+            self.push(target, "dirs", path, size)
+            self.push("*", "dirs", path, size)
+
+    # Function 'todict'
+    def todict(self) -> dict:
+        """
+        Export the rankings as a JSON-friendly dict sorted largest first.
+        Layout is {'limit', 'overall': {...}, 'targets': {key: {...}}}
+        where each section maps 'files'/'dirs' to [{'path', 'size'}] lists.
+        """
+        out: dict = {"limit": self.limit, "overall": {"files": [], "dirs": []}, "targets": {}}
+        for (scope, kind), heap in sorted(self.heaps.items()):
+            items = [{"path": p, "size": n} for n, _, p in sorted(heap, reverse=True)]
+            if scope == "*":
+                out["overall"][kind] = items
+            else:
+                out["targets"].setdefault(scope, {"files": [], "dirs": []})[kind] = items
+        return out
+
+
+# Class 'PhaseProfiler'
+class PhaseProfiler:
+    """
+    Per-phase profiler enabled by --profile for a cleanup run.
+    Records wall time, thread CPU time, getrusage deltas (self and children)
+    and tracemalloc peaks per named phase, optionally with a cProfile dump.
+    """
+
+    # Define 'RUSAGEFIELDS'
+    RUSAGEFIELDS = [
+        "ru_utime",
+        "ru_stime",
+        "ru_minflt",
+        "ru_majflt",
+        "ru_inblock",
+        "ru_oublock",
+        "ru_nvcsw",
+        "ru_nivcsw"
+    ]
+
+    # Function '__init__'
+    def __init__(self, cprof: bool = False):
+        """
+        Prepare empty phase records and per-thread phase stacks.
+        Nothing is measured until start() is called.
+        cprof additionally runs cProfile for the whole profiled span.
+        """
+        self.cprof = cprof
+        self.profile: Optional[cProfile.Profile] = None
+        self.records: Dict[str, dict] = {}
+        self.order: List[str] = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.started = 0.0
+        self.ownmalloc = False
+
+    # Function 'start'
+    def start(self):
+        """
+        Begin profiling: start tracemalloc and, if requested, cProfile.
+        tracemalloc is left untouched when something else already runs it.
+        Records the wall clock origin used in the final report.
+        """
+        self.started = time.time()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.ownmalloc = True
+        if self.cprof:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    # Function 'stop'
+    def stop(self):
+        """
+        Stop cProfile and tracemalloc if this profiler started them.
+        Safe to call more than once.
+        Phase records stay available for report().
+        """
+        if self.profile is not None:
+            self.profile.disable()
+        if self.ownmalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self.ownmalloc = False
+
+    # Function 'usage'
+    @staticmethod
+    def usage() -> Dict[str, float]:
+        """
+        Snapshot getrusage counters for this process and its children.
+        Children cover the shell commands run through ShellExec.
+        Keys are prefixed with 'self.' and 'children.'.
+        """
+        out: Dict[str, float] = {}
+        for prefix, who in (("self", resource.RUSAGE_SELF), ("children", resource.RUSAGE_CHILDREN)):
+            ru = resource.getrusage(who)
+            for field in PhaseProfiler.RUSAGEFIELDS:
+                out[f"{prefix}.{field[3:]}"] = float(getattr(ru, field))
+        return out
+
+    # Function 'phase'
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Measure the enclosed block as a phase nested under the current one.
+        Repeated phases with the same path are accumulated into one record.
+        The tracemalloc peak of a child is propagated to its parents.
+        """
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        path = f"{stack[-1]['path']}/{name}" if stack else name
+        tracing = tracemalloc.is_tracing()
+        if stack and tracing:
+            stack[-1]["peak"] = max(stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        if tracing:
+            tracemalloc.reset_peak()
+        frame = {"path": path, "peak": 0}
+        stack.append(frame)
+        u0 = self.usage()
+        t0 = time.perf_counter()
+        c0 = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = time.thread_time() - c0
+            u1 = self.usage()
+            stack.pop()
+            peak = frame["peak"]
+            if tracemalloc.is_tracing():
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            with self.lock:
+                rec = self.records.get(path)
+                if rec is None:
+                    rec = {"phase": path, "calls": 0, "wall": 0.0, "cpu": 0.0, "mallocpeak": 0, "rusage": {}}
+                    self.records[path] = rec
+                    self.order.append(path)
+                rec["calls"] += 1
+                rec["wall"] += wall
+                rec["cpu"] += cpu
+                rec["mallocpeak"] = max(rec["mallocpeak"], peak)
+                for k, v in u1.items():
+                    rec["rusage"][k] = rec["rusage"].get(k, 0.0) + (v - u0.get(k, 0.0))
+
+    # Function 'report'
+    def report(self) -> dict:
+        """
+        Build the structured profile report as a JSON-friendly dict.
+        Phases keep first-seen order; times are rounded to microseconds.
+        Includes the cProfile dump path when one was written.
+        """
+        phases = []
+        for path in self.order:
+            rec = dict(self.records[path])
+            rec["wall"] = round(rec["wall"], 6)
+            rec["cpu"] = round(rec["cpu"], 6)
+            rec["rusage"] = {k: round(v, 6) for k, v in rec["rusage"].items()}
+            phases.append(rec)
+        return {
+            "started": datetime.fromtimestamp(self.started).isoformat(timespec="seconds") if self.started else "",
+            "maxrsskb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "phases": phases,
+        }
+
+    # Function 'write'
+    def write(self, path: str, owner: Optional[int] = None) -> str:
+        """
+        Stop profiling and write the JSON report (and cProfile stats).
+        The stats file sits next to the report with a '.pstats' suffix; an
+        owner uid hands both to the user when the privileged worker wrote them.
+        """
+        self.stop()
+        try:
+            target = Path(path)
+            if not target.parent.is_dir():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if owner is not None:
+                    os.chown(target.parent, owner, -1, follow_symlinks=False)
+            data = self.report()
+            if self.profile is not None:
+                statspath = target.with_suffix(".pstats")
+                self.profile.create_stats()
+                PhaseProfiler.writefile(statspath, marshal.dumps(self.profile.stats), owner)
+                data["cprofile"] = str(statspath)
+            PhaseProfiler.writefile(target, (json.dumps(data, indent=2) + "\n").encode("utf-8"), owner)
+            return str(target)
+        except (OSError, ValueError):
+            return ""
+
+    # Function 'writefile'
+    @staticmethod
+    def writefile(path: Path, payload: bytes, owner: Optional[int] = None):
+        """
+        Replace the contents of 'path' without following a symlink there.
+        The descriptor is chowned to 'owner' when given, so a root worker
+        never changes the owner of some other file. Raises OSError.
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW | os.O_CLOEXEC, 0o644)
+        try:
+            if owner is not None:
+                os.fchown(fd, owner, -1)
+            while payload:
+                payload = payload[os.write(fd, payload):]
+        finally:
+            os.close(fd)
+
+    # Function 'defaultpath'
+    @staticmethod
+    def defaultpath() -> str:
+        """
+        Return a timestamped report path under the config directory.
+        Resolved again for every run when --profile has no explicit file,
+        so reports never overwrite each other.
+        """
+        return str(CONFIGPATH / "profiles" / f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.json")
 
 
 # Class 'SysCleaner'
@@ -807,15 +3602,38 @@ class SysCleaner:
     """
 
     # Function '__init__'
-    def __init__(self, opts: ExecOpts, filecb: FileRowCB, pathopts: Dict[str, bool]):
+    def __init__(self, opts: ExecOpts, filecb: FileRowCB, pathopts: Dict[str, bool],
+                 budgets: Optional[Dict[str, int]] = None, sumcb: Optional[SummaryCB] = None):
         """
-        Initialize a SysCleaner with execution options and UI callback.
-        Stores path enable/disable map and prepares byte counters/state.
+        Initialize a SysCleaner with execution options and UI callbacks.
+        Stores path enable/disable map, size budgets and byte counters/state.
         Does not start work until run() is invoked.
         """
         self.opts = opts
         self.filecb = filecb
+        self.sumcb = sumcb
+        self.summaries: Dict[Tuple[str, str], dict] = {}
+        self.profiler: Optional[PhaseProfiler] = PhaseProfiler(opts.cprofile) if opts.profile else None
+        self.profilepath = ""
+        self.sizeindex: Optional[SizeIndex] = None
+        self.targetcounts: Dict[Tuple[str, str], List[int]] = {}
+        self.telemetry = Telemetry()
+        self.exporter: Optional[ExportSink] = ExportSink(opts.exportpath) if opts.exportpath else None
+        self.journal: Optional[AuditJournal] = None
+        if opts.audit and not opts.dryrun:
+            self.journal = AuditJournal(opts.auditdir, opts.auditmaxmb << 20, opts.auditkeep)
+        self.quarantine: Optional[Quarantine] = Quarantine() if opts.quarantine and not opts.dryrun else None
+        self.metrics: Optional[RunMetrics] = RunMetrics(opts.metricsdir) if opts.metrics and not opts.dryrun else None
+        self.exclude: Optional[ExcludeIndex] = None
+        self.throttle: Optional[PressureThrottle] = PressureThrottle(opts.pressurelimit, opts.opsmax) if opts.lowimpact else None
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.device: Optional[int] = None
+        self.home = ""
         self.pathopts = pathopts
+        self.budgets = budgets or {}
+        self.topreport = TopReport(opts.toplimit)
+        self.target = ""
         self.totalbytes = 0
         self.frontroot = 0
         self.fronthome = 0
@@ -827,20 +3645,66 @@ class SysCleaner:
     def loadstop(self):
         """
         Request that the running cleanup operation be cancelled.
-        Sets an internal flag checked periodically during traversal.
-        Long-running operations exit gracefully by raising at checkpoints.
+        Sets the flag checked per entry during traversal and terminates
+        running commands on a helper thread so the caller never blocks.
         """
         self.stopflag = True
+        if self.throttle is not None:
+            self.throttle.cancelled.set()
+        threading.Thread(target=ShellExec.stopall, daemon=True).start()
+
+    # Function 'home'
+    @property
+    def home(self) -> str:
+        """
+        Home directory the calling thread is currently cleaning.
+        Thread-local, because device workers clean several homes at once.
+        Empty for system targets.
+        """
+        return getattr(self.local, "home", "")
+
+    # Function 'home'
+    @home.setter
+    def home(self, value: str):
+        """
+        Set the home directory for rows produced by the calling thread.
+        Other threads keep their own value.
+        Set by runjob before every job.
+        """
+        self.local.home = value
+
+    # Function 'target'
+    @property
+    def target(self) -> str:
+        """
+        Rule key the calling thread's rows are attributed to.
+        Thread-local for the same reason as home.
+        Empty before the first settarget() call.
+        """
+        return getattr(self.local, "target", "")
+
+    # Function 'target'
+    @target.setter
+    def target(self, value: str):
+        """
+        Set the rule key for rows produced by the calling thread.
+        Prefer settarget(), which also updates the telemetry.
+        Other threads keep their own value.
+        """
+        self.local.target = value
 
     # Function 'checkstop'
     def checkstop(self):
         """
         Guard method to abort work when a stop request has been made.
         Raises RuntimeError to unwind current operation safely.
-        Call frequently inside loops to keep UI responsive.
+        Passed as the guard of FileOps walkers, so it runs per entry;
+        in low-impact mode it also paces the run.
         """
         if self.stopflag:
             raise RuntimeError("Operation cancelled by user.")
+        if self.throttle is not None:
+            self.throttle.pace()
 
     # Function 'addbytes'
     def addbytes(self, n: int):
@@ -850,17 +3714,174 @@ class SysCleaner:
         Used by file operations to accumulate reclaimed sizes.
         """
         try:
-            self.totalbytes += int(n)
+            n = int(n)
         except (ValueError, TypeError, OverflowError):
-            pass
+            return
+        with self.lock:
+            self.totalbytes += n
+
+    # Function 'adddir'
+    def adddir(self, key: str, path: str, size: int):
+        """
+        Record a directory total in the largest-items report.
+        Serialized with rows, since device workers report concurrently.
+        Used as the wipedir size callback and after whole-tree removals.
+        """
+        with self.lock:
+            self.topreport.adddir(key, path, size)
+
+    # Function 'onrow'
+    def onrow(self, path: str, size: int, mtime: str):
+        """
+        Row hook handed to every FileOps call made by the cleaner.
+        Feeds the largest-items report and the export sink, then forwards
+        the row to the UI or worker callback unless export replaces it.
+        """
+        home, target = self.home, self.target
+        with self.lock:
+            self.addrow(home, target, path, size, mtime)
+
+    # Function 'addrow'
+    def addrow(self, home: str, target: str, path: str, size: int, mtime: str):
+        """
+        Account one row for a home and target; the caller holds the lock.
+        Updates the report, telemetry and per-target counts, then
+        tallies or forwards the row.
+        """
+        self.topreport.addfile(target, path, size)
+        self.telemetry.entries += 1
+        self.telemetry.bytes += size
+        counts = self.targetcounts.get((home, target))
+        if counts is None:
+            counts = self.targetcounts[(home, target)] = [0, 0]
+        counts[0] += 1
+        counts[1] += size
+        if self.journal is not None:
+            self.journal.record(target, path, size, mtime)
+        if self.exporter is not None:
+            self.exporter.write(path, size, mtime)
+            if not self.opts.exporttable:
+                return
+        if self.opts.summary:
+            self.tally(home, target, size, mtime)
+        else:
+            self.filecb(path, size, mtime)
+
+    # Function 'tally'
+    def tally(self, home: str, target: str, size: int, mtime: str):
+        """
+        Aggregate one row into the summary of the current home and target.
+        Tracks entry count, bytes, and the oldest/newest modification time.
+        Timestamps compare as strings since they are zero-padded ISO-like.
+        """
+        rec = self.summaries.get((home, target))
+        if rec is None:
+            rec = {"count": 0, "bytes": 0, "oldest": "", "newest": ""}
+            self.summaries[(home, target)] = rec
+        rec["count"] += 1
+        rec["bytes"] += max(0, int(size))
+        if mtime and mtime != "-":
+            if not rec["oldest"] or mtime < rec["oldest"]:
+                rec["oldest"] = mtime
+            if mtime > rec["newest"]:
+                rec["newest"] = mtime
+
+    # Function 'flushsummary'
+    def flushsummary(self):
+        """
+        Emit one summary row per target collected so far, then reset.
+        Each home also gets a total row under the key '*'.
+        Rows go to sumcb when set, otherwise to filecb as labelled rows.
+        """
+        hometotals: Dict[str, dict] = {}
+        for (home, key), rec in sorted(self.summaries.items()):
+            self.emitsummary(home, key, rec)
+            tot = hometotals.setdefault(home, {"count": 0, "bytes": 0, "oldest": "", "newest": ""})
+            tot["count"] += rec["count"]
+            tot["bytes"] += rec["bytes"]
+            if rec["oldest"] and (not tot["oldest"] or rec["oldest"] < tot["oldest"]):
+                tot["oldest"] = rec["oldest"]
+            tot["newest"] = max(tot["newest"], rec["newest"])
+        for home, tot in hometotals.items():
+            self.emitsummary(home, "*", tot)
+        self.summaries.clear()
+
+    # Function 'emitsummary'
+    def emitsummary(self, home: str, key: str, rec: dict):
+        """
+        Publish a single aggregated summary row for a home and rule key.
+        The user name is derived from the home, or 'system' when empty.
+        Falls back to a readable FileRowCB row when no sumcb is set.
+        """
+        user = self.homeuser(home)
+        row = dict(rec, user=user, home=home, key=key)
+        if self.sumcb is not None:
+            self.sumcb(row)
+        else:
+            label = "all targets" if key == "*" else key
+            self.filecb(f"{user}: {label} ({rec['count']} entries)", rec["bytes"], rec["newest"] or "-")
+
+    # Function 'homeuser'
+    @staticmethod
+    def homeuser(home: str) -> str:
+        """
+        Return the user name a home directory belongs to.
+        Derived from the folder name, 'root' for /root and 'system'
+        for rows that belong to no home.
+        """
+        return ("root" if home == "/root" else Path(home).name) if home else "system"
+
+    # Function 'settarget'
+    def settarget(self, key: str):
+        """
+        Set the rule key that subsequent rows and totals belong to.
+        Used to attribute the largest-items report per target.
+        Also passed to globwalk so each match selects its own key.
+        """
+        self.target = key
+        self.telemetry.target = key
+
+    # Function 'phase'
+    def phase(self, name: str, label: str = ""):
+        """
+        Return a context manager timing the enclosed work as a named phase.
+        Phases nest, e.g. run/home:/home/alice/rule:.cache/pip; 'label'
+        replaces the name in the metrics, keeping their series bounded.
+        """
+        inner = contextlib.nullcontext() if self.profiler is None else self.profiler.phase(name)
+        if self.metrics is None:
+            return inner
+        return self.metrics.phase(label or name, inner)
+
+    # Function 'command'
+    def command(self, cmd: str, dryrun: Optional[bool] = None, task: str = "other") -> int:
+        """
+        Run a system command through ShellExec inside its own phase.
+        Dry-run follows the options unless explicitly overridden; metrics
+        are kept per 'task' (apt, snap, kernels, ...), not per command line.
+        """
+        self.checkstop()
+        dry = self.opts.dryrun if dryrun is None else dryrun
+        with self.phase(f"cmd:{cmd}", f"cmd:{task}"):
+            rc = ShellExec.cmdrun(cmd, dry)
+        if rc != 0:
+            with self.lock:
+                self.telemetry.errors += 1
+        if self.metrics is not None and not dry:
+            self.metrics.command(task, rc)
+        if self.journal is not None and not dry:
+            self.journal.event("command", cmd=cmd, rc=rc)
+        return rc
 
     # Function 'enabled'
     def enabled(self, key: str) -> bool:
         """
         Check if a given logical path key is enabled for cleaning.
         Reads from the per-path options map provided by preferences.
-        Returns True when enabled or missing (defaults to enabled).
+        A drill-down run enables only its own key; missing keys default on.
         """
+        if self.opts.drillkey:
+            return key == self.opts.drillkey
         return self.pathopts.get(key, True)
 
     # Function 'sumtree'
@@ -884,116 +3905,249 @@ class SysCleaner:
                             pass
         except (OSError, PermissionError, FileNotFoundError):
             pass
-        return 0
+        return total
 
     # Function 'trashlist'
     def trashlist(self, username: str, home: str):
         """
-        List items in user's Trash and then empty it using 'trash-empty'.
-        This emits a row per top-level trash item and adds their sizes
-        to the reclaimed bytes counter before actually emptying.
+        List items in user's Trash and then empty it using 'trash-empty'.
+        Each top-level trash item becomes one row with its size; real runs
+        only report the items that are actually gone afterwards.
+        """
+        trash = Path(home) / ".local/share/Trash"
+        if self.exclude is not None and self.exclude.at(str(trash)) != ():
+            self.trashwalk(trash)
+            return
+        trash_dir = trash / "files"
+        items: List[Tuple[Path, int, str]] = []
+        if trash_dir.is_dir():
+            try:
+                for child in sorted(trash_dir.iterdir()):
+                    self.checkstop()
+                    items.append((child, self.sumtree(child), SysUtils.mtimestring(child)))
+            except (OSError, PermissionError, FileNotFoundError):
+                pass
+
+        ShellExec.userexec(username=username, home=home, cmd="trash-empty", dryrun=self.opts.dryrun,
+                           runner=lambda c: self.command(c, task="trash"))
+        for child, size, mtime in items:
+            if self.opts.dryrun or not os.path.lexists(child):
+                self.onrow(str(child), size, mtime)
+                self.addbytes(size)
+
+    # Function 'trashwalk'
+    def trashwalk(self, trash: Path):
+        """
+        Empty a Trash that holds an exclusion without 'trash-empty', which
+        would delete everything. Items are removed around the exclusions;
+        an item that is gone also loses its .trashinfo record.
+        """
+        try:
+            children = sorted((trash / "files").iterdir())
+        except OSError:
+            return
+        for child in children:
+            self.checkstop()
+            self.addbytes(FileOps.removetree(child, self.opts.dryrun, self.onrow, self.checkstop, self.exclude))
+            if not self.opts.dryrun and not os.path.lexists(child):
+                try:
+                    os.unlink(trash / "info" / f"{child.name}.trashinfo")
+                except OSError:
+                    pass
+
+    # Function 'userentry'
+    def userentry(self, key: str, p: Path, isdir: bool):
+        """
+        Clean one target resolved from the user rule index.
+        Directories with a size budget are trimmed LRU-first, other
+        directories are removed as trees and everything else as a file.
         """
-        trash_dir = Path(home) / ".local/share/Trash/files"
-        if trash_dir.is_dir():
-            try:
-                for child in sorted(trash_dir.iterdir()):
-                    self.checkstop()
-                    size = self.sumtree(child)
-                    mtime = SysUtils.mtimestring(child)
-                    self.filecb(str(child), size, mtime)
-                    self.addbytes(size)
-            except (OSError, PermissionError, FileNotFoundError):
-                pass
-
-        ShellExec.userexec(username=username, home=home, cmd="trash-empty", dryrun=self.opts.dryrun)
+        self.settarget(key)
+        budget = self.budgets.get(key, 0)
+        with self.phase(f"rule:{key}"):
+            if isdir and budget > 0:
+                n = FileOps.trimtree(p, budget, self.opts.dryrun, self.onrow, self.checkstop, self.exclude)
+            elif isdir:
+                if self.stash(p):
+                    return
+                n = FileOps.removetree(p, self.opts.dryrun, self.onrow, self.checkstop, self.exclude)
+            else:
+                if not self.excluded(str(p)):
+                    self.addbytes(FileOps.removefile(p, self.opts.dryrun, self.onrow))
+                return
+        self.adddir(key, str(p), n)
+        self.addbytes(n)
+
+    # Function 'excluded'
+    def excluded(self, path: str) -> bool:
+        """
+        Tell whether a path or one of its parents matches a user exclusion.
+        Used for single targets; walkers step the exclusion state instead.
+        Always false when no exclusions are set.
+        """
+        return self.exclude is not None and self.exclude.at(path) is None
 
-    # Function 'useritem'
-    def useritem(self, uh: Path, rel: str):
+    # Function 'stash'
+    def stash(self, p: Path) -> bool:
+        """
+        Move a target into quarantine instead of deleting it, if enabled.
+        A moved target yields one row (zero bytes: space is only freed by
+        the purge) and counts as pending; False means delete as usual.
+        Targets holding an exclusion are walked instead, never moved whole.
+        """
+        if self.quarantine is None:
+            return False
+        if self.exclude is not None and self.exclude.at(str(p)) != ():
+            return False
+        try:
+            mtime = SysUtils.stampstring(os.lstat(p).st_mtime)
+        except OSError:
+            return False
+        if not self.quarantine.stash(p):
+            return False
+        self.onrow(str(p), 0, mtime)
+        with self.lock:
+            self.telemetry.pending += 1
+        return True
+
+    # Function 'trashentry'
+    def trashentry(self, username: str, home: str):
         """
-        Clean a user-relative path (file or directory) if enabled.
-        Expands and dispatches to wipe or remove operations as needed.
-        Accumulates reclaimed bytes and emits progress rows.
+        Clean one user's Trash as its own target and phase.
+        Lists the items and then runs 'trash-empty' for that user.
+        Scheduled like any other job on the home's device.
         """
-        if not self.enabled(rel):
+        self.settarget("Trash")
+        if self.excluded(os.path.join(home, ".local/share/Trash")):
             return
-        p = (uh / rel).expanduser()
-        if p.is_dir():
-            # Remove the directory itself after cleaning its contents
-            self.addbytes(FileOps.removetree(p, self.opts.dryrun, self.filecb))
-        else:
-            self.addbytes(FileOps.removefile(p, self.opts.dryrun, self.filecb))
+        with self.phase("trash"):
+            self.trashlist(username=username, home=home)
 
-    # Function 'userpattern'
-    def userpattern(self, uh: Path, pat: str):
+    # Function 'onmount'
+    def onmount(self, path: str) -> bool:
         """
-        Resolve and clean pattern-based user paths (including wildcards).
-        Supports '*', '/*/' segments, and '~' home expansion cases.
-        Applies appropriate remove/wipe semantics and sums reclaimed bytes.
+        Tell whether a target lies on the device this run is limited to.
+        Always true unless 'device' is set, as the watermark daemon does
+        to reclaim space on one filesystem only.
         """
-        if not self.enabled(pat):
-            return
-        if pat.startswith("~"):
-            base = Path(os.path.expanduser("~"))
-            pattern = pat.replace("~/", "")
-        else:
-            base = uh
-            pattern = pat
-
-        if "/*/" in pattern:
-            pre, post = pattern.split("/*/", 1)
-            basedir = base / pre
-            if basedir.is_dir():
-                for child in basedir.iterdir():
-                    if child.is_dir():
-                        tpath = child / post
-                        if tpath.exists():
-                            if tpath.is_dir():
-                                self.addbytes(FileOps.removetree(tpath, self.opts.dryrun, self.filecb))
-                            else:
-                                self.addbytes(FileOps.removefile(tpath, self.opts.dryrun, self.filecb))
-        elif "*" in pattern:
-            prefix, suffix = pattern.split("*", 1)
-            dirpart = Path(prefix).parent
-            namepre = Path(prefix).name
-            basedir = base / dirpart
-            if basedir.is_dir():
-                for child in basedir.iterdir():
-                    if child.name.startswith(namepre) and child.name.endswith(suffix):
-                        self.addbytes(FileOps.removefile(child, self.opts.dryrun, self.filecb))
-        else:
-            t = base / pattern
-            if t.exists():
-                if t.is_dir():
-                    self.addbytes(FileOps.removetree(t, self.opts.dryrun, self.filecb))
-                else:
-                    self.addbytes(FileOps.removefile(t, self.opts.dryrun, self.filecb))
+        return self.device is None or DeviceScheduler.devof(path) == self.device
+
+    # Function 'runjob'
+    def runjob(self, home: str, job: Callable[[], None]):
+        """
+        Run one cleanup job for a home ('' for system targets).
+        Checks for a stop request first and sets the calling thread's
+        home, so serial and device-scheduled runs account rows alike; a
+        stopped job still adds the bytes its walkers had already removed.
+        """
+        self.checkstop()
+        self.home = home
+        try:
+            job()
+        except RuntimeError as e:
+            self.addbytes(getattr(e, "partial", 0))
+            e.partial = 0
+            raise
+
+    # Function 'userjobs'
+    def userjobs(self, uh: Path) -> Iterator[Tuple[str, str, Callable[[], None]]]:
+        """
+        Yield (path, home, job) for every user-space target of a home.
+        Trash comes first, then USERPATH, USERHISTORY, USERBROWSERS, USERMISCS
+        and USERAGGRESIVE entries resolved lazily through the RuleIndex.
+        """
+        home = str(uh)
+        username = Path(uh).name if home != "/root" else "root"
+        if self.enabled("Trash"):
+            yield os.path.join(home, ".local/share/Trash"), home, functools.partial(self.trashentry, username, home)
+        for key, path, isdir in RuleIndex.compiled().descend(home, self.enabled):
+            yield path, home, functools.partial(self.userentry, key, Path(path), isdir)
 
     # Function 'cleanupuser'
     def cleanupuser(self, uh: Path):
         """
         Perform all configured user-space cleanup operations for a home path.
-        Iterates USERPATH, USERHISTORY, USERBROWSERS, and USERAGGRESIVE.
-        Periodically checks for cancellation and updates byte totals.
+        Runs the jobs from userjobs() in order on the calling thread.
         Also lists and empties the user's Trash using 'trash-empty'.
         """
-        username = Path(uh).name if str(uh) != "/root" else "root"
-        self.trashlist(username=username, home=str(uh))
+        for path, home, job in self.userjobs(uh):
+            if self.onmount(path):
+                self.runjob(home, job)
+        self.flushsummary()
 
-        for rel in USERPATH:
-            self.checkstop()
-            self.useritem(uh, rel)
-        for rel in USERHISTORY:
-            self.checkstop()
-            self.useritem(uh, rel)
-        for pat in USERBROWSERS:
-            self.checkstop()
-            self.userpattern(uh, pat)
-        for pat in USERMISCS:
-            self.checkstop()
-            self.userpattern(uh, pat)
-        for rel in USERAGGRESIVE:
-            self.checkstop()
-            self.useritem(uh, rel)
+    # Function 'wipetarget'
+    def wipetarget(self, key: str, p: Path):
+        """
+        Empty a system or root directory target under its rule key.
+        Subfolder totals and the target total feed the largest-items report.
+        Adds the reclaimed bytes to the running total.
+        """
+        self.settarget(key)
+        with self.phase(f"rule:{key}"):
+            n = FileOps.wipedir(p, self.opts.dryrun, self.onrow, functools.partial(self.adddir, key), self.checkstop,
+                                self.stash if self.quarantine is not None else None, self.exclude)
+        self.adddir(key, str(p), n)
+        self.addbytes(n)
+
+    # Function 'globentry'
+    def globentry(self, base: str, rules: List[Tuple[str, str]]):
+        """
+        Apply every enabled glob rule of one base directory in one walk.
+        Each match selects its own rule key via settarget.
+        Adds the per-rule totals to the running total.
+        """
+        with self.phase(f"glob:{base}"):
+            totals = FileOps.globwalk(Path(base), rules, self.opts.dryrun, self.onrow, self.settarget, self.checkstop,
+                                      self.exclude)
+        for n in totals.values():
+            self.addbytes(n)
+
+    # Function 'rootentry'
+    def rootentry(self, p: str):
+        """
+        Clean one ROOTITEMS target: folders are emptied, files removed.
+        Runs under the item's own rule key and phase.
+        Missing items simply contribute nothing.
+        """
+        rp = Path(p)
+        if rp.is_dir():
+            self.wipetarget(p, rp)
+            return
+        self.settarget(p)
+        if self.excluded(p):
+            return
+        with self.phase(f"rule:{p}"):
+            self.addbytes(FileOps.removefile(rp, self.opts.dryrun, self.onrow))
+
+    # Function 'systemjobs'
+    def systemjobs(self) -> Iterator[Tuple[str, str, Callable[[], None]]]:
+        """
+        Yield (path, home, job) for enabled SYSDIRS and SYSGLOBS targets.
+        Glob rules are grouped by base so each base is walked once.
+        System jobs have an empty home.
+        """
+        for d in SYSDIRS:
+            if self.enabled(d):
+                yield d, "", functools.partial(self.wipetarget, d, Path(d))
+
+        globrules: Dict[str, List[Tuple[str, str]]] = {}
+        for base, pat in SYSGLOBS:
+            key = f"{base}::{pat}"
+            if self.enabled(key):
+                globrules.setdefault(base, []).append((key, pat))
+        for base, rules in globrules.items():
+            yield base, "", functools.partial(self.globentry, base, rules)
+
+    # Function 'rootjobs'
+    def rootjobs(self) -> Iterator[Tuple[str, str, Callable[[], None]]]:
+        """
+        Yield (path, home, job) for every enabled ROOTITEMS target.
+        Kept apart from systemjobs so serial runs keep the original order,
+        with the system commands between both groups.
+        """
+        for p in ROOTITEMS:
+            if self.enabled(p):
+                yield p, "", functools.partial(self.rootentry, p)
 
     # Function 'cleanupsystem'
     def cleanupsystem(self):
@@ -1005,26 +4159,68 @@ class SysCleaner:
         if not SysUtils.rootcheck():
             return
 
-        for d in SYSDIRS:
-            if not self.enabled(d):
-                continue
-            self.checkstop()
-            self.addbytes(FileOps.wipedir(Path(d), self.opts.dryrun, self.filecb))
+        for path, home, job in self.systemjobs():
+            if self.onmount(path):
+                self.runjob(home, job)
+        self.home = ""
+        self.commandtasks()
+        for path, home, job in self.rootjobs():
+            if self.onmount(path):
+                self.runjob(home, job)
+        self.flushsummary()
+
+    # Function 'commandtasks'
+    def commandtasks(self):
+        """
+        Run the system commands (journal, apt, snap, kernels, docker).
+        Skipped for drill-down runs, which only list files, and for runs
+        limited to a device that does not hold /var.
+        """
+        if not self.opts.drillkey and self.onmount("/var"):
+            with self.phase("tasks"):
+                self.systemtasks()
 
-        for base, pat in SYSGLOBS:
-            key = f"{base}::{pat}"
-            if not self.enabled(key):
-                continue
+    # Function 'cleanupscheduled'
+    def cleanupscheduled(self, homes: List[str]):
+        """
+        Clean all homes and system targets through a DeviceScheduler.
+        Jobs on different devices run in parallel with per-class concurrency;
+        system commands run afterwards on the calling thread.
+        """
+        sched = DeviceScheduler(self.opts.hddworkers, self.opts.ssdworkers)
+        jobs: List[Tuple[str, str, Callable[[], None]]] = []
+        for home in homes:
+            self.checkstop()
+            jobs.extend(self.userjobs(Path(home)))
+        system = SysUtils.rootcheck()
+        if system:
+            jobs.extend(self.systemjobs())
+            jobs.extend(self.rootjobs())
+        for path, home, job in jobs:
+            if self.onmount(path):
+                sched.add(path, functools.partial(self.runjob, home, job))
+        sched.run()
+        if system:
             self.checkstop()
-            self.addbytes(FileOps.globdel(Path(base), pat, self.opts.dryrun, self.filecb))
+            self.home = ""
+            self.commandtasks()
+        self.flushsummary()
 
-        ShellExec.cmdrun(f"journalctl --vacuum-time={self.opts.vacuumdays}d", self.opts.dryrun)
-        ShellExec.cmdrun(f"journalctl --vacuum-size={self.opts.vacuumsize}", self.opts.dryrun)
-        ShellExec.cmdrun(f"snap set system refresh.retain={self.opts.keepsnaps}", self.opts.dryrun)
-        ShellExec.cmdrun("apt-get -y autoremove --purge", self.opts.dryrun)
-        ShellExec.cmdrun("apt-get -y autoclean", self.opts.dryrun)
-        ShellExec.cmdrun("apt-get -y clean", self.opts.dryrun)
-        ShellExec.cmdrun("flatpak uninstall --unused -y", self.opts.dryrun)
+    # Function 'systemtasks'
+    def systemtasks(self):
+        """
+        Run the package manager, journal, snap, kernel and Docker commands.
+        These reclaim space outside the file rules and emit no rows.
+        Skipped for drill-down runs, which only rescan a single target.
+        """
+        self.command(f"journalctl --vacuum-time={self.opts.vacuumdays}d", task="journal")
+        vacuumsize = self.opts.vacuumsize if re.fullmatch(r"\d+[KMGT]?", self.opts.vacuumsize) else "100M"
+        self.command(f"journalctl --vacuum-size={vacuumsize}", task="journal")
+        self.command(f"snap set system refresh.retain={self.opts.keepsnaps}", task="snap")
+        self.command("apt-get -y autoremove --purge", task="apt")
+        self.command("apt-get -y autoclean", task="apt")
+        self.command("apt-get -y clean", task="apt")
+        self.command("flatpak uninstall --unused -y", task="flatpak")
 
         if not self.opts.dryrun:
             cmd = r"snap list --all 2>/dev/null | awk '/disabled/ {print $1, $3}'"
@@ -1034,31 +4230,22 @@ class SysCleaner:
                     parts = line.split()
                     if len(parts) == 2:
                         name, rev = parts
-                        ShellExec.cmdrun(f"snap remove --revision={shlex.quote(rev)} {shlex.quote(name)} --purge", False)
+                        self.command(f"snap remove --revision={shlex.quote(rev)} {shlex.quote(name)} --purge", False, "snap")
 
         if self.opts.clearkernels:
             currentkernel = self.kernelused()
             pkgs = self.kernelold(currentkernel)
             for pkg in pkgs:
-                ShellExec.cmdrun(f"apt-get remove --purge -y {shlex.quote(pkg)}", self.opts.dryrun)
-            ShellExec.cmdrun("update-grub", self.opts.dryrun)
+                self.command(f"apt-get remove --purge -y {shlex.quote(pkg)}", task="kernels")
+            self.command("update-grub", task="kernels")
 
         if any([self.opts.dockercontainers, self.opts.dockerimages, self.opts.dockervolumes, self.opts.dockernetworks]):
             try:
-                DockerCleaner.clean(self.opts)
+                with self.phase("docker"):
+                    DockerCleaner.clean(self.opts, lambda c: self.command(c, task="docker"))
             except (OSError, subprocess.SubprocessError, PermissionError):
                 pass
 
-        for p in ROOTITEMS:
-            if not self.enabled(p):
-                continue
-            self.checkstop()
-            rp = Path(p)
-            if rp.is_dir():
-                self.addbytes(FileOps.wipedir(rp, self.opts.dryrun, self.filecb))
-            else:
-                self.addbytes(FileOps.removefile(rp, self.opts.dryrun, self.filecb))
-
     # Function 'kernelused'
     @staticmethod
     def kernelused() -> str:
@@ -1087,39 +4274,841 @@ class SysCleaner:
                 pkgs.append(line.strip())
         return pkgs
 
+    # Function 'homes'
+    def homes(self) -> List[str]:
+        """
+        List the home directories this run will clean, in order.
+        Root cleans /root and every discovered home; others only their own.
+        Drill-down runs are narrowed to the selected home.
+        """
+        if not SysUtils.rootcheck():
+            return [self.opts.userhome]
+        out: List[str] = []
+        for _, home in [("root", "/root")] + UserDiscovery.listusers():
+            if home in out:
+                continue
+            if self.opts.drillkey and self.opts.userhome and home != self.opts.userhome:
+                continue
+            out.append(home)
+        return out
+
+    # Function 'precount'
+    def precount(self) -> Tuple[int, int]:
+        """
+        Estimate total entries and bytes this run will process.
+        Uses the size index where fresh and a cheap row-less walk otherwise,
+        storing new counts back so the next estimate is nearly free.
+        """
+        index = self.sizeindex or SizeIndex()
+        self.sizeindex = index
+        entries = nbytes = 0
+
+        # Function 'account'
+        def account(home: str, key: str, walk: Callable[[], Tuple[int, int]]):
+            """
+            Add one target's counts, from the index or by walking it.
+            Freshly walked counts are stored in the index.
+            Honors stop requests between targets.
+            """
+            nonlocal entries, nbytes
+            self.checkstop()
+            variant = SizeIndex.variant(self.budgets.get(key, 0), self.opts.excludes)
+            cached = index.get(home, key, variant=variant)
+            if cached is None:
+                cached = walk()
+                index.put(home, key, *cached, variant)
+            entries += cached[0]
+            nbytes += cached[1]
+
+        for home, key, walk in self.sizetargets(self.homes(), self.enabled, SysUtils.rootcheck(), self.checkstop,
+                                                self.exclude, self.budgets):
+            account(home, key, walk)
+        index.save()
+        return entries, nbytes
+
+    # Function 'sizetargets'
+    @staticmethod
+    def sizetargets(homes: List[str], enabled: Callable[[str], bool], system: bool, guard: Optional[GuardCB] = None,
+                    exclude: Optional[ExcludeIndex] = None, budgets: Optional[Dict[str, int]] = None
+                    ) -> Iterator[Tuple[str, str, Callable[[], Tuple[int, int]]]]:
+        """
+        Yield (home, key, walk) for every enabled target that can be sized.
+        'walk' counts (entries, bytes) without rows or excluded entries, and only
+        the evicted part of budgeted caches; system targets need 'system' (root).
+        """
+        budgets = budgets or {}
+        for home in homes:
+            if enabled("Trash"):
+                trash = Path(home) / ".local/share/Trash/files"
+                yield home, "Trash", lambda t=trash: FileOps.counttree(t, guard, exclude)
+            found: Dict[str, List[str]] = {}
+            for key, path, _ in RuleIndex.compiled().descend(home, enabled):
+                found.setdefault(key, []).append(path)
+            for key, paths in found.items():
+                yield home, key, lambda ps=paths, b=budgets.get(key, 0): SysCleaner.countpaths(ps, guard, exclude, b)
+
+        if system:
+            for d in SYSDIRS + ROOTITEMS:
+                if enabled(d):
+                    yield "", d, lambda t=d: FileOps.counttree(Path(t), guard, exclude)
+            for base, pat in SYSGLOBS:
+                key = f"{base}::{pat}"
+                if enabled(key):
+                    yield "", key, lambda b=base, k=key, pt=pat: SysCleaner.countglob(Path(b), k, pt, guard, exclude)
+
+    # Function 'countpaths'
+    @staticmethod
+    def countpaths(paths: List[str], guard: Optional[GuardCB] = None,
+                   exclude: Optional[ExcludeIndex] = None, budget: int = 0) -> Tuple[int, int]:
+        """
+        Sum FileOps.counttree over every path matched by one rule key.
+        With a budget, folders count only what a dry trimtree would evict.
+        Returns (entries, bytes).
+        """
+        entries = nbytes = 0
+        for x in paths:
+            if budget > 0 and os.path.isdir(x):
+                counts = [0]
+                b = FileOps.trimtree(Path(x), budget, True, lambda *_: counts.__setitem__(0, counts[0] + 1), guard,
+                                     exclude)
+                n = counts[0]
+            else:
+                n, b = FileOps.counttree(Path(x), guard, exclude)
+            entries += n
+            nbytes += b
+        return entries, nbytes
+
+    # Function 'countglob'
+    @staticmethod
+    def countglob(base: Path, key: str, pat: str, guard: Optional[GuardCB] = None,
+                  exclude: Optional[ExcludeIndex] = None) -> Tuple[int, int]:
+        """
+        Count the entries and bytes a single SYSGLOBS rule would remove.
+        Runs globwalk in dry-run mode with a counting row callback.
+        Only used on a size index miss.
+        """
+        counts = [0]
+        nbytes = sum(FileOps.globwalk(base, [(key, pat)], True, lambda *_: counts.__setitem__(0, counts[0] + 1), None, guard,
+                                      exclude).values())
+        return counts[0], nbytes
+
+    # Function 'recordcounts'
+    def recordcounts(self, complete: bool):
+        """
+        Update the size index with what this run actually processed.
+        A complete dry run stores its per-target counts; a real run drops
+        the targets it cleaned since their old counts are now stale.
+        """
+        if self.opts.drillkey or not self.targetcounts:
+            return
+        index = self.sizeindex or SizeIndex()
+        for (home, key), (n, b) in self.targetcounts.items():
+            if self.opts.dryrun and complete:
+                index.put(home, key, n, b, SizeIndex.variant(self.budgets.get(key, 0), self.opts.excludes))
+            elif not self.opts.dryrun:
+                index.drop(home, key)
+        index.save()
+
     # Function 'run'
     def run(self):
         """
         Execute the full cleanup routine according to options and privileges.
-        Cleans each user's home (or selected home) and then system locations.
+        Cleans each user's home (or selected home) and then system locations,
+        per device in parallel unless disabled or profiling (kept serial).
         Honors cancellation and shutdown request; swallows non-fatal errors.
+        Writes the phase profile report at the end when profiling is enabled.
+        Streams every row to the export file, if one was requested.
+        Low-impact mode lowers priorities first and paces every entry.
+        Real runs append every deletion to the audit journal when enabled.
+        Quarantine runs start a detached purger for expired runs at the end.
+        Real runs write Prometheus textfile metrics at the end when enabled.
+        User exclusions are compiled once against this run's homes.
         """
+        complete = False
+        uid = os.environ.get("PKEXEC_UID", "")
+        owner = int(uid) if uid.isdigit() else None
         try:
-            if SysUtils.rootcheck():
-                homes = [("root", "/root")]
-                homes.extend(UserDiscovery.listusers())
-                seen = set()
-                for _, home in homes:
-                    if home in seen:
-                        continue
-                    seen.add(home)
-                    self.checkstop()
-                    self.cleanupuser(Path(home))
-                self.checkstop()
-                self.cleanupsystem()
-            else:
-                self.cleanupuser(Path(self.opts.userhome))
-                self.checkstop()
-                self.cleanupsystem()
-        except RuntimeError:
-            pass
-        except (OSError, PermissionError, subprocess.SubprocessError, ValueError):
-            pass
+            try:
+                if self.exporter is not None:
+                    self.exporter.open()
+                if self.journal is not None:
+                    self.journal.open(user=self.opts.username, uid=os.getuid(), pid=os.getpid())
+            except OSError as e:
+                if self.metrics is not None:
+                    self.metrics.error(type(e).__name__)
+                raise
+            if self.throttle is not None:
+                self.throttle.apply()
+            if self.profiler is not None:
+                self.profiler.start()
+            try:
+                with self.phase("run"):
+                    if self.opts.excludes:
+                        self.exclude = ExcludeIndex.compile(self.opts.excludes, self.homes())
+                    if self.opts.estimate:
+                        with self.phase("precount"):
+                            self.telemetry.planentries, self.telemetry.planbytes = self.precount()
+                    if self.opts.parallel and self.profiler is None:
+                        self.cleanupscheduled(self.homes())
+                    else:
+                        for home in self.homes():
+                            self.checkstop()
+                            with self.phase(f"home:{home}"):
+                                self.cleanupuser(Path(home))
+                        self.checkstop()
+                        with self.phase("system"):
+                            self.cleanupsystem()
+                complete = True
+            except RuntimeError:
+                pass
+            except (OSError, PermissionError, subprocess.SubprocessError, ValueError) as e:
+                if self.metrics is not None:
+                    self.metrics.error(type(e).__name__)
+            self.flushsummary()
+            self.recordcounts(complete)
+            if self.journal is not None:
+                self.journal.close(complete=complete, entries=self.telemetry.entries, bytes=self.telemetry.bytes,
+                                   errors=self.telemetry.errors)
+                if self.metrics is not None and self.journal.errors:
+                    self.metrics.error("audit", self.journal.errors)
+            if self.quarantine is not None:
+                self.quarantine.close()
+                if self.quarantine.count:
+                    Quarantine.spawnpurge(self.opts.quarantinedays)
+            if self.profiler is not None:
+                self.profilepath = self.profiler.write(self.opts.profile, owner)
+        finally:
+            if self.exporter is not None:
+                self.exporter.close(owner)
+            if self.metrics is not None:
+                self.metrics.write(complete and not self.stopflag, self.telemetry.entries, self.targetcounts)
 
         if self.opts.shutafter and not self.opts.dryrun:
             ShellExec.cmdrun("shutdown now", False)
 
 
+# Class 'WatermarkDaemon'
+class WatermarkDaemon:
+    """
+    Long-running free-space watcher for the configured mounts.
+    Below the low watermark it runs only the rules whose targets live on
+    that mount, and stops the run as soon as the high watermark is reached.
+    """
+
+    # Function '__init__'
+    def __init__(self, opts: ExecOpts, pathopts: Dict[str, bool], budgets: Dict[str, int],
+                 out: Callable[[dict], None]):
+        """
+        Create a daemon reusing the saved options, rule selection and budgets.
+        Mounts come from opts.watchmounts (comma separated); 'out' receives
+        one structured event dict per trigger and outcome.
+        """
+        self.opts = opts
+        self.pathopts = pathopts
+        self.budgets = budgets
+        self.out = out
+        self.mounts = [m.strip() for m in opts.watchmounts.split(",") if m.strip()]
+        self.low = opts.watchlow
+        self.high = max(opts.watchhigh, opts.watchlow + 1)
+        self.stopevent = threading.Event()
+        self.cooldown: Dict[str, Tuple[float, float, tuple]] = {}
+
+    # Function 'freepct'
+    @staticmethod
+    def freepct(mount: str) -> Optional[float]:
+        """
+        Return the percentage of blocks available to unprivileged users.
+        One statvfs call, cheap enough to poll every few seconds.
+        Returns None when the mount cannot be queried.
+        """
+        try:
+            st = os.statvfs(mount)
+        except OSError:
+            return None
+        if st.f_blocks <= 0:
+            return None
+        return 100.0 * st.f_bavail / st.f_blocks
+
+    # Function 'mountstate'
+    @staticmethod
+    def mountstate(mount: str, pct: float) -> tuple:
+        """
+        Return the device and whole free percentage of a mount.
+        A different tuple means the mount was swapped or its free space
+        moved by at least a point since a run last fell short.
+        """
+        try:
+            dev = os.stat(mount).st_dev
+        except OSError:
+            dev = None
+        return dev, int(pct)
+
+    # Function 'cooling'
+    def cooling(self, mount: str, pct: float) -> bool:
+        """
+        Tell whether a mount is still backing off after a short run.
+        Reruns wait for the cooldown to expire unless the mount state
+        changed in the meantime.
+        """
+        entry = self.cooldown.get(mount)
+        if entry is None:
+            return False
+        until, _, state = entry
+        return time.monotonic() < until and self.mountstate(mount, pct) == state
+
+    # Function 'serve'
+    def serve(self):
+        """
+        Poll every mount each watchinterval seconds until stop() is called.
+        Mounts under the low watermark are cleaned one at a time; a run
+        that cannot reach the high watermark doubles the mount's cooldown.
+        """
+        self.out({"event": "start", "mounts": self.mounts, "low": self.low, "high": self.high})
+        while not self.stopevent.is_set():
+            for mount in self.mounts:
+                pct = self.freepct(mount)
+                if pct is None or pct >= self.low or self.stopevent.is_set():
+                    if pct is not None and pct >= self.high:
+                        self.cooldown.pop(mount, None)
+                    continue
+                if self.cooling(mount, pct):
+                    continue
+                reason = self.trigger(mount, pct)
+                if reason in ("high-watermark", "stopped", "locked"):
+                    self.cooldown.pop(mount, None)
+                    continue
+                after = self.freepct(mount)
+                _, delay, _ = self.cooldown.get(mount, (0.0, self.opts.watchinterval / 2, ()))
+                delay = min(max(delay * 2, 1.0), WATCHCOOLDOWN)
+                self.cooldown[mount] = (time.monotonic() + delay, delay,
+                                        self.mountstate(mount, after if after is not None else pct))
+                self.out({"event": "cooldown", "mount": mount, "seconds": round(delay, 1)})
+            self.stopevent.wait(self.opts.watchinterval)
+
+    # Function 'trigger'
+    def trigger(self, mount: str, pct: float) -> str:
+        """
+        Run a device-limited cleanup for one mount and report its outcome.
+        A helper thread stops the run once free space reaches the high
+        watermark; returns the outcome reason for the cooldown logic,
+        'error' when the run could not start (e.g. unwritable audit dir).
+        """
+        event = {"event": "trigger", "mount": mount, "free": round(pct, 2), "low": self.low, "high": self.high,
+                 "time": SysUtils.stampstring(time.time())}
+        self.out(event)
+        lock = RunLock()
+        if not lock.acquire():
+            self.out(dict(event, event="skipped", reason="locked"))
+            return "locked"
+        try:
+            device = os.stat(mount).st_dev
+        except OSError:
+            lock.release()
+            self.out(dict(event, event="skipped", reason="unavailable"))
+            return "unavailable"
+        opts = ExecOpts.fromdict(self.opts.todict())
+        opts.dryrun = False
+        opts.shutafter = False
+        opts.summary = True
+        opts.estimate = False
+        cleaner = SysCleaner(opts, lambda *_: None, self.pathopts, self.budgets, lambda _row: None)
+        cleaner.device = device
+        reached = threading.Event()
+        done = threading.Event()
+
+        # Function 'watcher'
+        def watcher():
+            """
+            Check free space once a second while the run is active.
+            Requests a stop when the high watermark is reached.
+            Ends when the run finishes or the daemon stops.
+            """
+            while not done.wait(1.0):
+                if self.stopevent.is_set():
+                    cleaner.loadstop()
+                    return
+                now = self.freepct(mount)
+                if now is not None and now >= self.high:
+                    reached.set()
+                    cleaner.loadstop()
+                    return
+
+        threading.Thread(target=watcher, daemon=True).start()
+        started = time.monotonic()
+        try:
+            cleaner.run()
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            self.out(dict(event, event="error", reason=f"{e}", seconds=round(time.monotonic() - started, 1)))
+            return "error"
+        finally:
+            done.set()
+            lock.release()
+        after = self.freepct(mount)
+        reason = "high-watermark" if reached.is_set() else "stopped" if cleaner.stopflag else "exhausted"
+        self.out(dict(event, event="done", reason=reason,
+                      reclaimed=int(cleaner.totalbytes), entries=cleaner.telemetry.entries,
+                      free=round(after, 2) if after is not None else None,
+                      seconds=round(time.monotonic() - started, 1)))
+        return reason
+
+    # Function 'stop'
+    def stop(self):
+        """
+        Ask serve() to return; a running cleanup is stopped too.
+        Safe to call from signal handlers and other threads.
+        The current poll wait ends immediately.
+        """
+        self.stopevent.set()
+
+
+# Class 'WorkerSession'
+class WorkerSession:
+    """
+    One cleanup run speaking the worker line protocol to a writer.
+    Shared by the pkexec worker (stdout) and the socket server, so the GUI
+    and the fleet coordinator parse exactly the same DIR/ROW/PROG/TOTAL lines.
+    """
+
+    # Function '__init__'
+    def __init__(self, opts: ExecOpts, pathopts: Dict[str, bool], budgets: Dict[str, int],
+                 write: Callable[[str], None], rows: bool = True, lockpath: Path = LOCKFILE):
+        """
+        Build the cleaner for one run; nothing runs until run() is called.
+        'write' receives complete protocol lines; 'rows' False drops ROW/DIR
+        lines for consumers that only want totals.
+        """
+        self.write = write
+        self.outlock = threading.Lock()
+        self.dirtable = PathTable()
+        self.lockpath = lockpath
+        self.finished = threading.Event()
+        self.cleaner = SysCleaner(opts, self.rowprint if rows else (lambda *_: None), pathopts, budgets, self.sumprint)
+
+    # Function 'emitline'
+    def emitline(self, line: str):
+        """
+        Write one protocol line through the writer.
+        Serialized with a lock because progress lines come from a helper
+        thread; a failing writer (peer gone) stops the run.
+        """
+        with self.outlock:
+            try:
+                self.write(line + "\n")
+            except (OSError, ValueError):
+                self.cleaner.loadstop()
+
+    # Function 'rowprint'
+    def rowprint(self, path: str, size_b: int, mtime: str):
+        """
+        Row emitter announcing each folder once as DIR id/path;
+        ROW lines then carry only the folder id and basename.
+        Used as the cleaner's file row callback.
+        """
+        dirpath, name = os.path.split(path)
+        known = len(self.dirtable.dirs)
+        did = self.dirtable.intern(dirpath)
+        if did == known:
+            self.emitline(f"DIR\t{did}\t{dirpath}")
+        self.emitline(f"ROW\t{did}\t{name}\t{size_b}\t{mtime}")
+
+    # Function 'sumprint'
+    def sumprint(self, row: dict):
+        """
+        Summary emitter printing one JSON object per line.
+        Used in summary mode instead of per-file ROW lines.
+        The GUI turns each line into a drill-down capable row.
+        """
+        self.emitline(f"SUM\t{json.dumps(row)}")
+
+    # Function 'progressprint'
+    def progressprint(self):
+        """
+        Telemetry emitter running on a helper thread.
+        Prints PLAN once the pre-count is known and a PROG snapshot
+        (entries, bytes, errors, pending, target) ten times per second.
+        """
+        planned = False
+        last = None
+        while not self.finished.wait(0.1):
+            snap = self.cleaner.telemetry.snapshot()
+            if not planned and snap["planentries"]:
+                self.emitline(f"PLAN\t{snap['planentries']}\t{snap['planbytes']}")
+                planned = True
+            last = self.progline(last)
+
+    # Function 'progline'
+    def progline(self, last: Optional[tuple] = None) -> tuple:
+        """
+        Emit a PROG line unless the counters equal 'last'.
+        Returns the counters so the caller can skip unchanged snapshots;
+        also used once after the run so the final counts always reach the peer.
+        """
+        snap = self.cleaner.telemetry.snapshot()
+        prog = (snap["entries"], snap["bytes"], snap["errors"], snap["pending"], snap["target"])
+        if prog != last:
+            self.emitline("PROG\t" + "\t".join(str(v) for v in prog))
+        return prog
+
+    # Function 'stop'
+    def stop(self):
+        """
+        Cancel the run, e.g. on a STOP command from the peer.
+        The cleaner unwinds at its next entry or command.
+        Safe to call at any time.
+        """
+        self.cleaner.loadstop()
+
+    # Function 'run'
+    def run(self) -> int:
+        """
+        Run the cleanup under the run lock and print its final lines.
+        Ends with TOP, PROFILE and TOTAL, or ERROR then TOTAL on failure;
+        returns the process-style exit code.
+        """
+        runlock = RunLock(self.lockpath)
+        if not runlock.acquire():
+            self.emitline("ERROR\tAnother cleanup run is in progress.")
+            self.emitline("TOTAL\t0")
+            return 1
+        threading.Thread(target=self.progressprint, daemon=True).start()
+        cleaner = self.cleaner
+        try:
+            cleaner.run()
+            self.finished.set()
+            self.progline()
+            self.emitline(f"TOP\t{json.dumps(cleaner.topreport.todict())}")
+            if cleaner.profilepath:
+                self.emitline(f"PROFILE\t{cleaner.profilepath}")
+            try:
+                self.emitline(f"TOTAL\t{int(cleaner.totalbytes)}")
+            except (ValueError, TypeError, OverflowError):
+                self.emitline("TOTAL\t0")
+            return 0
+        except (OSError, PermissionError, subprocess.SubprocessError, ValueError, RuntimeError) as e:
+            self.finished.set()
+            self.emitline(f"ERROR\t{e}")
+            try:
+                self.emitline(f"TOTAL\t{int(getattr(cleaner, 'totalbytes', 0))}")
+            except (ValueError, TypeError, OverflowError):
+                self.emitline("TOTAL\t0")
+            return 1
+        finally:
+            self.finished.set()
+            runlock.release()
+
+
+# Class 'WorkerServer'
+class WorkerServer:
+    """
+    Serves the worker line protocol on a TCP or Unix socket.
+    A client authenticates with HELLO, sends RUN with its run toggles and
+    reads the run's lines; a STOP line cancels it. One run at a time per lock.
+    """
+
+    # Define 'CLIENTFIELDS'
+    CLIENTFIELDS = ("dryrun", "summary", "estimate", "clearbrowsers", "clearkernels", "dockercontainers",
+                    "dockerimages", "dockervolumes", "dockernetworks")
+
+    # Function '__init__'
+    def __init__(self, address: str, token: str = "", config: Path = CONFIGFILE, lockpath: Path = LOCKFILE):
+        """
+        Prepare a server for 'address' ('host:port', 'unix:/path' or '/path').
+        TCP servers require a token; Unix sockets are created mode 0600.
+        Rule toggles and budgets come from this host's 'config'.
+        """
+        self.address = address
+        self.token = token
+        self.config = config
+        self.lockpath = lockpath
+        self.sock: Optional[socket.socket] = None
+        self.stopped = threading.Event()
+
+    # Function 'parseaddress'
+    @staticmethod
+    def parseaddress(address: str) -> Tuple[int, object]:
+        """
+        Split an address into (family, sockaddr) for socket().
+        'unix:/path' and absolute paths are Unix sockets; 'host:port' is TCP,
+        with a bare port meaning the loopback interface.
+        """
+        if address.startswith("unix:"):
+            return socket.AF_UNIX, address[5:]
+        if address.startswith("/"):
+            return socket.AF_UNIX, address
+        host, _, port = address.rpartition(":")
+        host = host.strip("[]") or "127.0.0.1"
+        info = socket.getaddrinfo(host, int(port), type=socket.SOCK_STREAM)
+        return info[0][0], info[0][4]
+
+    # Function 'connect'
+    @staticmethod
+    def connect(address: str, timeout: float = 10.0) -> socket.socket:
+        """
+        Open a client connection to a worker server address.
+        The timeout only applies to connecting; reads then block, since
+        a quiet run can go a long time without progress lines.
+        """
+        family, addr = WorkerServer.parseaddress(address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(addr)
+        except OSError:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return sock
+
+    # Function 'serve'
+    def serve(self):
+        """
+        Listen and handle each client on its own thread until stop().
+        Refuses to listen on TCP without a token, since a client can
+        run cleanups with this host's privileges.
+        """
+        family, addr = self.parseaddress(self.address)
+        if family != socket.AF_UNIX and not self.token:
+            raise ValueError("TCP worker servers require a token.")
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_UNIX:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(addr)
+            old = os.umask(0o177)
+            try:
+                sock.bind(addr)
+            finally:
+                os.umask(old)
+        else:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(addr)
+        sock.listen(16)
+        self.sock = sock
+        while not self.stopped.is_set():
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                break
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    # Function 'stop'
+    def stop(self):
+        """
+        Stop accepting clients; runs in progress continue to completion.
+        Closing the listening socket wakes up accept().
+        Safe to call from a signal handler.
+        """
+        self.stopped.set()
+        if self.sock is not None:
+            with contextlib.suppress(OSError):
+                self.sock.shutdown(socket.SHUT_RDWR)
+            with contextlib.suppress(OSError):
+                self.sock.close()
+
+    # Function 'handle'
+    def handle(self, conn: socket.socket):
+        """
+        Serve one client: check HELLO, read RUN, stream the session and
+        watch for STOP. The client may only set the CLIENTFIELDS toggles (as
+        booleans); every other option comes from this host's configuration.
+        """
+        with conn:
+            rfile = conn.makefile("r", encoding="utf-8", newline="\n")
+            try:
+                hello = rfile.readline().rstrip("\n").split("\t", 1)
+                if self.token and (hello[0] != "HELLO" or len(hello) < 2
+                                   or not hmac.compare_digest(hello[1].encode(), self.token.encode())):
+                    conn.sendall(b"ERROR\tAuthentication failed.\nTOTAL\t0\n")
+                    return
+                req = rfile.readline().rstrip("\n").split("\t", 1)
+                if req[0] != "RUN" or len(req) < 2:
+                    conn.sendall(b"ERROR\tExpected RUN.\nTOTAL\t0\n")
+                    return
+                data = json.loads(req[1])
+            except OSError:
+                return
+            except ValueError:
+                data = None
+            asked = data.get("opts", {}) if isinstance(data, dict) else None
+            if not isinstance(asked, dict) or any(not isinstance(asked[k], bool) for k in self.CLIENTFIELDS if k in asked):
+                with contextlib.suppress(OSError):
+                    conn.sendall(b"ERROR\tInvalid run options.\nTOTAL\t0\n")
+                return
+            cfg = ConfigManager.load(self.config)
+            opts = ConfigManager.loadopts(cfg)
+            for k in self.CLIENTFIELDS:
+                if k in asked:
+                    setattr(opts, k, asked[k])
+            opts.shutafter = False
+            session = WorkerSession(opts, ConfigManager.loadpathopts(cfg), ConfigManager.loadbudgets(cfg),
+                                    lambda line: conn.sendall(line.encode("utf-8")), bool(data.get("rows", True)),
+                                    self.lockpath)
+
+            # Function 'stopread'
+            def stopread():
+                """
+                Read commands from the client while the session runs.
+                STOP cancels the run; EOF (client gone) cancels it too.
+                Returns once either happened.
+                """
+                try:
+                    for line in rfile:
+                        if line.strip() == "STOP":
+                            break
+                except (OSError, ValueError):
+                    pass
+                session.stop()
+
+            threading.Thread(target=stopread, daemon=True).start()
+            session.run()
+            with contextlib.suppress(OSError):
+                conn.shutdown(socket.SHUT_RDWR)
+
+
+# Class 'FleetCoordinator'
+class FleetCoordinator:
+    """
+    Dispatches one ExecOpts to many worker servers at a bounded concurrency
+    and merges their PROG/TOTAL/ERROR streams into per-host and fleet totals.
+    Progress and results are reported as JSON events through 'out'.
+    """
+
+    # Function '__init__'
+    def __init__(self, addresses: List[str], opts: ExecOpts, limit: int = 4, token: str = "",
+                 out: Callable[[dict], None] = lambda ev: None, interval: float = 1.0):
+        """
+        Prepare one Telemetry per host; nothing connects until run().
+        At most 'limit' hosts run at once; a fleet 'progress' event is
+        emitted every 'interval' seconds while runs are active.
+        """
+        self.addresses = list(dict.fromkeys(addresses))
+        self.opts = opts
+        self.limit = max(1, int(limit))
+        self.token = token
+        self.out = out
+        self.interval = interval
+        self.hosts: Dict[str, Telemetry] = {a: Telemetry() for a in self.addresses}
+        self.states: Dict[str, str] = {a: "queued" for a in self.addresses}
+        self.messages: Dict[str, str] = {}
+        self.conns: Dict[str, socket.socket] = {}
+        self.lock = threading.Lock()
+        self.slots = threading.Semaphore(self.limit)
+        self.stopped = threading.Event()
+
+    # Function 'fleet'
+    def fleet(self) -> dict:
+        """
+        Merge the per-host counters into fleet totals.
+        Hosts are counted per state (queued, running, done, failed...).
+        Cheap enough to call for every progress event.
+        """
+        totals = {"entries": 0, "bytes": 0, "errors": 0, "pending": 0}
+        with self.lock:
+            for t in self.hosts.values():
+                for k in totals:
+                    totals[k] += getattr(t, k)
+            states: Dict[str, int] = {}
+            for st in self.states.values():
+                states[st] = states.get(st, 0) + 1
+        totals["hosts"] = states
+        return totals
+
+    # Function 'hostdict'
+    def hostdict(self, address: str) -> dict:
+        """
+        Return the counters, state and last error message of one host.
+        Used for per-host 'done' events and the final report.
+        Missing messages are omitted.
+        """
+        t = self.hosts[address]
+        rec = {"host": address, "state": self.states[address], "entries": t.entries, "bytes": t.bytes,
+               "errors": t.errors, "pending": t.pending}
+        if address in self.messages:
+            rec["message"] = self.messages[address]
+        return rec
+
+    # Function 'dispatch'
+    def dispatch(self, address: str):
+        """
+        Run the job on one host once a concurrency slot is free.
+        Parses the protocol lines into the host's Telemetry; the host
+        fails on ERROR lines, connection errors or a missing TOTAL.
+        """
+        with self.slots:
+            if self.stopped.is_set():
+                self.states[address] = "cancelled"
+                return
+            t = self.hosts[address]
+            self.states[address] = "running"
+            total = False
+            try:
+                sock = WorkerServer.connect(address)
+                with self.lock:
+                    self.conns[address] = sock
+                with sock:
+                    hello = f"HELLO\t{self.token}\n" if self.token else "HELLO\t\n"
+                    asked = {k: getattr(self.opts, k) for k in WorkerServer.CLIENTFIELDS}
+                    run = json.dumps({"opts": asked, "rows": False})
+                    sock.sendall(f"{hello}RUN\t{run}\n".encode("utf-8"))
+                    for line in sock.makefile("r", encoding="utf-8", newline="\n"):
+                        parts = line.rstrip("\n").split("\t")
+                        with self.lock:
+                            if parts[0] == "PROG" and len(parts) >= 6:
+                                t.entries, t.bytes, t.errors, t.pending = (int(x) for x in parts[1:5])
+                                t.target = "\t".join(parts[5:])
+                            elif parts[0] == "PLAN" and len(parts) >= 3:
+                                t.planentries, t.planbytes = int(parts[1]), int(parts[2])
+                            elif parts[0] == "TOTAL" and len(parts) >= 2:
+                                t.bytes = int(parts[1])
+                                total = True
+                            elif parts[0] == "ERROR":
+                                t.errors += 1
+                                self.messages[address] = "\t".join(parts[1:])
+            except (OSError, ValueError) as e:
+                self.messages[address] = str(e)
+            finally:
+                with self.lock:
+                    self.conns.pop(address, None)
+            ok = total and address not in self.messages
+            self.states[address] = ("stopped" if self.stopped.is_set() else "done") if ok else "failed"
+            self.out({"event": "done", **self.hostdict(address)})
+
+    # Function 'run'
+    def run(self) -> int:
+        """
+        Dispatch to every host, report fleet progress until all finished,
+        then emit the final 'fleet' event with per-host records.
+        Returns 0 when every host completed, 1 otherwise.
+        """
+        threads = [threading.Thread(target=self.dispatch, args=(a,), daemon=True) for a in self.addresses]
+        self.out({"event": "start", "hosts": self.addresses, "limit": self.limit, "dryrun": self.opts.dryrun})
+        for th in threads:
+            th.start()
+        while any(th.is_alive() for th in threads):
+            for th in threads:
+                th.join(self.interval)
+                if th.is_alive():
+                    break
+            if any(th.is_alive() for th in threads):
+                self.out({"event": "progress", **self.fleet()})
+        report = {"event": "fleet", **self.fleet(), "per_host": [self.hostdict(a) for a in self.addresses]}
+        self.out(report)
+        return 0 if all(st == "done" for st in self.states.values()) else 1
+
+    # Function 'stop'
+    def stop(self):
+        """
+        Send STOP to every running host and cancel queued ones.
+        Hosts finish their current entry and report their totals.
+        Safe to call from a signal handler.
+        """
+        self.stopped.set()
+        with self.lock:
+            conns = list(self.conns.values())
+        for sock in conns:
+            with contextlib.suppress(OSError):
+                sock.sendall(b"STOP\n")
+
+
 # Class 'DialogPrefs'
 class DialogPrefs(QDialog):
     """
@@ -1129,21 +5118,18 @@ class DialogPrefs(QDialog):
     """
 
     # Function '__init__'
-    def __init__(self, parent: QWidget, opts: ExecOpts, runbootstart: bool, runshutdown: bool, pathopts: Dict[str, bool]):
+    def __init__(self, parent: QWidget, opts: ExecOpts, runbootstart: bool, runshutdown: bool, pathopts: Dict[str, bool],
+                 budgets: Optional[Dict[str, int]] = None):
         """
         Construct the preferences dialog with the current settings snapshot.
-        Builds tabs for general options and per-path enablement checkboxes.
-        Values are staged locally until the dialog is accepted.
+        Builds tabs for general options, per-path checkboxes and cache budgets.
+        Widgets are built once; setvalues() loads a snapshot into them.
         """
         super().__init__(parent)
         self.setWindowTitle("Preferences")
         self.setModal(True)
         self.resize(780, 620)
 
-        self.opts = ExecOpts.fromdict(opts.todict())
-        self.execbootstart = bool(runbootstart)
-        self.execshutdown = bool(runshutdown)
-        self.pathopts = pathopts.copy()
         tabs = QTabWidget(self)
 
         # --- General
@@ -1152,54 +5138,150 @@ class DialogPrefs(QDialog):
         self.cbshutdown = QCheckBox("Shutdown after cleanup")
         self.cbrunboot = QCheckBox("Run at boot")
         self.cbrunshutdown = QCheckBox("Run at shutdown")
-        self.spindays = QSpinBox()
-        self.spindays.setRange(0, 3650)
-        self.editsize = QLineEdit()
-        self.spinkeep = QSpinBox()
-        self.spinkeep.setRange(1, 10)
-
-        self.cbshutdown.setChecked(self.opts.shutafter)
-        self.cbrunboot.setChecked(self.execbootstart)
-        self.cbrunshutdown.setChecked(self.execshutdown)
-        self.spindays.setValue(self.opts.vacuumdays)
-        self.editsize.setText(self.opts.vacuumsize)
-        self.spinkeep.setValue(self.opts.keepsnaps)
+        self.editcalendar = QLineEdit()
+        self.editcalendar.setPlaceholderText("e.g. Sun *-*-* 03:00 (empty: no timer)")
+        self.spinservicemins = QSpinBox()
+        self.spinservicemins.setRange(0, 1440)
+        self.spinservicemins.setSuffix(" min")
+        self.spinservicemins.setSpecialValueText("Unlimited")
+        self.spinserviceops = QSpinBox()
+        self.spinserviceops.setRange(0, 1000000)
+        self.spinserviceops.setSpecialValueText("Same as above")
+        self.cbestimate = QCheckBox("Estimate progress with a quick pre-count")
+        self.cbexporttable = QCheckBox("List exported rows in the table too")
+        self.cbaudit = QCheckBox("Keep an audit journal of every deletion")
+        self.editauditdir = QLineEdit()
+        self.editauditdir.setPlaceholderText("/var/log/blitzclean as root, else ~/.config/blitzclean/audit")
+        self.spinauditmax = QSpinBox()
+        self.spinauditmax.setRange(1, 4096)
+        self.spinauditmax.setSuffix(" MB")
+        self.spinauditkeep = QSpinBox()
+        self.spinauditkeep.setRange(1, 100)
+        self.cbmetrics = QCheckBox("Write Prometheus metrics after each real run")
+        self.editmetricsdir = QLineEdit()
+        self.editmetricsdir.setPlaceholderText("/var/lib/prometheus/node-exporter as root, else ~/.config/blitzclean/metrics")
+        self.cbquarantine = QCheckBox("Quarantine instead of deleting (purge in the background)")
+        self.spinquarantinedays = QSpinBox()
+        self.spinquarantinedays.setRange(0, 365)
+        self.spinquarantinedays.setSuffix(" days")
+        self.spinquarantinedays.setSpecialValueText("Purge right after the run")
+        self.spindays = QSpinBox()
+        self.spindays.setRange(0, 3650)
+        self.editsize = QLineEdit()
+        self.spinkeep = QSpinBox()
+        self.spinkeep.setRange(1, 10)
+        self.cbparallel = QCheckBox("Clean different disks in parallel")
+        self.spinhdd = QSpinBox()
+        self.spinhdd.setRange(1, 8)
+        self.spinssd = QSpinBox()
+        self.spinssd.setRange(1, 32)
+        self.cblowimpact = QCheckBox("Low-impact mode (idle priority, back off under pressure)")
+        self.spinpressure = QSpinBox()
+        self.spinpressure.setRange(1, 100)
+        self.spinpressure.setSuffix(" %")
+        self.spinopsmax = QSpinBox()
+        self.spinopsmax.setRange(0, 1000000)
+        self.spinopsmax.setSpecialValueText("Unlimited")
 
         g.addRow(self.cbshutdown)
-        g.addRow(self.cbrunboot)
-        g.addRow(self.cbrunshutdown)
+        g.addRow(self.cbestimate)
+        g.addRow(self.cbexporttable)
+        g.addRow(self.cbaudit)
+        g.addRow(QLabel("Audit journal folder:"), self.editauditdir)
+        g.addRow(QLabel("Rotate audit journal at:"), self.spinauditmax)
+        g.addRow(QLabel("Rotated journals kept:"), self.spinauditkeep)
+        g.addRow(self.cbmetrics)
+        g.addRow(QLabel("Metrics folder:"), self.editmetricsdir)
+        g.addRow(self.cbquarantine)
+        g.addRow(QLabel("Keep quarantined items:"), self.spinquarantinedays)
         g.addRow(QLabel("Vacuum days:"), self.spindays)
         g.addRow(QLabel("Vacuum size:"), self.editsize)
         g.addRow(QLabel("Snap revisions:"), self.spinkeep)
-
-        loadopts = QWidget()
-        v = QVBoxLayout(loadopts)
-        self.chk_map: Dict[str, QCheckBox] = {}
-
-        # Function 'addsection'
-        def addsection(title: str, keys: List[str]):
-            """
-            Helper to add a titled group of checkboxes for a set of keys.
-            Initializes each checkbox from the current path options map.
-            Adds the completed group box into the Options tab layout.
-            """
-            box = QGroupBox(title)
-            inner = QVBoxLayout(box)
-            for k in keys:
-                cb = QCheckBox(k)
-                cb.setChecked(self.pathopts.get(k, True))
-                self.chk_map[k] = cb
-                inner.addWidget(cb)
-            v.addWidget(box)
-
-        addsection("User: Paths", USERPATH)
-        addsection("User: Histories", USERHISTORY)
-        addsection("User: Browsers", USERBROWSERS)
-        addsection("User: Miscs", USERMISCS)
-        addsection("User: Aggressive (DANGEROUS)", USERAGGRESIVE)
-        addsection("Root: Items", ROOTITEMS)
-        addsection("System: Directories", SYSDIRS)
-        addsection("System: Logs", [f"{base}::{pat}" for base, pat in SYSGLOBS])
+        g.addRow(self.cbparallel)
+        g.addRow(QLabel("Workers per HDD:"), self.spinhdd)
+        g.addRow(QLabel("Workers per SSD/tmpfs:"), self.spinssd)
+        g.addRow(self.cblowimpact)
+        g.addRow(QLabel("Pressure limit (PSI avg10):"), self.spinpressure)
+        g.addRow(QLabel("Max operations per second:"), self.spinopsmax)
+        self.spinupdate = QSpinBox()
+        self.spinupdate.setRange(0, 8760)
+        self.spinupdate.setSuffix(" h")
+        self.spinupdate.setSpecialValueText("Never")
+        g.addRow(QLabel("Check for updates every:"), self.spinupdate)
+
+        # --- Service
+        wservice = QWidget()
+        sv = QFormLayout(wservice)
+        self.cbwatch = QCheckBox("Watch free space and clean automatically")
+        self.editwatchmounts = QLineEdit()
+        self.editwatchmounts.setPlaceholderText("/, /var, /home")
+        self.spinwatchlow = QSpinBox()
+        self.spinwatchlow.setRange(1, 99)
+        self.spinwatchlow.setSuffix(" % free")
+        self.spinwatchhigh = QSpinBox()
+        self.spinwatchhigh.setRange(2, 100)
+        self.spinwatchhigh.setSuffix(" % free")
+        self.spinwatchinterval = QSpinBox()
+        self.spinwatchinterval.setRange(5, 86400)
+        self.spinwatchinterval.setSuffix(" s")
+
+        sv.addRow(self.cbrunboot)
+        sv.addRow(self.cbrunshutdown)
+        sv.addRow(QLabel("Off-peak schedule (OnCalendar):"), self.editcalendar)
+        sv.addRow(QLabel("Scheduled run time budget:"), self.spinservicemins)
+        sv.addRow(QLabel("Scheduled run ops per second:"), self.spinserviceops)
+        sv.addRow(self.cbwatch)
+        sv.addRow(QLabel("Watched mounts:"), self.editwatchmounts)
+        sv.addRow(QLabel("Clean below:"), self.spinwatchlow)
+        sv.addRow(QLabel("Stop at:"), self.spinwatchhigh)
+        sv.addRow(QLabel("Check every:"), self.spinwatchinterval)
+
+        wopts = QWidget()
+        v = QVBoxLayout(wopts)
+        self.rulemodel = RuleModel([
+            ("User: Paths", USERPATH),
+            ("User: Histories", USERHISTORY),
+            ("User: Browsers", USERBROWSERS),
+            ("User: Miscs", USERMISCS),
+            ("User: Aggressive (DANGEROUS)", USERAGGRESIVE),
+            ("Root: Items", ROOTITEMS),
+            ("System: Directories", SYSDIRS),
+            ("System: Logs", [f"{base}::{pat}" for base, pat in SYSGLOBS]),
+        ], self)
+        self.ruleproxy = QSortFilterProxyModel(self)
+        self.ruleproxy.setSourceModel(self.rulemodel)
+        self.ruleproxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.ruleproxy.setRecursiveFilteringEnabled(True)
+        self.ruleproxy.setAutoAcceptChildRows(True)
+        self.ruleview = QTreeView()
+        self.ruleview.setModel(self.ruleproxy)
+        self.ruleview.setUniformRowHeights(True)
+        self.ruleview.header().setStretchLastSection(False)
+        self.ruleview.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.ruleview.header().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        self.ruleview.expandAll()
+        self.editrulefilter = QLineEdit()
+        self.editrulefilter.setPlaceholderText("Filter rules...")
+        self.editrulefilter.setClearButtonEnabled(True)
+        self.editrulefilter.textChanged.connect(self.onrulefilter)
+        btnruleson = QPushButton("Check shown")
+        btnrulesoff = QPushButton("Uncheck shown")
+        btnruleson.clicked.connect(lambda: self.onrulebulk(True))
+        btnrulesoff.clicked.connect(lambda: self.onrulebulk(False))
+        filterrow = QHBoxLayout()
+        filterrow.addWidget(self.editrulefilter, stretch=1)
+        filterrow.addWidget(btnruleson)
+        filterrow.addWidget(btnrulesoff)
+        v.addLayout(filterrow)
+        v.addWidget(self.ruleview, stretch=1)
+        self.editexcludes = QLineEdit()
+        self.editexcludes.setPlaceholderText("~/.cache/huggingface; /tmp/build-*")
+        self.editexcludes.setToolTip("Paths or globs never cleaned, separated by ';'.\n"
+                                     "Relative paths and '~/' apply to every home; globs match one path component.")
+        excluderow = QHBoxLayout()
+        excluderow.addWidget(QLabel("Never clean:"))
+        excluderow.addWidget(self.editexcludes, stretch=1)
+        v.addLayout(excluderow)
 
         # New: Docker section inside Options tab
         dockerbox = QGroupBox("Docker")
@@ -1208,25 +5290,28 @@ class DialogPrefs(QDialog):
         self.cbdockerimages = QCheckBox("Images")
         self.cbdockervolumes = QCheckBox("Volumes")
         self.cbdockernetworks = QCheckBox("Networks")
-        self.cbdockercontainers.setChecked(self.opts.dockercontainers)
-        self.cbdockerimages.setChecked(self.opts.dockerimages)
-        self.cbdockervolumes.setChecked(self.opts.dockervolumes)
-        self.cbdockernetworks.setChecked(self.opts.dockernetworks)
         dockerinner.addWidget(self.cbdockercontainers)
         dockerinner.addWidget(self.cbdockerimages)
         dockerinner.addWidget(self.cbdockervolumes)
         dockerinner.addWidget(self.cbdockernetworks)
         v.addWidget(dockerbox)
 
-        scroll = QScrollArea()
-        container = QWidget()
-        container.setLayout(v)
-        scroll.setWidget(container)
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # --- Budgets
+        wbudget = QWidget()
+        b = QFormLayout(wbudget)
+        b.addRow(QLabel("Keep these caches under a size (e.g. 500M, 2G) instead of wiping them.\n"
+                        "Least recently used files are removed first. Leave empty to wipe."))
+        self.budget_map: Dict[str, QLineEdit] = {}
+        for k in USERTRIMS:
+            edit = QLineEdit()
+            edit.setPlaceholderText("wipe all")
+            self.budget_map[k] = edit
+            b.addRow(QLabel(f"{k}:"), edit)
 
         tabs.addTab(wgen, "General")
-        tabs.addTab(scroll, "Options")
+        tabs.addTab(wservice, "Service")
+        tabs.addTab(wopts, "Options")
+        tabs.addTab(wbudget, "Budgets")
 
         btns = QDialogButtonBox(parent=self)
         btnvalid = QPushButton("OK", self)
@@ -1240,30 +5325,144 @@ class DialogPrefs(QDialog):
         layout = QVBoxLayout(self)
         layout.addWidget(tabs)
         layout.addWidget(btns)
+        self.setvalues(opts, runbootstart, runshutdown, pathopts, budgets)
+
+    # Function 'onrulefilter'
+    def onrulefilter(self, text: str):
+        """
+        Show only rules (or whole groups) whose label contains 'text'.
+        Matching is case-insensitive; an empty filter shows every rule.
+        Groups are re-expanded so matches are never hidden when collapsed.
+        """
+        self.ruleproxy.setFilterFixedString(text.strip())
+        self.ruleview.expandAll()
+
+    # Function 'onrulebulk'
+    def onrulebulk(self, on: bool):
+        """
+        Check or uncheck every rule currently shown by the filter.
+        Rules hidden by the filter keep their state.
+        Applied to the model in one batch.
+        """
+        keys: List[str] = []
+        for gr in range(self.ruleproxy.rowCount()):
+            group = self.ruleproxy.index(gr, 0)
+            for r in range(self.ruleproxy.rowCount(group)):
+                src = self.ruleproxy.mapToSource(self.ruleproxy.index(r, 0, group))
+                keys.append(self.rulemodel.key(src))
+        self.rulemodel.setkeys(keys, on)
+
+    # Function 'setvalues'
+    def setvalues(self, opts: ExecOpts, runbootstart: bool, runshutdown: bool, pathopts: Dict[str, bool],
+                  budgets: Optional[Dict[str, int]] = None):
+        """
+        Load a settings snapshot into the already built widgets.
+        Values are copied and staged locally until the dialog is accepted,
+        so a cached dialog can be reopened without rebuilding it.
+        """
+        self.opts = ExecOpts.fromdict(opts.todict())
+        self.execbootstart = bool(runbootstart)
+        self.execshutdown = bool(runshutdown)
+        self.pathopts = pathopts.copy()
+        self.budgets = dict(budgets or {})
+
+        self.cbshutdown.setChecked(self.opts.shutafter)
+        self.cbestimate.setChecked(self.opts.estimate)
+        self.cbexporttable.setChecked(self.opts.exporttable)
+        self.cbaudit.setChecked(self.opts.audit)
+        self.editauditdir.setText(self.opts.auditdir)
+        self.spinauditmax.setValue(self.opts.auditmaxmb)
+        self.spinauditkeep.setValue(self.opts.auditkeep)
+        self.cbquarantine.setChecked(self.opts.quarantine)
+        self.spinquarantinedays.setValue(self.opts.quarantinedays)
+        self.cbmetrics.setChecked(self.opts.metrics)
+        self.editmetricsdir.setText(self.opts.metricsdir)
+        self.cbrunboot.setChecked(self.execbootstart)
+        self.cbrunshutdown.setChecked(self.execshutdown)
+        self.editcalendar.setText(self.opts.servicecalendar)
+        self.spinservicemins.setValue(self.opts.servicemins)
+        self.spinserviceops.setValue(self.opts.serviceops)
+        self.spindays.setValue(self.opts.vacuumdays)
+        self.editsize.setText(self.opts.vacuumsize)
+        self.spinkeep.setValue(self.opts.keepsnaps)
+        self.cbparallel.setChecked(self.opts.parallel)
+        self.spinhdd.setValue(self.opts.hddworkers)
+        self.spinssd.setValue(self.opts.ssdworkers)
+        self.cblowimpact.setChecked(self.opts.lowimpact)
+        self.spinpressure.setValue(self.opts.pressurelimit)
+        self.spinopsmax.setValue(self.opts.opsmax)
+        self.spinupdate.setValue(self.opts.updatehours)
+        self.cbwatch.setChecked(self.opts.watch)
+        self.editwatchmounts.setText(self.opts.watchmounts)
+        self.spinwatchlow.setValue(self.opts.watchlow)
+        self.spinwatchhigh.setValue(self.opts.watchhigh)
+        self.spinwatchinterval.setValue(self.opts.watchinterval)
+
+        self.cbdockercontainers.setChecked(self.opts.dockercontainers)
+        self.cbdockerimages.setChecked(self.opts.dockerimages)
+        self.cbdockervolumes.setChecked(self.opts.dockervolumes)
+        self.cbdockernetworks.setChecked(self.opts.dockernetworks)
+        self.editexcludes.setText(self.opts.excludes)
+
+        self.rulemodel.load(self.pathopts)
+        self.ruleview.expandAll()
+        for k, edit in self.budget_map.items():
+            edit.setText(SysUtils.unitsize(self.budgets[k]) if self.budgets.get(k, 0) > 0 else "")
 
     # Function 'addvalues'
-    def addvalues(self) -> Tuple[ExecOpts, bool, bool, Dict[str, bool]]:
+    def addvalues(self) -> Tuple[ExecOpts, bool, bool, Dict[str, bool], Dict[str, int]]:
         """
         Pull current widget state back into domain objects and flags.
-        Updates ExecOpts, boot/shutdown toggles, and per-path selections.
-        Returns a tuple (opts, runboot, runshutdown, pathopts).
+        Updates ExecOpts, boot/shutdown toggles, per-path selections and budgets.
+        Returns a tuple (opts, runboot, runshutdown, pathopts, budgets).
         """
         self.opts.shutafter = self.cbshutdown.isChecked()
+        self.opts.estimate = self.cbestimate.isChecked()
+        self.opts.exporttable = self.cbexporttable.isChecked()
+        self.opts.audit = self.cbaudit.isChecked()
+        self.opts.auditdir = self.editauditdir.text().strip()
+        self.opts.auditmaxmb = self.spinauditmax.value()
+        self.opts.auditkeep = self.spinauditkeep.value()
+        self.opts.quarantine = self.cbquarantine.isChecked()
+        self.opts.quarantinedays = self.spinquarantinedays.value()
+        self.opts.metrics = self.cbmetrics.isChecked()
+        self.opts.metricsdir = self.editmetricsdir.text().strip()
         self.execbootstart = self.cbrunboot.isChecked()
         self.execshutdown = self.cbrunshutdown.isChecked()
         self.opts.vacuumdays = self.spindays.value()
         self.opts.vacuumsize = self.editsize.text().strip() or "100M"
         self.opts.keepsnaps = self.spinkeep.value()
+        self.opts.parallel = self.cbparallel.isChecked()
+        self.opts.hddworkers = self.spinhdd.value()
+        self.opts.ssdworkers = self.spinssd.value()
+        self.opts.lowimpact = self.cblowimpact.isChecked()
+        self.opts.pressurelimit = self.spinpressure.value()
+        self.opts.opsmax = self.spinopsmax.value()
+        self.opts.servicecalendar = " ".join(self.editcalendar.text().split())
+        self.opts.servicemins = self.spinservicemins.value()
+        self.opts.serviceops = self.spinserviceops.value()
+        self.opts.watch = self.cbwatch.isChecked()
+        self.opts.watchmounts = ", ".join(m.strip() for m in self.editwatchmounts.text().split(",") if m.strip()) or "/"
+        self.opts.watchlow = self.spinwatchlow.value()
+        self.opts.watchhigh = max(self.spinwatchhigh.value(), self.opts.watchlow + 1)
+        self.opts.watchinterval = self.spinwatchinterval.value()
+        self.opts.updatehours = self.spinupdate.value()
 
         # Docker flags
         self.opts.dockercontainers = self.cbdockercontainers.isChecked()
         self.opts.dockerimages = self.cbdockerimages.isChecked()
         self.opts.dockervolumes = self.cbdockervolumes.isChecked()
         self.opts.dockernetworks = self.cbdockernetworks.isChecked()
+        self.opts.excludes = "; ".join(ExcludeIndex.patterns(self.editexcludes.text()))
 
-        for k, cb in self.chk_map.items():
-            self.pathopts[k] = cb.isChecked()
-        return self.opts, self.execbootstart, self.execshutdown, self.pathopts
+        self.pathopts.update(self.rulemodel.states())
+        for k, edit in self.budget_map.items():
+            n = SysUtils.parsesize(edit.text())
+            if n > 0:
+                self.budgets[k] = n
+            else:
+                self.budgets.pop(k, None)
+        return self.opts, self.execbootstart, self.execshutdown, self.pathopts, self.budgets
 
 
 # Custom 'DialogAbout'
@@ -1338,83 +5537,711 @@ class DialogAbout(QDialog):
         layout.addWidget(btns)
 
 
-# Custom 'DialogCompleted'
-class DialogCompleted(QDialog):
+# Custom 'DialogCompleted'
+class DialogCompleted(QDialog):
+    """
+    Modal dialog to notify the user that cleanup is complete.
+    Shows a 128×128 PNG icon, a confirmation message, and a close button.
+    Centers relative to the parent window and supports the standard close.
+    """
+
+    # Function '__init__'
+    def __init__(self, parent: Optional[QWidget], error_message: Optional[str] = None):
+        """
+        Build the completion dialog with icon, text and a Close button.
+        Attempts to load an app icon from known locations with fallbacks.
+        Keeps the layout compact and visually centered in the parent.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Cleanup Completed" if not error_message else "Cleanup Failed")
+        self.setModal(True)
+        self.setMinimumSize(420, 280)
+
+        iconlabel = QLabel()
+        iconlabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        iconpath = [
+            Path("/usr/share/blitzclean/icons/success.png")
+        ] if not error_message else [
+            Path("/usr/share/blitzclean/icons/error.png")
+        ]
+
+        pix: Optional[QPixmap] = None
+        for pth in iconpath:
+            if pth.is_file():
+                tmp = QPixmap(str(pth))
+                if not tmp.isNull():
+                    pix = tmp
+                    break
+        if pix:
+            iconlabel.setPixmap(pix.scaled(96, 96, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+
+        title = QLabel("<b>Cleanup finished successfully</b>" if not error_message else "<b>Cleanup failed</b>")
+        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        msg = QLabel(
+            "All selected files have been removed\n"
+            "You can safely close this window"
+            if not error_message else
+            f"{error_message}\nPlease review logs or try again"
+        )
+        msg.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        msg.setWordWrap(True)
+
+        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Close, parent=self)
+        btns.rejected.connect(self.reject)
+        btns.accepted.connect(self.accept)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+        layout.addWidget(iconlabel)
+        layout.addSpacing(10)
+        layout.addWidget(title)
+        layout.addWidget(msg)
+        layout.addStretch(1)
+        layout.addSpacing(10)
+        layout.addWidget(btns)
+
+    # Function 'showcenter'
+    def showcenter(self):
+        """
+        Show the dialog centered over its parent window.
+        Adjusts size before placement to ensure correct centering.
+        Uses the parent's geometry for accurate positioning.
+        """
+        self.adjustSize()
+        if self.parent() and isinstance(self.parent(), QWidget):
+            parent: QWidget = self.parent()
+            center = parent.geometry().center()
+            self.move(center - self.rect().center())
+        self.exec()
+
+
+# Class 'ResultModel'
+class ResultModel(QAbstractTableModel):
+    """
+    Read-only table model serving result rows from a ResultStore.
+    Cells are rendered on demand, so only visible rows ever build a full
+    path or a formatted size string.
+    """
+
+    # Define 'HEADERS'
+    HEADERS = ["Filepath", "Size", "Modified"]
+
+    # Function '__init__'
+    def __init__(self, parent: Optional[QObject] = None):
+        """
+        Create an empty model backed by a new ResultStore.
+        The store is only modified through extend() and clear()
+        so attached views are always notified.
+        """
+        super().__init__(parent)
+        self.store = ResultStore()
+
+    # Function 'rowCount'
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Return the number of rows; the model is flat.
+        Child indexes have no rows.
+        Qt override, hence the camelCase name.
+        """
+        return 0 if parent.isValid() else len(self.store)
+
+    # Function 'columnCount'
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Return the fixed column count: path, size and modified time.
+        Child indexes have no columns.
+        Qt override, hence the camelCase name.
+        """
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    # Function 'data'
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        Render one cell from the store for the requested role.
+        The path column also exposes the drill target as UserRole data
+        and a hint tooltip on summary rows.
+        """
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return self.store.path(row)
+            if col == 1:
+                return SysUtils.unitsize(self.store.sizes[row])
+            return self.store.mtimes[row]
+        if col == 0 and row in self.store.drills:
+            if role == Qt.ItemDataRole.UserRole:
+                return self.store.drills[row]
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return "Double-click to list the files of this target"
+        return None
+
+    # Function 'headerData'
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        Return the horizontal header labels.
+        Vertical headers are hidden by the view and get no labels.
+        Qt override, hence the camelCase name.
+        """
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    # Function 'extend'
+    def extend(self, rows: List[Tuple[str, str, int, str, Optional[Tuple[str, str]]]]):
+        """
+        Append a batch of (folder, name, size, mtime, drill) rows.
+        One insert notification per batch keeps views cheap to update.
+        Empty batches are ignored.
+        """
+        if not rows:
+            return
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for dirpath, name, size, mtime, drill in rows:
+            self.store.add(dirpath, name, size, mtime, drill)
+        self.endInsertRows()
+
+    # Function 'clear'
+    def clear(self):
+        """
+        Remove every row and release the store's directory table.
+        Views are reset in one notification.
+        Used at the start of a run and after the fade-out.
+        """
+        self.beginResetModel()
+        self.store.clear()
+        self.endResetModel()
+
+
+# Class 'RuleModel'
+class RuleModel(QAbstractItemModel):
+    """
+    Checkable two-level model of rule keys grouped by category.
+    Views only create painting state for visible rows, so thousands of
+    rules cost no widgets; group rows show an aggregate tri-state check.
+    """
+
+    # Define 'HEADERS'
+    HEADERS = ["Rule", "Reclaimable"]
+
+    # Function '__init__'
+    def __init__(self, groups: List[Tuple[str, List[str]]], parent: Optional[QObject] = None):
+        """
+        Build the model from (title, keys) groups in display order.
+        Every key starts checked, matching the pathopts default.
+        Groups are kept as lists so child indexes can point at them.
+        """
+        super().__init__(parent)
+        self.groups: List[list] = [[title, list(keys)] for title, keys in groups]
+        self.grouprows: Dict[int, int] = {id(g): i for i, g in enumerate(self.groups)}
+        self.checked: Dict[str, bool] = {k: True for _, keys in self.groups for k in keys}
+        self.sizes: Dict[str, int] = {}
+        self.positions: Dict[str, List[Tuple[int, int]]] = {}
+        for gr, (_, keys) in enumerate(self.groups):
+            for r, k in enumerate(keys):
+                self.positions.setdefault(k, []).append((gr, r))
+
+    # Function 'index'
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        """
+        Create the index of a group (top level) or of a rule (child).
+        Rule indexes carry their group list as internal pointer.
+        Qt override, hence the camelCase name.
+        """
+        if column < 0 or column >= len(self.HEADERS):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column) if 0 <= row < len(self.groups) else QModelIndex()
+        if parent.internalPointer() is not None:
+            return QModelIndex()
+        group = self.groups[parent.row()]
+        return self.createIndex(row, column, group) if 0 <= row < len(group[1]) else QModelIndex()
+
+    # Function 'parent'
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        """
+        Return the group index of a rule, or an invalid index for groups.
+        Group rows are looked up by identity of the group list.
+        Qt override.
+        """
+        group = index.internalPointer() if index.isValid() else None
+        if group is None:
+            return QModelIndex()
+        return self.createIndex(self.grouprows[id(group)], 0)
+
+    # Function 'rowCount'
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Return the number of groups, or of rules inside one group.
+        Rules and non-first columns have no children.
+        Qt override, hence the camelCase name.
+        """
+        if not parent.isValid():
+            return len(self.groups)
+        if parent.column() > 0 or parent.internalPointer() is not None:
+            return 0
+        return len(self.groups[parent.row()][1])
+
+    # Function 'columnCount'
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """
+        Return the fixed column count.
+        Identical for groups and rules.
+        Qt override, hence the camelCase name.
+        """
+        return len(self.HEADERS)
+
+    # Function 'key'
+    def key(self, index: QModelIndex) -> str:
+        """
+        Return the rule key of a rule index, or "" for group indexes.
+        Used by the dialog to map filtered rows back to keys.
+        Invalid indexes also return "".
+        """
+        group = index.internalPointer() if index.isValid() else None
+        return "" if group is None else group[1][index.row()]
+
+    # Function 'groupstate'
+    def groupstate(self, row: int) -> Qt.CheckState:
+        """
+        Aggregate the check state of one group's rules.
+        Mixed groups are partially checked; empty groups are unchecked.
+        Computed on demand, only for visible group rows.
+        """
+        states = {self.checked[k] for k in self.groups[row][1]}
+        if states == {True}:
+            return Qt.CheckState.Checked
+        if states == {True, False}:
+            return Qt.CheckState.PartiallyChecked
+        return Qt.CheckState.Unchecked
+
+    # Function 'data'
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        Render a group title or rule key, its check state and preview size.
+        Group sizes sum the known sizes of their rules; unknown sizes are
+        blank. Rules expose their key as UserRole data.
+        """
+        if not index.isValid():
+            return None
+        key = self.key(index)
+        if index.column() == 1:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            if role != Qt.ItemDataRole.DisplayRole:
+                return None
+            known = [self.sizes[k] for k in ([key] if key else self.groups[index.row()][1]) if k in self.sizes]
+            return SysUtils.unitsize(sum(known)) if known else ""
+        if role == Qt.ItemDataRole.DisplayRole:
+            if key:
+                return key
+            title, keys = self.groups[index.row()]
+            return f"{title} ({len(keys)})"
+        if role == Qt.ItemDataRole.CheckStateRole and index.column() == 0:
+            if key:
+                return Qt.CheckState.Checked if self.checked[key] else Qt.CheckState.Unchecked
+            return self.groupstate(index.row())
+        if role == Qt.ItemDataRole.UserRole and key:
+            return key
+        return None
+
+    # Function 'flags'
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        """
+        Make every row enabled, selectable and user-checkable.
+        Invalid indexes get no flags.
+        Qt override.
+        """
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+    # Function 'setData'
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        """
+        Toggle a rule, or every rule of a group, from the view.
+        Only the check state role is editable.
+        Qt override, hence the camelCase name.
+        """
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        on = Qt.CheckState(value) == Qt.CheckState.Checked
+        key = self.key(index)
+        self.setkeys([key] if key else self.groups[index.row()][1], on)
+        return True
+
+    # Function 'headerData'
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        """
+        Return the horizontal header labels.
+        Vertical headers are not used by tree views.
+        Qt override, hence the camelCase name.
+        """
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    # Function 'setkeys'
+    def setkeys(self, keys: List[str], on: bool):
+        """
+        Set the check state of many rules at once.
+        Emits one change notification per affected group,
+        covering its rules and its aggregate row.
+        """
+        touched = set()
+        for k in keys:
+            if k in self.checked and self.checked[k] != on:
+                self.checked[k] = on
+                touched.add(k)
+        last = len(self.HEADERS) - 1
+        for row, (_, gkeys) in enumerate(self.groups):
+            if touched.isdisjoint(gkeys):
+                continue
+            parent = self.index(row, 0)
+            self.dataChanged.emit(parent, self.index(row, last))
+            self.dataChanged.emit(self.index(0, 0, parent), self.index(len(gkeys) - 1, last, parent))
+
+    # Function 'load'
+    def load(self, pathopts: Dict[str, bool]):
+        """
+        Load check states from a pathopts map; missing keys are checked.
+        Views are reset in one notification.
+        Keys in pathopts that are not rules are ignored.
+        """
+        self.beginResetModel()
+        for k in self.checked:
+            self.checked[k] = bool(pathopts.get(k, True))
+        self.endResetModel()
+
+    # Function 'states'
+    def states(self) -> Dict[str, bool]:
+        """
+        Return a copy of the rule check states as a pathopts map.
+        Covers every rule of every group.
+        Used when the dialog is accepted.
+        """
+        return dict(self.checked)
+
+    # Function 'setsize'
+    def setsize(self, key: str, nbytes: int):
+        """
+        Show the reclaimable bytes of one rule as they arrive.
+        Only the size cells of the rule and its group are refreshed.
+        Keys that are not rules of this model are ignored.
+        """
+        if key not in self.positions or self.sizes.get(key) == nbytes:
+            return
+        self.sizes[key] = nbytes
+        for gr, r in self.positions[key]:
+            parent = self.index(gr, 0)
+            self.dataChanged.emit(self.index(gr, 1), self.index(gr, 1))
+            self.dataChanged.emit(self.index(r, 1, parent), self.index(r, 1, parent))
+
+    # Function 'setsizes'
+    def setsizes(self, sizes: Dict[str, int]):
+        """
+        Replace every preview size at once, e.g. when the user changed.
+        The size column of every group and rule is refreshed.
+        Keys missing from 'sizes' are shown blank.
+        """
+        self.sizes = {k: v for k, v in sizes.items() if k in self.positions}
+        for gr, (_, keys) in enumerate(self.groups):
+            parent = self.index(gr, 0)
+            self.dataChanged.emit(self.index(gr, 1), self.index(gr, 1))
+            if keys:
+                self.dataChanged.emit(self.index(0, 1, parent), self.index(len(keys) - 1, 1, parent))
+
+
+# Class 'ReclaimPreview'
+class ReclaimPreview(QObject):
+    """
+    Background sizing service for the reclaimable bytes of every rule key.
+    Sizes come from the size index while fresh and from a row-less walk
+    otherwise; each result is published through 'sized' as it is known.
+    """
+
+    # Define 'sized'
+    sized = pyqtSignal(str, str, int)
+
+    # Function '__init__'
+    def __init__(self, parent: Optional[QObject] = None):
+        """
+        Create an idle service; nothing is walked until start() is called.
+        Results are queued to receivers living in the GUI thread.
+        At most one pass publishes results at any time.
+        """
+        super().__init__(parent)
+        self.thread: Optional[threading.Thread] = None
+        self.stopevent: Optional[threading.Event] = None
+        self.home: Optional[str] = None
+
+    # Function 'start'
+    def start(self, home: str, refresh: bool = False, excludes: str = "", budgets: Optional[Dict[str, int]] = None):
+        """
+        Size every rule for 'home' (and system rules when root) in the background.
+        A pass already running for the same home is kept; any other pass
+        is cancelled first. 'refresh' ignores the size index. 'excludes'
+        and 'budgets' are the run settings, applied like in a real run.
+        """
+        if not refresh and self.home == home and self.thread is not None and self.thread.is_alive():
+            return
+        self.cancel()
+        stop = threading.Event()
+        self.stopevent = stop
+        self.home = home
+        self.thread = threading.Thread(target=self.work, args=(home, refresh, stop, excludes, dict(budgets or {})),
+                                       daemon=True)
+        self.thread.start()
+
+    # Function 'cancel'
+    def cancel(self):
+        """
+        Ask the running pass to stop and return immediately.
+        The walk unwinds at its next entry; nothing more is published.
+        Sizes measured so far are still saved to the index.
+        """
+        if self.stopevent is not None:
+            self.stopevent.set()
+        self.home = None
+
+    # Function 'work'
+    def work(self, home: str, refresh: bool, stop: threading.Event, excludes: str = "",
+             budgets: Optional[Dict[str, int]] = None):
+        """
+        Thread body of one pass: size each target and publish it.
+        User rules matching nothing are published as 0 at the end.
+        Stops at the next entry once 'stop' is set.
+        """
+
+        # Function 'guard'
+        def guard():
+            """
+            Walker guard raising once the pass has been cancelled.
+            Unwinds through the FileOps walkers like a stopped run.
+            Called for every visited entry.
+            """
+            if stop.is_set():
+                raise RuntimeError("Preview cancelled.")
+
+        # Function 'publish'
+        def publish(h: str, key: str, nbytes: int):
+            """
+            Emit one result unless cancelled or the receiver is gone.
+            Called from the preview thread only.
+            Errors from a destroyed QObject are ignored.
+            """
+            if stop.is_set():
+                return
+            try:
+                self.sized.emit(h, key, int(nbytes))
+            except RuntimeError:
+                pass
+
+        index = SizeIndex()
+        seen = set()
+        try:
+            exclude = ExcludeIndex.compile(excludes, [home])
+            for h, key, walk in SysCleaner.sizetargets([home], lambda _: True, SysUtils.rootcheck(), guard, exclude,
+                                                        budgets):
+                guard()
+                variant = SizeIndex.variant((budgets or {}).get(key, 0), excludes)
+                counts = index.get(h, key, 0 if refresh else None, variant)
+                if counts is None:
+                    counts = walk()
+                    index.put(h, key, *counts, variant)
+                seen.add(key)
+                publish(h, key, counts[1])
+            for key in ["Trash"] + RuleIndex.userkeys():
+                if key not in seen:
+                    publish(home, key, 0)
+        except RuntimeError:
+            pass
+        finally:
+            index.save()
+
+
+# Class 'TelemetryChannel'
+class TelemetryChannel(QObject):
+    """
+    Publishes Telemetry snapshots to the GUI through a Qt signal.
+    A helper thread samples the attached counters at a fixed rate and
+    emits only when something changed, so UI cost is independent of row volume.
+    """
+
+    # Define 'published'
+    published = pyqtSignal(dict)
+
+    # Function '__init__'
+    def __init__(self, rate: float = 10.0, parent: Optional[QObject] = None):
+        """
+        Create an idle channel sampling 'rate' times per second.
+        Nothing is emitted until a source is attached and start() is called.
+        The signal is queued to receivers living in the GUI thread.
+        """
+        super().__init__(parent)
+        self.interval = 1.0 / max(0.1, float(rate))
+        self.source: Optional[Telemetry] = None
+        self.last: Optional[dict] = None
+        self.stopevent = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    # Function 'attach'
+    def attach(self, source: Telemetry):
+        """
+        Switch the channel to a new counter source.
+        Used when a local cleaner is created after the channel started.
+        The next sample publishes the new source's state.
+        """
+        self.source = source
+        self.last = None
+
+    # Function 'publish'
+    def publish(self):
+        """
+        Emit one snapshot of the attached source if it differs from the last.
+        Safe to call from any thread; the signal queues to the GUI thread.
+        Identical consecutive snapshots are dropped.
+        """
+        if self.source is None:
+            return
+        snap = self.source.snapshot()
+        if snap != self.last:
+            self.last = snap
+            self.published.emit(snap)
+
+    # Function 'start'
+    def start(self, source: Telemetry):
+        """
+        Attach a source and begin fixed-rate sampling on a daemon thread.
+        A previous sampling thread is stopped first.
+        Called from the GUI thread when a run starts.
+        """
+        self.stop()
+        self.attach(source)
+        self.stopevent.clear()
+
+        # Function 'sampler'
+        def sampler():
+            """
+            Sampling loop of the channel's helper thread.
+            Publishes once per interval until stop() is requested.
+            Exits promptly because it waits on the stop event.
+            """
+            while not self.stopevent.wait(self.interval):
+                self.publish()
+
+        self.thread = threading.Thread(target=sampler, daemon=True)
+        self.thread.start()
+
+    # Function 'stop'
+    def stop(self):
+        """
+        Stop sampling and publish a final snapshot so totals are exact.
+        Does nothing when the channel is not running.
+        Called from the run thread right before completion is signalled.
+        """
+        if self.thread is None:
+            return
+        self.stopevent.set()
+        self.thread.join()
+        self.thread = None
+        self.publish()
+
+
+# Class 'StartupProbe'
+class StartupProbe:
     """
-    Modal dialog to notify the user that cleanup is complete.
-    Shows a 128×128 PNG icon, a confirmation message, and a close button.
-    Centers relative to the parent window and supports the standard close.
+    Cold-start instrumentation for the GUI, enabled by BLITZCLEAN_STARTUP.
+    Records milestones relative to process start and durations of phases;
+    '1' or '-' reports JSON to stderr, any other value is a report path.
     """
 
     # Function '__init__'
-    def __init__(self, parent: Optional[QWidget], error_message: Optional[str] = None):
+    def __init__(self, target: str = ""):
         """
-        Build the completion dialog with icon, text and a Close button.
-        Attempts to load an app icon from known locations with fallbacks.
-        Keeps the layout compact and visually centered in the parent.
+        Anchor the clock at process start and record the import milestone.
+        Recording is always on and cheap; only report() depends on 'target'.
+        An empty target makes report() a no-op.
         """
-        super().__init__(parent)
-        self.setWindowTitle("Cleanup Completed" if not error_message else "Cleanup Failed")
-        self.setModal(True)
-        self.setMinimumSize(420, 280)
-
-        iconlabel = QLabel()
-        iconlabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        iconpath = [
-            Path("/usr/share/blitzclean/icons/success.png")
-        ] if not error_message else [
-            Path("/usr/share/blitzclean/icons/error.png")
-        ]
-
-        pix: Optional[QPixmap] = None
-        for pth in iconpath:
-            if pth.is_file():
-                tmp = QPixmap(str(pth))
-                if not tmp.isNull():
-                    pix = tmp
-                    break
-        if pix:
-            iconlabel.setPixmap(pix.scaled(96, 96, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        self.target = target
+        self.origin = time.perf_counter() - StartupProbe.processage()
+        self.marks: Dict[str, float] = {"imports": IMPORTDONE - self.origin}
+        self.spans: Dict[str, float] = {}
+        self.reported = False
 
-        title = QLabel("<b>Cleanup finished successfully</b>" if not error_message else "<b>Cleanup failed</b>")
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        msg = QLabel(
-            "All selected files have been removed\n"
-            "You can safely close this window"
-            if not error_message else
-            f"{error_message}\nPlease review logs or try again"
-        )
-        msg.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        msg.setWordWrap(True)
+    # Function 'fromenv'
+    @staticmethod
+    def fromenv() -> "StartupProbe":
+        """
+        Build a probe whose report target comes from the environment.
+        Unset or empty BLITZCLEAN_STARTUP disables reporting.
+        Used by the GUI entry point.
+        """
+        return StartupProbe(os.environ.get(STARTUPENV, "").strip())
 
-        btns = QDialogButtonBox(QDialogButtonBox.StandardButton.Close, parent=self)
-        btns.rejected.connect(self.reject)
-        btns.accepted.connect(self.accept)
+    # Function 'processage'
+    @staticmethod
+    def processage() -> float:
+        """
+        Return seconds elapsed since this process was started by the kernel.
+        Compares /proc/self/stat starttime with CLOCK_BOOTTIME, so the
+        interpreter start-up and imports are included; 0 if unavailable.
+        """
+        try:
+            stat_ = Path("/proc/self/stat").read_text(encoding="utf-8")
+            start = int(stat_.rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+            return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - start)
+        except (OSError, ValueError, IndexError, AttributeError):
+            return 0.0
+
+    # Function 'mark'
+    def mark(self, name: str):
+        """
+        Record a milestone as seconds since process start.
+        Only the first occurrence of a name is kept.
+        Safe to call from any thread.
+        """
+        self.marks.setdefault(name, time.perf_counter() - self.origin)
 
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(12)
-        layout.addWidget(iconlabel)
-        layout.addSpacing(10)
-        layout.addWidget(title)
-        layout.addWidget(msg)
-        layout.addStretch(1)
-        layout.addSpacing(10)
-        layout.addWidget(btns)
+    # Function 'span'
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """
+        Measure the duration of the enclosed block under 'name'.
+        Repeated spans with the same name are accumulated.
+        The measurement is kept even if the block raises.
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - t0
 
-    # Function 'showcenter'
-    def showcenter(self):
+    # Function 'report'
+    def report(self):
         """
-        Show the dialog centered over its parent window.
-        Adjusts size before placement to ensure correct centering.
-        Uses the parent's geometry for accurate positioning.
+        Emit the collected timings once, in milliseconds, as one JSON object.
+        Written to stderr or to the target file; write errors are ignored.
+        Does nothing when reporting is disabled.
         """
-        self.adjustSize()
-        if self.parent() and isinstance(self.parent(), QWidget):
-            parent: QWidget = self.parent()
-            center = parent.geometry().center()
-            self.move(center - self.rect().center())
-        self.exec()
+        if not self.target or self.reported:
+            return
+        self.reported = True
+        data = {
+            "marks": {k: round(v * 1000, 1) for k, v in self.marks.items()},
+            "spans": {k: round(v * 1000, 1) for k, v in self.spans.items()},
+        }
+        line = json.dumps(data, sort_keys=True)
+        if self.target in ("1", "-"):
+            print(line, file=sys.stderr, flush=True)
+            return
+        try:
+            Path(self.target).write_text(line + "\n", encoding="utf-8")
+        except OSError:
+            pass
 
 
 # Class 'BlitzClean'
@@ -1428,20 +6255,28 @@ class BlitzClean(QWidget):
     # Define 'completed'
     completed = pyqtSignal(bool, str)
 
+    # Define 'usersready'
+    usersready = pyqtSignal(list)
+
     # Function '__init__'
-    def __init__(self):
+    def __init__(self, probe: Optional[StartupProbe] = None):
         """
         Initialize the main window, menus, widgets, and signals.
-        Sets up periodic queue flushing to stream file rows to the table.
-        Loads persisted configuration and primes default execution options.
+        Loads persisted configuration; user discovery is deferred until
+        after the first paint and the row timer only runs during a task.
         """
         super().__init__()
+        self.probe = probe or StartupProbe()
+        self.painted = False
         self.setWindowTitle(f"{APPNAME} {VERSION} - Ubuntu Cleanup GUI")
         self.resize(1000, 720)
 
         self.workerthread = None
         self.cleaner: Optional[SysCleaner] = None
-        self.file_queue: "queue.Queue[Tuple[str,int,str]]" = queue.Queue()
+        self.workerproc: Optional[subprocess.Popen] = None
+        self.file_queue: "queue.Queue[Tuple[str,str,int,str,Optional[Tuple[str,str]]]]" = queue.Queue()
+        self.channel = TelemetryChannel(10.0, self)
+        self.channel.published.connect(self.ontelemetry)
 
         menubar = QMenuBar(self)
         mfile = menubar.addMenu("File")
@@ -1460,9 +6295,10 @@ class BlitzClean(QWidget):
         mhelp.addAction(actabout)
 
         self.cmb_user = QComboBox()
-        self.users = UserDiscovery.listusers()
-        for u, home in self.users:
-            self.cmb_user.addItem(f"{u}  —  {home}", (u, home))
+        self.users: List[Tuple[str, str]] = []
+        self.reclaim: Dict[str, Dict[str, int]] = {}
+        self.preview = ReclaimPreview(self)
+        self.preview.sized.connect(self.onsized)
 
         self.lbltotal = QLabel("Cleared Space\n0.00 MB")
         self.lbltotal.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
@@ -1478,59 +6314,225 @@ class BlitzClean(QWidget):
         self.btnrun = QPushButton("Run")
         self.btnstop = QPushButton("Stop")
         self.btnstop.setEnabled(False)
+        self.btnexport = QPushButton("Export...")
+        self.btnexport.setToolTip("Dry-run and stream every row to a CSV or NDJSON report")
         btns = QHBoxLayout()
         btns.addWidget(self.btndry)
         btns.addWidget(self.btnrun)
         btns.addWidget(self.btnstop)
+        btns.addWidget(self.btnexport)
         btns.addStretch()
+        self.cbsummary = QCheckBox("Summary only")
+        self.cbsummary.setToolTip("Show one row per target instead of every file; double-click a row to drill down")
+        btns.addWidget(self.cbsummary)
 
         self.progress = QProgressBar()
         self.progress.setRange(0, 0)
         self.progress.setVisible(False)
-
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Filepath", "Size", "Modified"])
+        self.lbleta = QLabel("")
+        self.lbleta.setVisible(False)
+        progressrow = QHBoxLayout()
+        progressrow.addWidget(self.progress, stretch=1)
+        progressrow.addWidget(self.lbleta)
+
+        self.model = ResultModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.table.setShowGrid(True)
+        self.table.doubleClicked.connect(self.ondrill)
+
+        self.cmb_topscope = QComboBox()
+        self.cmb_topscope.currentIndexChanged.connect(self.filltop)
+        self.btntopsave = QPushButton("Save Report")
+        self.btntopsave.setEnabled(False)
+        self.btntopsave.clicked.connect(self.ontopsave)
+        toprow = QHBoxLayout()
+        toprow.addWidget(QLabel("Scope:"))
+        toprow.addWidget(self.cmb_topscope, stretch=1)
+        toprow.addWidget(self.btntopsave)
+
+        self.toptable = QTableWidget(0, 3)
+        self.toptable.setHorizontalHeaderLabels(["Kind", "Path", "Size"])
+        topheader = self.toptable.horizontalHeader()
+        topheader.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        topheader.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        topheader.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        self.toptable.verticalHeader().setVisible(False)
+        self.toptable.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.toptable.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+
+        wtop = QWidget()
+        toplayout = QVBoxLayout(wtop)
+        toplayout.setContentsMargins(0, 0, 0, 0)
+        toplayout.addLayout(toprow)
+        toplayout.addWidget(self.toptable, stretch=1)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.table, "Files")
+        self.tabs.addTab(wtop, "Largest")
 
         root = QVBoxLayout()
         root.setMenuBar(menubar)
         root.addLayout(userrow)
         root.addLayout(btns)
-        root.addWidget(self.table, stretch=1)
-        root.addWidget(self.progress)
+        root.addWidget(self.tabs, stretch=1)
+        root.addLayout(progressrow)
         self.setLayout(root)
 
         self.btndry.clicked.connect(lambda: self.onrun(dry=True))
         self.btnrun.clicked.connect(lambda: self.onrun(dry=False))
         self.btnstop.clicked.connect(self.onstop)
+        self.btnexport.clicked.connect(self.onexport)
 
         self.timer = QTimer(self)
+        self.timer.setInterval(100)
         self.timer.timeout.connect(self.flushrows)
-        self.timer.start(100)
 
         self.opts = ExecOpts()
         self.prefsexecbootstart = False
         self.prefsexecshutdown = False
         self.pathopts: Dict[str, bool] = {}
-        self.showbytes = 0
-        self.confloader()
+        self.budgets: Dict[str, int] = {}
+        self.topdata: dict = {}
+        self.eta: Optional[EtaEstimator] = None
+        self.profile = ""
+        self.cprofile = False
+        self.prefsdlg: Optional[DialogPrefs] = None
+        self.aboutdlg: Optional[DialogAbout] = None
+        with self.probe.span("config"):
+            self.confloader()
 
         self.completed.connect(self.complethandler)
+        self.usersready.connect(self.onusers)
+        self.cmb_user.currentIndexChanged.connect(self.startpreview)
         self.fadeanimation: Optional[QPropertyAnimation] = None
 
+    # Function 'paintEvent'
+    def paintEvent(self, event):
+        """
+        Record the first paint and only then start user discovery.
+        Scanning /home can be slow on network or encrypted homes, so it
+        must never delay the first window on screen.
+        """
+        super().paintEvent(event)
+        if self.painted:
+            return
+        self.painted = True
+        self.probe.mark("firstpaint")
+        QTimer.singleShot(0, self.loadusers)
+
+    # Function 'loadusers'
+    def loadusers(self):
+        """
+        Discover local users on a helper thread.
+        The list is handed back to the GUI thread through 'usersready';
+        the combo box keeps the saved or current user meanwhile.
+        """
+
+        # Function 'discover'
+        def discover():
+            """
+            Run UserDiscovery.listusers and publish the result.
+            Emission is skipped if the window was destroyed meanwhile.
+            Timed as the 'users' span of the startup probe.
+            """
+            with self.probe.span("users"):
+                users = UserDiscovery.listusers()
+            try:
+                self.usersready.emit(users)
+            except RuntimeError:
+                pass
+
+        threading.Thread(target=discover, daemon=True).start()
+
+    # Function 'onusers'
+    def onusers(self, users: list):
+        """
+        Replace the provisional user entry with the discovered users.
+        The user shown before discovery stays selected when present;
+        otherwise the first entry (the current user) is selected.
+        """
+        current = self.cmb_user.currentData()
+        self.users = users
+        self.cmb_user.blockSignals(True)
+        self.cmb_user.clear()
+        for u, home in self.users:
+            self.cmb_user.addItem(self.userlabel(u, home), (u, home))
+        self.cmb_user.setCurrentIndex(0)
+        for i in range(self.cmb_user.count()):
+            if current and self.cmb_user.itemData(i)[0] == current[0]:
+                self.cmb_user.setCurrentIndex(i)
+                break
+        self.cmb_user.blockSignals(False)
+        self.probe.mark("users")
+        self.probe.report()
+        self.startpreview()
+
+    # Function 'userlabel'
+    def userlabel(self, user: str, home: str) -> str:
+        """
+        Build the user selector label, with the previewed reclaimable size.
+        The size sums the rules enabled in Preferences, Trash included,
+        and is omitted until the first preview result for that home.
+        """
+        sizes = self.reclaim.get(home)
+        if not sizes:
+            return f"{user}  —  {home}"
+        total = sum(n for k, n in sizes.items() if self.pathopts.get(k, True))
+        return f"{user}  —  {home}  ({SysUtils.unitsize(total)} reclaimable)"
+
+    # Function 'startpreview'
+    def startpreview(self, *_):
+        """
+        Start (or keep) the background size preview for the selected user.
+        Skipped while a task runs (the row timer is active), so both never
+        compete for I/O; repeated calls are cheap thanks to the size index.
+        """
+        data = self.cmb_user.currentData()
+        if not data or self.timer.isActive():
+            return
+        self.preview.start(data[1], excludes=self.opts.excludes, budgets=self.budgets)
+
+    # Function 'relabelusers'
+    def relabelusers(self, home: Optional[str] = None):
+        """
+        Refresh the user selector labels from the preview results.
+        Only entries of 'home' are touched when given, every entry otherwise
+        (e.g. after the enabled rules changed).
+        """
+        for i in range(self.cmb_user.count()):
+            u, h = self.cmb_user.itemData(i)
+            if home is None or h == home:
+                self.cmb_user.setItemText(i, self.userlabel(u, h))
+
+    # Function 'onsized'
+    def onsized(self, home: str, key: str, nbytes: int):
+        """
+        Record one preview result and refresh the widgets showing it.
+        The user selector entry of that home is relabelled; an open or
+        cached Preferences dialog gets the size next to the rule toggle.
+        """
+        self.reclaim.setdefault(home, {})[key] = nbytes
+        if home:
+            self.relabelusers(home)
+        data = self.cmb_user.currentData()
+        if self.prefsdlg is not None and data and home in ("", data[1]):
+            self.prefsdlg.rulemodel.setsize(key, nbytes)
+
     # Function 'confloader'
     def confloader(self):
         """
         Load persisted configuration values and apply them to controls.
         Reads key=value config, coerces types, and restores check states.
-        Also restores saved user selection if present.
+        Before user discovery ran, the saved user is shown provisionally.
         """
         cfg = ConfigManager.load()
 
@@ -1552,40 +6554,13 @@ class BlitzClean(QWidget):
             """
             return cfg.get(key, default)
 
-        try:
-            self.opts.vacuumdays = int(cfg.get("vacuumdays", "7") or 7)
-        except (ValueError, TypeError):
-            self.opts.vacuumdays = 7
-        self.opts.vacuumsize = loadstring("vacuumsize", "100M")
-        try:
-            self.opts.keepsnaps = int(cfg.get("keepsnaps", "2") or 2)
-        except (ValueError, TypeError):
-            self.opts.keepsnaps = 2
-
-        self.opts.shutafter = loadbool("shutafter", False)
-        self.opts.clearkernels = loadbool("clearkernels", False)
+        self.opts = ConfigManager.loadopts(cfg)
+        self.cbsummary.setChecked(self.opts.summary)
         self.prefsexecbootstart = loadbool("runbootstart", False)
         self.prefsexecshutdown = loadbool("runshutdown", False)
 
-        # Docker granular flags
-        self.opts.dockercontainers = loadbool("dockercontainers", False)
-        self.opts.dockerimages = loadbool("dockerimages", False)
-        self.opts.dockervolumes = loadbool("dockervolumes", False)
-        self.opts.dockernetworks = loadbool("dockernetworks", False)
-
-        all_keys = (
-            USERPATH
-            + USERHISTORY
-            + USERBROWSERS
-            + USERMISCS
-            + USERAGGRESIVE
-            + ROOTITEMS
-            + SYSDIRS
-            + [f"{base}::{pat}" for base, pat in SYSGLOBS]
-        )
-
-        for k in all_keys:
-            self.pathopts[k] = loadbool(f"options.{k}", True)
+        self.pathopts = ConfigManager.loadpathopts(cfg)
+        self.budgets = ConfigManager.loadbudgets(cfg)
 
         saved_user = loadstring("username", "")
         for i in range(self.cmb_user.count()):
@@ -1593,6 +6568,13 @@ class BlitzClean(QWidget):
             if u == saved_user:
                 self.cmb_user.setCurrentIndex(i)
                 break
+        if self.cmb_user.count() == 0:
+            if saved_user and self.opts.userhome:
+                u, home = saved_user, self.opts.userhome
+            else:
+                u = os.environ.get("SUDO_USER") or os.environ.get("USER") or "root"
+                home = "/root" if u == "root" else str(Path.home())
+            self.cmb_user.addItem(f"{u}  —  {home}", (u, home))
 
     # Function 'confpersist'
     def confpersist(self):
@@ -1604,90 +6586,191 @@ class BlitzClean(QWidget):
         user, home = self.cmb_user.currentData()
         self.opts.username = user
         self.opts.userhome = home
-        ConfigManager.save(self.opts, self.prefsexecbootstart, self.prefsexecshutdown, self.pathopts)
+        self.opts.summary = self.cbsummary.isChecked()
+        ConfigManager.save(self.opts, self.prefsexecbootstart, self.prefsexecshutdown, self.pathopts, self.budgets)
 
     # Function 'filerow'
     def filerow(self, path: str, size_bytes: int, mtime: str):
         """
         Enqueue a file row for the GUI table from background threads.
-        Transfers data through a thread-safe queue to avoid UI races.
-        Actual insertion is performed during periodic flushes.
+        Transfers data through a thread-safe queue to avoid UI races;
+        the path is split here so the flush only interns its folder.
+        """
+        dirpath, name = os.path.split(path)
+        self.file_queue.put((dirpath, name, size_bytes, mtime, None))
+
+    # Function 'sumrow'
+    def sumrow(self, row: dict):
         """
-        self.file_queue.put((path, size_bytes, mtime))
+        Enqueue an aggregated per-target row produced in summary mode.
+        Target rows remember (home, key) so they can be drilled into;
+        per-user total rows under the key '*' cannot be drilled.
+        """
+        key = str(row.get("key", ""))
+        label = "all targets" if key == "*" else key
+        path = f"{row.get('user', '')}: {label} ({int(row.get('count', 0))} entries)"
+        oldest = row.get("oldest") or "-"
+        newest = row.get("newest") or "-"
+        drill = None if key == "*" else (str(row.get("home", "")), key)
+        self.file_queue.put(("", path, int(row.get("bytes", 0)), f"{oldest} → {newest}", drill))
 
     # Function 'flushrows'
     def flushrows(self):
         """
-        Periodically drain queued rows and append them to the table widget.
-        Converts byte counts to human-readable units before display.
-        Keeps the UI responsive by avoiding heavy work in the main loop.
-        Also increments the live 'Cleared Space' counter.
+        Periodically drain queued rows and append them to the result model.
+        The whole batch is inserted with one notification; cells are only
+        rendered for visible rows. Counters arrive via the telemetry channel.
         """
-        updated = False
+        rows = []
         try:
             while True:
-                path, size_b, mtime = self.file_queue.get_nowait()
-                r = self.table.rowCount()
-                self.table.insertRow(r)
-                self.table.setItem(r, 0, QTableWidgetItem(path))
-                self.table.setItem(r, 1, QTableWidgetItem(SysUtils.unitsize(size_b)))
-                self.table.setItem(r, 2, QTableWidgetItem(mtime))
-                try:
-                    self.showbytes += int(size_b)
-                    updated = True
-                except (ValueError, TypeError, OverflowError):
-                    pass
+                rows.append(self.file_queue.get_nowait())
         except queue.Empty:
-            if updated:
-                self.lbltotal.setText(f"Cleared Space\n{SysUtils.unitsize(self.showbytes)}")
+            pass
+        self.model.extend(rows)
+
+    # Function 'ontelemetry'
+    def ontelemetry(self, snap: dict):
+        """
+        Apply a telemetry snapshot: cleared space, target and progress/ETA.
+        Runs in the GUI thread at most at the channel rate, however fast
+        rows are produced; stays an indeterminate spinner until a plan is known.
+        """
+        cleared = SysUtils.unitsize(snap["bytes"])
+        if snap["pending"]:
+            cleared += f" (+{snap['pending']} targets pending purge)"
+        self.lbltotal.setText(f"Cleared Space\n{cleared}")
+        tip = f"Current target: {snap['target'] or '-'}"
+        if snap["errors"]:
+            tip += f"\nErrors: {snap['errors']}"
+        self.progress.setToolTip(tip)
+        if self.eta is None:
+            return
+        pe, pb = snap["planentries"], snap["planbytes"]
+        de, db = snap["entries"], snap["bytes"]
+        if pe <= 0:
+            return
+        parts = [min(1.0, de / pe)]
+        if pb > 0:
+            parts.append(min(1.0, db / pb))
+        frac = sum(parts) / len(parts)
+        if self.progress.maximum() == 0:
+            self.progress.setRange(0, 1000)
+        self.progress.setValue(int(frac * 1000))
+        self.lbleta.setText(EtaEstimator.format(self.eta.update(frac, time.monotonic())))
 
     # Function 'onabout'
     def onabout(self):
         """
         Display a larger About dialog with logo and website link.
         Uses a custom QDialog for layout control and clickable links.
-        Provides application metadata in a visually centered layout.
+        The dialog is built on first use and reused afterwards.
         """
-        dlg = DialogAbout(self, VERSION, WEBSITEURL)
-        dlg.exec()
+        if self.aboutdlg is None:
+            self.aboutdlg = DialogAbout(self, VERSION, WEBSITEURL)
+        self.aboutdlg.exec()
 
     # Function 'onprefs'
     def onprefs(self):
         """
         Open the preferences dialog and apply any accepted changes.
-        Updates in-memory options and persists them to disk immediately.
-        Also refreshes the path options map for the next run.
+        The dialog is built once; later openings only reload its values.
+        Accepted values are persisted to disk immediately.
         """
-        dlg = DialogPrefs(self, self.opts, self.prefsexecbootstart, self.prefsexecshutdown, self.pathopts)
+        before = (self.prefsexecbootstart, self.prefsexecshutdown, self.opts.servicecalendar, self.opts.servicemins,
+                  self.opts.watch)
+        if self.prefsdlg is None:
+            self.prefsdlg = DialogPrefs(self, self.opts, self.prefsexecbootstart, self.prefsexecshutdown,
+                                        self.pathopts, self.budgets)
+        else:
+            self.prefsdlg.setvalues(self.opts, self.prefsexecbootstart, self.prefsexecshutdown,
+                                    self.pathopts, self.budgets)
+        dlg = self.prefsdlg
+        data = self.cmb_user.currentData()
+        home = data[1] if data else ""
+        dlg.rulemodel.setsizes({**self.reclaim.get("", {}), **self.reclaim.get(home, {})})
+        self.startpreview()
+        excludes, oldbudgets = self.opts.excludes, dict(self.budgets)
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            new_opts, boot, shut, popts = dlg.addvalues()
+            new_opts, boot, shut, popts, budgets = dlg.addvalues()
             self.opts = new_opts
             self.prefsexecbootstart = boot
             self.prefsexecshutdown = shut
             self.pathopts = popts
+            self.budgets = budgets
             self.confpersist()
+            if (new_opts.excludes, budgets) != (excludes, oldbudgets) and home and not self.timer.isActive():
+                self.preview.start(home, True, new_opts.excludes, budgets)
+            self.relabelusers()
+            if (boot, shut, new_opts.servicecalendar, new_opts.servicemins, new_opts.watch) != before:
+                self.serviceinstall()
+
+    # Function 'serviceinstall'
+    def serviceinstall(self):
+        """
+        Regenerate the systemd units after scheduling preferences changed.
+        Runs '--install-service' on this config file, through pkexec unless
+        already root, on a helper thread so the dialog never blocks.
+        """
+        cmd = [sys.executable, os.path.abspath(sys.argv[0]), "--install-service", "--config", str(CONFIGFILE)]
+        if not SysUtils.rootcheck():
+            cmd = ["pkexec"] + cmd
+
+        # Function 'installer'
+        def installer():
+            """
+            Run the installer command and wait for it to finish.
+            Output is discarded; failures leave the previous units in place.
+            Runs on a daemon thread so the process is always reaped.
+            """
+            try:
+                subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            except (OSError, subprocess.SubprocessError):
+                pass
+
+        threading.Thread(target=installer, daemon=True).start()
 
     # Function 'onstop'
     def onstop(self):
         """
         Signal the running cleaner to cancel and disable the Stop button.
-        Has no effect when no worker is active or already stopping.
+        A privileged worker is asked to stop through its stdin pipe.
         UI state is updated to reflect that cancellation is in progress.
         """
-        if self.cleaner:
+        if self.workerproc and self.workerproc.poll() is None:
+            try:
+                self.workerproc.stdin.write("STOP\n")
+                self.workerproc.stdin.flush()
+            except (OSError, ValueError):
+                pass
+            self.btnstop.setEnabled(False)
+        elif self.cleaner:
             self.cleaner.loadstop()
             self.btnstop.setEnabled(False)
 
+    # Function 'ondrill'
+    def ondrill(self, index: QModelIndex):
+        """
+        Drill into a summary row by dry-running only that target.
+        The rescan lists every file of the rule key for the row's home.
+        Ignored for plain file rows and while a task is running.
+        """
+        drill = self.model.data(self.model.index(index.row(), 0), Qt.ItemDataRole.UserRole)
+        if not drill or (self.workerthread and self.workerthread.is_alive()):
+            return
+        self.onrun(dry=True, drill=tuple(drill))
+
     # Function 'onrun'
-    def onrun(self, dry: bool):
+    def onrun(self, dry: bool, drill: Optional[Tuple[str, str]] = None, export: str = ""):
         """
         Start a cleanup task (dry-run or live) in a background thread.
         Handles privilege elevation via pkexec when 'root' is selected.
         Manages UI state, progress indicator, and row streaming lifecycle.
-        Also attempts to close user programs automatically before cleaning.
+        A drill (home, key) pair restricts the run to one summary target;
+        an export path streams every row of the run into that file.
         """
-        self.table.setRowCount(0)
-        self.showbytes = 0
+        self.model.clear()
+        self.topdata = {}
         self.lbltotal.setText("Cleared Space\n0.00 MB")
 
         user, home = self.cmb_user.currentData()
@@ -1700,25 +6783,43 @@ class BlitzClean(QWidget):
             return
 
         self.confpersist()
+        self.opts.profile = PhaseProfiler.defaultpath() if self.profile == "auto" else self.profile
+        self.opts.cprofile = self.cprofile
+        self.opts.drillkey = drill[1] if drill else ""
+        self.opts.exportpath = export
+        if drill:
+            self.opts.summary = False
+            if drill[0]:
+                self.opts.userhome = drill[0]
         if not self.opts.dryrun and self.opts.username and SysUtils.rootcheck():
             try:
                 ProcessManager.closeprograms(self.opts.username, excpids={os.getpid()}, gracesecs=5)
             except (OSError, PermissionError, subprocess.SubprocessError, ValueError):
                 pass
 
+        self.eta = EtaEstimator() if self.opts.estimate else None
+        self.progress.setRange(0, 0)
         self.progress.setVisible(True)
+        self.lbleta.setText("Estimating..." if self.opts.estimate else "")
+        self.lbleta.setVisible(self.opts.estimate)
         self.btnstop.setEnabled(True)
         self.btnrun.setEnabled(False)
         self.btndry.setEnabled(False)
+        self.btnexport.setEnabled(False)
+        self.timer.start()
+        self.preview.cancel()
 
         rootneed = (self.opts.username == "root") and not SysUtils.rootcheck()
+        telemetry = Telemetry()
+        self.cleaner = None
+        self.channel.start(telemetry)
 
         # Function 'workload'
         def workload():
             """
             Worker function executed on a background thread.
-            Runs cleanup locally or via pkexec, streaming rows back to UI.
-            Restores UI controls when work completes or is cancelled.
+            Runs cleanup locally or via pkexec, streaming rows and telemetry
+            to the UI; widgets are only touched by signal handlers.
             """
             success = True
             errmsg = ""
@@ -1730,31 +6831,61 @@ class BlitzClean(QWidget):
                         optsfile = tf.name
                     try:
                         cmd = ["pkexec", sys.executable, sys.argv[0], "--worker", optsfile]
-                        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+                        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                                stderr=subprocess.STDOUT, text=True)
+                        self.workerproc = proc
+                        workerdirs: Dict[str, str] = {}
 
                         for line in iter(proc.stdout.readline, ""):
                             if not line:
                                 break
                             line = line.rstrip("\n")
                             if line.startswith("ROW\t"):
-                                parts = line.split("\t", 3)
-                                if len(parts) == 4:
-                                    _, path, size_str, mtime = parts
+                                parts = line.split("\t", 4)
+                                if len(parts) == 5:
+                                    _, did, name, size_str, mtime = parts
                                     try:
                                         size_b = int(size_str)
                                     except ValueError:
                                         size_b = 0
-                                    self.filerow(path, size_b, mtime)
+                                    self.file_queue.put((workerdirs.get(did, ""), name, size_b, mtime, None))
+                            elif line.startswith("DIR\t"):
+                                parts = line.split("\t", 2)
+                                if len(parts) == 3:
+                                    workerdirs[parts[1]] = parts[2]
                             elif line.startswith("TOTAL\t"):
                                 parts = line.split("\t", 2)
                                 if len(parts) >= 2:
                                     try:
-                                        total_b = int(parts[1])
-                                        self.showbytes = total_b
-                                        self.lbltotal.setText(f"Cleared Space\n{SysUtils.unitsize(total_b)}")
+                                        telemetry.bytes = int(parts[1])
                                     except (ValueError, TypeError, OverflowError):
                                         pass
+                            elif line.startswith("PLAN\t"):
+                                parts = line.split("\t")
+                                try:
+                                    telemetry.planentries, telemetry.planbytes = int(parts[1]), int(parts[2])
+                                except (IndexError, ValueError):
+                                    continue
+                            elif line.startswith("PROG\t"):
+                                parts = line.split("\t", 5)
+                                try:
+                                    telemetry.entries, telemetry.bytes = int(parts[1]), int(parts[2])
+                                    telemetry.errors, telemetry.pending = int(parts[3]), int(parts[4])
+                                    telemetry.target = parts[5]
+                                except (IndexError, ValueError):
+                                    continue
+                            elif line.startswith("SUM\t"):
+                                try:
+                                    self.sumrow(json.loads(line.split("\t", 1)[1]))
+                                except ValueError:
+                                    pass
+                            elif line.startswith("TOP\t"):
+                                try:
+                                    self.topdata = json.loads(line.split("\t", 1)[1])
+                                except ValueError:
+                                    pass
                             elif line.startswith("ERROR\t"):
+                                telemetry.errors += 1
                                 success = False
                                 errmsg = line.split("\t", 1)[1] if "\t" in line else "Unknown error."
                         proc.wait()
@@ -1763,24 +6894,30 @@ class BlitzClean(QWidget):
                             if not errmsg:
                                 errmsg = f"Worker exited with code {proc.returncode}."
                     finally:
+                        self.workerproc = None
                         try:
                             os.unlink(optsfile)
                         except OSError:
                             pass
                 else:
+                    runlock = RunLock() if SysUtils.rootcheck() else None
+                    if runlock and not runlock.acquire():
+                        success = False
+                        errmsg = "Another cleanup run is in progress."
+                        return
                     try:
-                        self.cleaner = SysCleaner(self.opts, self.filerow, self.pathopts)
+                        self.cleaner = SysCleaner(self.opts, self.filerow, self.pathopts, self.budgets, self.sumrow)
+                        self.channel.attach(self.cleaner.telemetry)
                         self.cleaner.run()
-                        self.showbytes = getattr(self.cleaner, "totalbytes", self.showbytes)
-                        self.lbltotal.setText(f"Cleared Space\n{SysUtils.unitsize(self.showbytes)}")
+                        self.topdata = self.cleaner.topreport.todict()
                     except (OSError, PermissionError, subprocess.SubprocessError, ValueError, RuntimeError) as e:
                         success = False
                         errmsg = f"{e}"
+                    finally:
+                        if runlock:
+                            runlock.release()
             finally:
-                self.progress.setVisible(False)
-                self.btnstop.setEnabled(False)
-                self.btnrun.setEnabled(True)
-                self.btndry.setEnabled(True)
+                self.channel.stop()
                 try:
                     self.completed.emit(success, errmsg)
                 except RuntimeError:
@@ -1789,6 +6926,71 @@ class BlitzClean(QWidget):
         self.workerthread = threading.Thread(target=workload, daemon=True)
         self.workerthread.start()
 
+    # Function 'showtop'
+    def showtop(self):
+        """
+        Refresh the Largest tab from the last run's top-N report.
+        Rebuilds the scope selector with 'All targets' and each target key.
+        Enables saving the report when any data is available.
+        """
+        self.cmb_topscope.blockSignals(True)
+        self.cmb_topscope.clear()
+        self.cmb_topscope.addItem("All targets", "*")
+        for key in sorted(self.topdata.get("targets", {})):
+            self.cmb_topscope.addItem(key, key)
+        self.cmb_topscope.blockSignals(False)
+        self.btntopsave.setEnabled(bool(self.topdata))
+        self.filltop()
+
+    # Function 'filltop'
+    def filltop(self):
+        """
+        Populate the largest-items table for the selected scope.
+        Lists directory totals first, then the largest individual files.
+        Sizes are shown in human-readable units.
+        """
+        scope = self.cmb_topscope.currentData() or "*"
+        if scope == "*":
+            section = self.topdata.get("overall", {})
+        else:
+            section = self.topdata.get("targets", {}).get(scope, {})
+        self.toptable.setRowCount(0)
+        for kind, label in (("dirs", "Directory"), ("files", "File")):
+            for item in section.get(kind, []):
+                r = self.toptable.rowCount()
+                self.toptable.insertRow(r)
+                self.toptable.setItem(r, 0, QTableWidgetItem(label))
+                self.toptable.setItem(r, 1, QTableWidgetItem(str(item.get("path", ""))))
+                self.toptable.setItem(r, 2, QTableWidgetItem(SysUtils.unitsize(item.get("size", 0))))
+
+    # Function 'ontopsave'
+    def ontopsave(self):
+        """
+        Save the last top-N report as JSON for machine processing.
+        Asks for a destination file and writes the full report dict.
+        Write errors are shown in a warning box instead of raising.
+        """
+        path, _ = QFileDialog.getSaveFileName(self, "Save Report", "blitzclean-largest.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            Path(path).write_text(json.dumps(self.topdata, indent=2) + "\n", encoding="utf-8")
+        except OSError as e:
+            QMessageBox.warning(self, "Save Report", f"{e}")
+
+    # Function 'onexport'
+    def onexport(self):
+        """
+        Ask for a report file and start a dry run that streams rows into it.
+        The extension picks the format: .csv or .ndjson, plus .gz to compress.
+        The table is filled too unless disabled in Preferences.
+        """
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Report", "blitzclean-report.csv",
+            "CSV (*.csv);;CSV, gzip (*.csv.gz);;NDJSON (*.ndjson);;NDJSON, gzip (*.ndjson.gz)")
+        if path:
+            self.onrun(dry=True, export=path)
+
     # Function 'complethandler'
     def complethandler(self, success: bool, errmsg: str):
         """
@@ -1796,6 +6998,18 @@ class BlitzClean(QWidget):
         Waits for user to close the popup via Close button or window close.
         Then clears the file list with a smooth fade-out animation.
         """
+        self.timer.stop()
+        self.flushrows()
+        self.eta = None
+        self.progress.setVisible(False)
+        self.lbleta.setVisible(False)
+        self.btnstop.setEnabled(False)
+        self.btnrun.setEnabled(True)
+        self.btndry.setEnabled(True)
+        self.btnexport.setEnabled(True)
+        self.showtop()
+        self.startpreview()
+
         # In dry-run mode, do not show a popup and keep table contents intact.
         if self.opts.dryrun:
             return
@@ -1811,7 +7025,7 @@ class BlitzClean(QWidget):
         When the fade completes, clear all rows and restore full opacity.
         Keeps the component responsive and visually pleasant for users.
         """
-        if self.table.rowCount() == 0:
+        if self.model.rowCount() == 0:
             return
 
         effect = QGraphicsOpacityEffect(self.table)
@@ -1828,7 +7042,7 @@ class BlitzClean(QWidget):
             """Clears all rows in the table after the fade animation ends.
             Removes the opacity effect from the table to restore normal appearance.
             Finalizes the fade-out process by resetting the table to its initial state."""
-            self.table.setRowCount(0)
+            self.model.clear()
             self.table.setGraphicsEffect(None)
 
         anim.finished.connect(fadeafter)
@@ -1837,28 +7051,38 @@ class BlitzClean(QWidget):
 
 
 # Class 'UpdateChecker'
-class UpdateChecker:
+class UpdateChecker(QObject):
     """
-    Check GitHub releases for a newer version.
-    Show a modal popup reusing the About-style layout.
-    Intended to be called once at application startup.
+    Check GitHub releases for a newer version on a background thread.
+    The last answer and its ETag are cached so the network is asked at most
+    once per interval, conditionally; a newer tag is delivered by signal.
     """
 
+    # Define 'found'
+    found = pyqtSignal(str, str)
+
     # Function '__init__'
     def __init__(self, parent: QWidget, appname: str, currvers: str, gitrepo: str,
-                 logo_paths: Optional[List[Path]] = None):
+                 logo_paths: Optional[List[Path]] = None, interval: int = 86400,
+                 apiurl: str = "", cachefile: Path = UPDATECACHEFILE):
         """
         Store configuration needed for update checks.
-        Accepts parent widget, app name, current version and repo.
-        Optional logo paths override the default guessed location.
+        'interval' is the minimum number of seconds between network queries;
+        'apiurl' overrides the GitHub endpoint (e.g. a local stand-in).
         """
+        super().__init__(parent)
         self.parent = parent
         self.appname = appname
         self.currvers = currvers
         self.gitrepo = gitrepo
+        self.interval = max(0, int(interval))
+        self.apiurl = apiurl or f"https://api.github.com/repos/{gitrepo}/releases/latest"
+        self.cachefile = cachefile
+        self.thread: Optional[threading.Thread] = None
         self.logo_paths = logo_paths or [
             Path(f"/usr/share/pixmaps/{appname.lower()}.png")
         ]
+        self.found.connect(self.showupdate)
 
     # Function 'versionparser'
     @staticmethod
@@ -1896,41 +7120,103 @@ class UpdateChecker:
     # Function 'checknotify'
     def checknotify(self, timeout: int = 3):
         """
-        Perform a single update check against GitHub releases.
-        If a newer tag exists, show the update popup dialog.
-        Intended to be called from the main GUI thread.
+        Start a single update check on a daemon thread and return at once.
+        If a newer tag exists, 'found' fires and the popup is shown on the
+        GUI thread. A check already in flight is not started twice.
         """
-        latest = self.fetchtag(timeout=timeout)
-        if not latest:
+        if self.thread is not None and self.thread.is_alive():
             return
-        if not self.checknewer(self.currvers, latest):
+        self.thread = threading.Thread(target=self.checkrun, args=(timeout,), daemon=True)
+        self.thread.start()
+
+    # Function 'checkrun'
+    def checkrun(self, timeout: int = 3):
+        """
+        Background body of checknotify: look up the latest tag and compare.
+        Emits 'found' (tag, release URL) only for a strictly newer version.
+        Never touches widgets; the signal is queued to the GUI thread.
+        """
+        latest = self.lookup(timeout=timeout)
+        if not latest or not self.checknewer(self.currvers, latest):
             return
-        url = f"https://github.com/{self.gitrepo}/releases/tag/{latest}"
-        self.showupdate(latest, url)
+        self.found.emit(latest, f"https://github.com/{self.gitrepo}/releases/tag/{latest}")
+
+    # Function 'loadcache'
+    def loadcache(self) -> dict:
+        """
+        Read the cached {checked, etag, tag} record from the config directory.
+        A missing or corrupt file reads as an empty record.
+        Only consulted and written from the checker thread.
+        """
+        try:
+            data = json.loads(self.cachefile.read_text(encoding="utf-8"))
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    # Function 'savecache'
+    def savecache(self, data: dict):
+        """
+        Persist the cache record atomically via a temporary file.
+        Write errors are ignored; the next launch simply asks again.
+        Same approach as the size index.
+        """
+        try:
+            self.cachefile.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cachefile.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.cachefile)
+        except OSError:
+            pass
+
+    # Function 'lookup'
+    def lookup(self, timeout: int = 3, now: Optional[float] = None) -> Optional[str]:
+        """
+        Return the latest release tag, from cache while it is fresh.
+        Stale entries are revalidated with If-None-Match; a 304 keeps the
+        cached tag. Failures fall back to the cached tag without saving.
+        """
+        now = time.time() if now is None else now
+        cache = self.loadcache()
+        cached = str(cache.get("tag") or "") or None
+        if cached and now - float(cache.get("checked", 0)) < self.interval:
+            return cached
+        result = self.fetchtag(timeout=timeout, etag=str(cache.get("etag") or "") if cached else "")
+        if result is None:
+            return cached
+        tag, etag = result
+        if tag is None:
+            tag, etag = cached, etag or str(cache.get("etag") or "")
+        self.savecache({"checked": now, "etag": etag, "tag": tag or ""})
+        return tag
 
     # Function 'fetchtag'
-    def fetchtag(self, timeout: int = 3) -> Optional[str]:
+    def fetchtag(self, timeout: int = 3, etag: str = "") -> Optional[Tuple[Optional[str], str]]:
         """
-        Call GitHub API to obtain the latest release tag.
-        Uses /repos/{repo}/releases/latest with a short timeout.
-        Returns the tag name string or None on any failure.
+        Call the releases API to obtain the latest release tag.
+        Sends If-None-Match when an ETag is known and returns (tag, etag),
+        with tag None on 304 Not Modified; returns None on any failure.
         """
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": self.appname,
+        }
+        if etag:
+            headers["If-None-Match"] = etag
         try:
-            url = f"https://api.github.com/repos/{self.gitrepo}/releases/latest"
-            req = Request(
-                url,
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "User-Agent": self.appname,
-                },
-            )
+            req = Request(self.apiurl, headers=headers)
             with urlopen(req, timeout=timeout) as resp:
                 data = json.loads(resp.read().decode("utf-8", "ignore"))
+                newtag = resp.headers.get("ETag", "") or ""
 
             tag = str(data.get("tag_name") or "").strip()
-            return tag or None
+            return (tag, newtag) if tag else None
 
-        except (HTTPError, URLError, socket.timeout, ValueError, OSError):
+        except HTTPError as e:
+            if e.code == 304:
+                return None, e.headers.get("ETag", "") or etag
+            return None
+        except (URLError, socket.timeout, ValueError, OSError):
             return None
 
     # Function 'showupdate'
@@ -2011,6 +7297,182 @@ class AppEntry:
     Encapsulates QApplication lifecycle and exit handling.
     """
 
+    # Function 'parseargs'
+    @staticmethod
+    def parseargs(argv: List[str]) -> argparse.Namespace:
+        """
+        Parse the command line shared by the GUI and worker modes.
+        Unknown arguments are left alone so Qt options keep working.
+        --profile without a file writes under the config directory.
+        """
+        ap = argparse.ArgumentParser(prog="blitzclean", add_help=True)
+        ap.add_argument("--worker", metavar="OPTSFILE", default="", help=argparse.SUPPRESS)
+        ap.add_argument("--profile", action="store_true",
+                        help="write a per-phase timing/CPU/memory report (JSON) at the end of each run")
+        ap.add_argument("--profile-file", metavar="REPORT", default="",
+                        help="write the profile report to REPORT instead of a new timestamped file (implies --profile)")
+        ap.add_argument("--cprofile", action="store_true", help="with --profile, also dump cProfile stats")
+        ap.add_argument("--headless", metavar="MODE", choices=("boot", "shutdown", "timer", "now", "watch"), default="",
+                        help="run a cleanup without GUI (as root), as the systemd units do; "
+                             "'watch' keeps running and cleans mounts that fall below the low watermark")
+        ap.add_argument("--config", metavar="FILE", default="", help="configuration file for --headless/--install-service")
+        ap.add_argument("--install-service", action="store_true",
+                        help="(re)generate the systemd units from the configuration (as root)")
+        ap.add_argument("--list-quarantine", action="store_true", help="list quarantined runs and their entries")
+        ap.add_argument("--restore", metavar="TARGET", default="",
+                        help="move quarantined entries back: a run id, an original path or a folder above it")
+        ap.add_argument("--purge-quarantine", metavar="DAYS", type=int, default=None,
+                        help="delete quarantined runs older than DAYS at low priority")
+        ap.add_argument("--serve", metavar="ADDRESS", default="",
+                        help="serve cleanup runs to a coordinator on HOST:PORT or a Unix socket path")
+        ap.add_argument("--coordinate", metavar="ADDRESS", nargs="+", default=[],
+                        help="run one cleanup on several --serve workers and report fleet totals as JSON lines")
+        ap.add_argument("--jobs", metavar="N", type=int, default=4, help="with --coordinate, hosts cleaned at once")
+        ap.add_argument("--real", action="store_true", help="with --coordinate, delete instead of a dry run")
+        ap.add_argument("--estimate", action="store_true",
+                        help="with --coordinate, pre-count each host's targets for progress")
+        ap.add_argument("--token-file", metavar="FILE", default="",
+                        help=f"shared secret for --serve/--coordinate (default: ${TOKENENV})")
+        ap.add_argument("--lock", metavar="FILE", default="", help=argparse.SUPPRESS)
+        args, _ = ap.parse_known_args(argv)
+        return args
+
+    # Function 'token'
+    @staticmethod
+    def token(args: argparse.Namespace) -> str:
+        """
+        Return the shared secret for the socket modes.
+        Read from --token-file when given, otherwise from the environment;
+        surrounding whitespace is ignored.
+        """
+        if args.token_file:
+            return Path(args.token_file).read_text(encoding="utf-8").strip()
+        return os.environ.get(TOKENENV, "").strip()
+
+    # Function 'serve'
+    @staticmethod
+    def serve(args: argparse.Namespace, config: Path) -> int:
+        """
+        Run the worker server until SIGINT/SIGTERM.
+        Rule toggles, budgets and export/audit/metrics settings come from 'config';
+        coordinators only choose the run options.
+        """
+        server = WorkerServer(args.serve, AppEntry.token(args), config, Path(args.lock) if args.lock else LOCKFILE)
+        signal.signal(signal.SIGTERM, lambda *_: server.stop())
+        signal.signal(signal.SIGINT, lambda *_: server.stop())
+        try:
+            server.serve()
+        except (OSError, ValueError) as e:
+            print(f"Cannot serve on {args.serve}: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    # Function 'coordinate'
+    @staticmethod
+    def coordinate(args: argparse.Namespace, config: Path) -> int:
+        """
+        Run the options from 'config' on every --coordinate address.
+        Dry run unless --real; events go to stdout as JSON lines and
+        SIGINT/SIGTERM send STOP to the running hosts.
+        """
+        opts = ConfigManager.loadopts(ConfigManager.load(config))
+        opts.dryrun = not args.real
+        opts.shutafter = False
+        opts.summary = True
+        opts.estimate = opts.estimate or args.estimate
+        coordinator = FleetCoordinator(args.coordinate, opts, args.jobs, AppEntry.token(args),
+                                       lambda ev: print(json.dumps(ev), flush=True))
+        signal.signal(signal.SIGTERM, lambda *_: coordinator.stop())
+        signal.signal(signal.SIGINT, lambda *_: coordinator.stop())
+        return coordinator.run()
+
+    # Function 'headless'
+    @staticmethod
+    def headless(mode: str, config: Path) -> int:
+        """
+        Run one unattended cleanup as the systemd units do, printing to the journal.
+        Boot/shutdown modes only run while the matching option is still set;
+        'watch' runs the free-space daemon until SIGTERM instead.
+        """
+        if not SysUtils.rootcheck():
+            print("Headless runs require root.", file=sys.stderr)
+            return 1
+        cfg = ConfigManager.load(config)
+        if (mode == "boot" and cfg.get("runbootstart") != "1") or (mode == "shutdown" and cfg.get("runshutdown") != "1"):
+            print(f"Run at {mode} is disabled; nothing to do.")
+            return 0
+        opts = ConfigManager.loadopts(cfg)
+        if mode == "watch":
+            daemon = WatermarkDaemon(opts, ConfigManager.loadpathopts(cfg), ConfigManager.loadbudgets(cfg),
+                                     lambda ev: print(json.dumps(ev), flush=True))
+            signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+            signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+            daemon.serve()
+            return 0
+        opts.dryrun = False
+        opts.shutafter = False
+        opts.summary = True
+        opts.estimate = False
+        opts.lowimpact = True
+        opts.opsmax = opts.serviceops or opts.opsmax
+
+        lock = RunLock()
+        if not lock.acquire():
+            print("Another cleanup run is in progress; skipping.")
+            return 0
+
+        # Function 'sumlog'
+        def sumlog(row: dict):
+            """
+            Log one summary row per target and user to stdout.
+            Systemd forwards it to the journal with the unit name.
+            Rows without bytes are skipped to keep the log short.
+            """
+            if row.get("bytes"):
+                print(f"{row['user']}\t{row['key']}\t{row['count']} entries\t{SysUtils.unitsize(row['bytes'])}")
+
+        cleaner = SysCleaner(opts, lambda *_: None, ConfigManager.loadpathopts(cfg), ConfigManager.loadbudgets(cfg), sumlog)
+        budget = None
+        if opts.servicemins > 0:
+            budget = threading.Timer(opts.servicemins * 60, cleaner.loadstop)
+            budget.daemon = True
+            budget.start()
+        try:
+            cleaner.run()
+        finally:
+            if budget is not None:
+                budget.cancel()
+            lock.release()
+        state = "stopped at time budget" if cleaner.stopflag else "finished"
+        pending = f", {cleaner.telemetry.pending} targets quarantined" if cleaner.telemetry.pending else ""
+        print(f"Cleanup {state}: {SysUtils.unitsize(cleaner.totalbytes)} cleared{pending}.")
+        return 0
+
+    # Function 'quarantine'
+    @staticmethod
+    def quarantine(args: argparse.Namespace) -> int:
+        """
+        Serve the quarantine commands: list, restore and purge.
+        The purge lowers its priority and paces itself like low-impact runs;
+        restore returns 1 when nothing matched the target.
+        """
+        if args.list_quarantine:
+            for rundir, entries in Quarantine.runs():
+                print(rundir)
+                for e in entries:
+                    if os.path.lexists(rundir / str(e.get("n", ""))):
+                        print(f"  {e.get('path', '')}")
+            return 0
+        if args.restore:
+            restored, skipped = Quarantine.restore(os.path.abspath(args.restore) if "/" in args.restore else args.restore)
+            print(f"Restored {restored} entries, skipped {skipped} (original path exists or rename failed).")
+            return 0 if restored else 1
+        throttle = PressureThrottle(10, 0)
+        throttle.apply()
+        runs, nbytes = Quarantine.purge(args.purge_quarantine * 86400, throttle.pace)
+        print(f"Purged {runs} quarantined runs: {SysUtils.unitsize(nbytes)} freed.")
+        return 0
+
     # Function 'main'
     @staticmethod
     def main():
@@ -2019,53 +7481,69 @@ class AppEntry:
         In worker mode, loads ExecOpts and path options, then runs SysCleaner.
         Otherwise, starts the Qt application and shows the main window.
         """
-        if len(sys.argv) == 3 and sys.argv[1] == "--worker":
-            opts_path = Path(sys.argv[2])
+        args = AppEntry.parseargs(sys.argv[1:])
+        config = Path(args.config) if args.config else CONFIGFILE
+        if args.install_service:
+            cfg = ConfigManager.load(config)
+            return ServiceUnits.install(ConfigManager.loadopts(cfg), cfg.get("runbootstart") == "1",
+                                        cfg.get("runshutdown") == "1", config)
+        if args.headless:
+            return AppEntry.headless(args.headless, config)
+        if args.list_quarantine or args.restore or args.purge_quarantine is not None:
+            return AppEntry.quarantine(args)
+        profile = ""
+        if args.profile or args.profile_file:
+            profile = os.path.abspath(args.profile_file) if args.profile_file else "auto"
+
+        if args.worker:
+            opts_path = Path(args.worker)
             data = json.loads(opts_path.read_text(encoding="utf-8"))
             opts = ExecOpts.fromdict(data)
+            if profile:
+                opts.profile = PhaseProfiler.defaultpath() if profile == "auto" else profile
+                opts.cprofile = opts.cprofile or args.cprofile
 
             cfg = ConfigManager.load()
-            pathopts: Dict[str, bool] = {}
-            all_keys = (
-                USERPATH
-                + USERHISTORY
-                + USERBROWSERS
-                + USERMISCS
-                + USERAGGRESIVE
-                + ROOTITEMS
-                + SYSDIRS
-                + [f"{base}::{pat}" for base, pat in SYSGLOBS]
-            )
-            for k in all_keys:
-                pathopts[k] = cfg.get(f"options.{k}", "1") in ("1", "true", "True", "yes")
 
-            # Function 'rowcheckbox'
-            def rowcheckbox(path: str, size_b: int, mtime: str):
+            # Function 'stdoutwrite'
+            def stdoutwrite(line: str):
                 """
-                Worker-side row emitter that prints TSV lines to stdout.
-                The GUI parses these lines to populate its progress table.
-                Keeps IPC simple and robust across privilege boundaries.
+                Write one protocol line to stdout and flush it immediately.
+                The GUI reads the pipe line by line while the run goes on.
+                Called under the session's output lock.
                 """
-                print(f"ROW\t{path}\t{size_b}\t{mtime}", flush=True)
+                sys.stdout.write(line)
+                sys.stdout.flush()
 
-            cleaner = SysCleaner(opts, rowcheckbox, pathopts)
-            try:
-                cleaner.run()
-                try:
-                    print(f"TOTAL\t{int(cleaner.totalbytes)}", flush=True)
-                except (ValueError, TypeError, OverflowError):
-                    print("TOTAL\t0", flush=True)
-                return 0
-            except (OSError, PermissionError, subprocess.SubprocessError, ValueError, RuntimeError) as e:
-                print(f"ERROR\t{e}", flush=True)
-                try:
-                    print(f"TOTAL\t{int(getattr(cleaner, 'totalbytes', 0))}", flush=True)
-                except (ValueError, TypeError, OverflowError):
-                    print("TOTAL\t0", flush=True)
-                return 1
+            session = WorkerSession(opts, ConfigManager.loadpathopts(cfg), ConfigManager.loadbudgets(cfg), stdoutwrite)
 
-        app = QApplication(sys.argv)
-        win = BlitzClean()
+            # Function 'stopread'
+            def stopread():
+                """
+                Worker-side stop listener reading commands from stdin.
+                A STOP line from the GUI cancels the run; EOF is ignored
+                so a worker started without a pipe keeps running.
+                """
+                for line in sys.stdin:
+                    if line.strip() == "STOP":
+                        session.stop()
+                        return
+
+            threading.Thread(target=stopread, daemon=True).start()
+            return session.run()
+
+        if args.serve:
+            return AppEntry.serve(args, config)
+        if args.coordinate:
+            return AppEntry.coordinate(args, config)
+
+        probe = StartupProbe.fromenv()
+        with probe.span("qapp"):
+            app = QApplication(sys.argv)
+        with probe.span("window"):
+            win = BlitzClean(probe)
+        win.profile = profile
+        win.cprofile = args.cprofile
         win.show()
 
         checker = UpdateChecker(
@@ -2074,12 +7552,15 @@ class AppEntry:
             currvers=VERSION,
             gitrepo="sqoove/blitzclean",
             logo_paths=[Path("/usr/share/pixmaps/blitzclean.png")],
+            interval=win.opts.updatehours * 3600,
+            apiurl=os.environ.get("BLITZCLEAN_UPDATE_URL", ""),
         )
         win.updatecheck = checker
-        QTimer.singleShot(1500, checker.checknotify)
+        if win.opts.updatehours > 0:
+            QTimer.singleShot(1500, checker.checknotify)
         sys.exit(app.exec())
 
 
 # Callback
 if __name__ == "__main__":
-    AppEntry.main()
+    sys.exit(AppEntry.main())